@@ -0,0 +1,136 @@
+"""
+Networks of parameterized size and density for scaling benchmarks.
+
+Every generator returns a deterministic network and a reachable state of it:
+the state which follows the all-off state. Random networks are seeded so that
+results are comparable across revisions.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from pyphi import Network, utils
+
+KINDS = ['ring', 'modular', 'random', 'majority']
+
+PROFILING_NETWORKS = os.path.join(os.path.dirname(__file__), os.pardir,
+                                  os.pardir, 'profiling', 'networks')
+
+
+def _build(inputs, rule):
+    """Build a network of deterministic nodes.
+
+    Args:
+        inputs (list[list[int]]): The inputs of each node.
+        rule (Callable): Returns the next state of node ``i`` given ``i`` and
+            the states of its inputs.
+    """
+    n = len(inputs)
+    cm = np.zeros((n, n), dtype=int)
+    for i, node_inputs in enumerate(inputs):
+        cm[node_inputs, i] = 1
+
+    tpm = np.array([
+        [rule(i, [state[j] for j in node_inputs])
+         for i, node_inputs in enumerate(inputs)]
+        for state in utils.all_states(n)])
+
+    network = Network(tpm, cm=cm)
+    return network, tuple(int(x) for x in tpm[0])
+
+
+def _majority(i, states):
+    return int(2 * sum(states) > len(states))
+
+
+def ring(n):
+    """Nodes in a ring, each taking the majority of itself and its two
+    neighbors.
+    """
+    inputs = [sorted({(i - 1) % n, i, (i + 1) % n}) for i in range(n)]
+    return _build(inputs, _majority)
+
+
+def modular(n, module_size=3):
+    """Fully-connected modules of OR gates, chained by a single connection
+    from the first node of each module to the first node of the next.
+    """
+    modules = [list(range(start, min(start + module_size, n)))
+               for start in range(0, n, module_size)]
+
+    inputs = []
+    for m, module in enumerate(modules):
+        for node in module:
+            node_inputs = list(module)
+            if node == module[0] and len(modules) > 1:
+                node_inputs.append(modules[m - 1][0])
+            inputs.append(sorted(set(node_inputs)))
+
+    def rule(i, states):
+        return int(any(states))
+
+    return _build(inputs, rule)
+
+
+def random_network(n, density=0.5, seed=0):
+    """Nodes with random truth tables and random inputs, each connection
+    present with probability ``density``. Every node has at least one input.
+    """
+    random = np.random.RandomState(seed)
+    inputs = []
+    for i in range(n):
+        node_inputs = list(np.flatnonzero(random.rand(n) < density))
+        if not node_inputs:
+            node_inputs = [random.randint(n)]
+        inputs.append(node_inputs)
+
+    tables = [random.randint(2, size=2 ** len(node_inputs))
+              for node_inputs in inputs]
+
+    def rule(i, states):
+        # Little-endian index into the truth table
+        return int(tables[i][sum(s << k for k, s in enumerate(states))])
+
+    return _build(inputs, rule)
+
+
+def majority(n):
+    """A complete network of majority gates."""
+    inputs = [list(range(n)) for i in range(n)]
+    return _build(inputs, _majority)
+
+
+def generate(kind, n):
+    """Return a network of the given kind and size and a reachable state."""
+    if kind == 'ring':
+        return ring(n)
+    if kind == 'modular':
+        return modular(n)
+    if kind == 'random':
+        return random_network(n)
+    if kind == 'majority':
+        return majority(n)
+    raise ValueError(kind)
+
+
+def profiling_network_names(max_size=None):
+    """The names of the networks in ``profiling/networks``, optionally only
+    those with at most ``max_size`` nodes.
+    """
+    names = sorted(os.path.splitext(f)[0]
+                   for f in os.listdir(PROFILING_NETWORKS)
+                   if f.endswith('.json'))
+    if max_size is not None:
+        names = [name for name in names if int(name.split('-')[0]) <= max_size]
+    return names
+
+
+def load_profiling_network(name):
+    """Load a network and state from ``profiling/networks``."""
+    with open(os.path.join(PROFILING_NETWORKS, name + '.json')) as f:
+        data = json.load(f)
+    # These files predate the current network JSON format
+    network = Network(data['network']['tpm'], cm=data['network']['cm'])
+    return network, tuple(data['state'])
@@ -0,0 +1,376 @@
+"""
+Scaling benchmarks of the hot paths of PyPhi.
+
+Each benchmark is parameterized by the kind of network (see ``networks.py``)
+and its size, so that the results give a scaling curve for every stage. Stages
+which depend on the parallelization settings are also parameterized by the
+execution mode. ``time_`` benchmarks measure wall time and ``peakmem_``
+benchmarks the peak resident memory of the process.
+"""
+
+import timeit
+
+import numpy as np
+
+from pyphi import (Subsystem, actual, binary, compute, config, convert,
+                   examples, jsonify, macro, timescale, tpm)
+from pyphi.direction import Direction
+from pyphi.models import Cut
+from pyphi.partition import directed_bipartition
+
+from . import networks
+from .subsystem import clear_network_caches, clear_subsystem_caches
+
+
+class _Benchmark:
+
+    # Use `default_timer` (clock time) instead of process time because
+    # parallel execution spawns separate processes which are not counted
+    # in process time.
+    timer = timeit.default_timer
+    timeout = 600
+
+    def setup(self, kind, size, *args):
+        # Save config
+        self.default_config = config.snapshot()
+        config.PROGRESS_BARS = False
+        config.CACHE_SIAS = False
+
+        self.network, self.state = networks.generate(kind, size)
+        self.subsystem = Subsystem(self.network, self.state)
+
+    def teardown(self, *args):
+        # Revert config
+        config.load_dict(self.default_config)
+
+
+def _set_mode(mode):
+    parallel = (mode == 'parallel')
+    config.PARALLEL_CONCEPT_EVALUATION = False
+    config.PARALLEL_CUT_EVALUATION = parallel
+    config.PARALLEL_COMPLEX_EVALUATION = False
+
+
+class BenchmarkMechanism(_Benchmark):
+    """Mechanism-level stages: the MIP and MICE of the whole system over
+    itself.
+    """
+
+    params = [networks.KINDS, [3, 4, 5, 6]]
+    param_names = ['kind', 'size']
+
+    def time_find_mip(self, kind, size):
+        clear_subsystem_caches(self.subsystem)
+        nodes = self.subsystem.node_indices
+        self.subsystem.find_mip(Direction.CAUSE, nodes, nodes)
+        self.subsystem.find_mip(Direction.EFFECT, nodes, nodes)
+
+    def time_find_mice(self, kind, size):
+        clear_subsystem_caches(self.subsystem)
+        nodes = self.subsystem.node_indices
+        self.subsystem.mic(nodes)
+        self.subsystem.mie(nodes)
+
+    def time_potential_purviews(self, kind, size):
+        clear_network_caches(self.network)
+        for mechanism in self.subsystem.node_indices:
+            self.subsystem.potential_purviews(Direction.CAUSE, (mechanism,))
+            self.subsystem.potential_purviews(Direction.EFFECT, (mechanism,))
+
+
+class BenchmarkSystem(_Benchmark):
+    """System-level stages, sequentially and in parallel."""
+
+    params = [networks.KINDS, [3, 4, 5], ['sequential', 'parallel']]
+    param_names = ['kind', 'size', 'mode']
+    number = 1
+    repeat = 1
+
+    def setup(self, kind, size, mode):
+        super().setup(kind, size)
+        _set_mode(mode)
+
+    def time_ces(self, kind, size, mode):
+        clear_subsystem_caches(self.subsystem)
+        compute.ces(self.subsystem, parallel=(mode == 'parallel'))
+
+    def time_sia(self, kind, size, mode):
+        clear_subsystem_caches(self.subsystem)
+        compute.sia(self.subsystem)
+
+    def peakmem_sia(self, kind, size, mode):
+        clear_subsystem_caches(self.subsystem)
+        compute.sia(self.subsystem)
+
+
+class BenchmarkComplexes(_Benchmark):
+    """Finding all complexes, sequentially and in parallel."""
+
+    params = [networks.KINDS, [3, 4, 5], ['sequential', 'parallel']]
+    param_names = ['kind', 'size', 'mode']
+    number = 1
+    repeat = 1
+
+    def setup(self, kind, size, mode):
+        super().setup(kind, size)
+        config.PARALLEL_CONCEPT_EVALUATION = False
+        config.PARALLEL_CUT_EVALUATION = False
+        config.PARALLEL_COMPLEX_EVALUATION = (mode == 'parallel')
+
+    def time_all_complexes(self, kind, size, mode):
+        compute.all_complexes(self.network, self.state)
+
+    def peakmem_all_complexes(self, kind, size, mode):
+        compute.all_complexes(self.network, self.state)
+
+
+class BenchmarkTPM(_Benchmark):
+    """Operations on TPMs, which scale to larger networks."""
+
+    params = [networks.KINDS, [4, 6, 8, 10, 12]]
+    param_names = ['kind', 'size']
+
+    def setup(self, kind, size):
+        super().setup(kind, size)
+        self.sbs = convert.state_by_node2state_by_state(self.network.tpm)
+
+    def time_condition_tpm(self, kind, size):
+        # Condition on every other node
+        fixed = self.network.node_indices[::2]
+        tpm.condition_tpm(self.network.tpm, fixed, self.state)
+
+    def time_state_by_node2state_by_state(self, kind, size):
+        convert.state_by_node2state_by_state(self.network.tpm)
+
+    def time_state_by_state2state_by_node(self, kind, size):
+        convert.state_by_state2state_by_node(self.sbs)
+
+    def peakmem_state_by_node2state_by_state(self, kind, size):
+        convert.state_by_node2state_by_state(self.network.tpm)
+
+    def time_infer_cm(self, kind, size):
+        tpm.infer_cm(self.network.tpm)
+
+    def time_infer_cm_in_blocks(self, kind, size):
+        tpm.infer_cm(self.network.tpm, block_size=64)
+
+
+class BenchmarkConvert:
+    """Converting large deterministic and nondeterministic TPMs between the
+    state-by-node and state-by-state forms.
+    """
+
+    params = [['deterministic', 'nondeterministic'], [8, 10, 12, 13]]
+    param_names = ['tpm', 'size']
+    timeout = 600
+
+    def setup(self, kind, size):
+        random = np.random.RandomState(0)
+        self.sbn = random.rand(2 ** size, size)
+        if kind == 'deterministic':
+            self.sbn = np.round(self.sbn)
+        self.sbs = convert.state_by_node2state_by_state(self.sbn)
+
+    def time_state_by_node2state_by_state(self, kind, size):
+        convert.state_by_node2state_by_state(self.sbn)
+
+    def time_state_by_state2state_by_node(self, kind, size):
+        convert.state_by_state2state_by_node(self.sbs)
+
+    def peakmem_state_by_node2state_by_state(self, kind, size):
+        convert.state_by_node2state_by_state(self.sbn)
+
+
+class BenchmarkTimescale:
+    """Running deterministic and nondeterministic TPMs forward in time, with
+    each method.
+    """
+
+    params = [['deterministic', 'nondeterministic'], [8, 10, 12, 13],
+              list(timescale.METHODS)]
+    param_names = ['tpm', 'size', 'method']
+    timeout = 600
+
+    def setup(self, kind, size, method):
+        if method == 'squaring' and size > 10:
+            raise NotImplementedError
+        random = np.random.RandomState(0)
+        self.tpm = random.rand(2 ** size, size)
+        if kind == 'deterministic':
+            self.tpm = np.round(self.tpm)
+
+    def time_run_tpm(self, kind, size, method):
+        timescale.run_tpm(self.tpm, 4, method=method)
+
+    def peakmem_run_tpm(self, kind, size, method):
+        timescale.run_tpm(self.tpm, 4, method=method)
+
+
+class BenchmarkJSON(_Benchmark):
+    """Serializing and deserializing a system irreducibility analysis, as JSON
+    and in the binary format.
+    """
+
+    params = [networks.KINDS, [3, 4, 5]]
+    param_names = ['kind', 'size']
+
+    def setup(self, kind, size):
+        super().setup(kind, size)
+        config.PARALLEL_CUT_EVALUATION = False
+        self.sia = compute.sia(self.subsystem)
+        self.string = jsonify.dumps(self.sia)
+        self.bytes = binary.dumps(self.sia)
+
+    def time_dumps(self, kind, size):
+        jsonify.dumps(self.sia)
+
+    def time_loads(self, kind, size):
+        jsonify.loads(self.string)
+
+    def track_size(self, kind, size):
+        return len(self.string)
+
+    track_size.unit = 'bytes'
+
+    def time_binary_dumps(self, kind, size):
+        binary.dumps(self.sia)
+
+    def time_binary_loads(self, kind, size):
+        binary.loads(self.bytes)
+
+    def track_binary_size(self, kind, size):
+        return len(self.bytes)
+
+    track_binary_size.unit = 'bytes'
+
+
+class BenchmarkMacro(_Benchmark):
+    """Searching for emergent macro systems, sequentially and in parallel."""
+
+    params = [networks.KINDS, [3, 4], ['sequential', 'parallel']]
+    param_names = ['kind', 'size', 'mode']
+    number = 1
+    repeat = 1
+
+    def setup(self, kind, size, mode):
+        super().setup(kind, size)
+        config.PARALLEL_CUT_EVALUATION = False
+        config.PARALLEL_MACRO_EVALUATION = (mode == 'parallel')
+
+    def time_emergence(self, kind, size, mode):
+        macro.emergence(self.network, self.state)
+
+    def peakmem_emergence(self, kind, size, mode):
+        macro.emergence(self.network, self.state)
+
+
+def _macro_subsystem(kind):
+    if kind == 'blackbox':
+        network = examples.blackbox_network()
+        blackbox = macro.Blackbox(((0, 1, 2), (3, 4, 5)), (2, 5))
+        return macro.MacroSubsystem(network, (0,) * 6, network.node_indices,
+                                    blackbox=blackbox, time_scale=2)
+    network = examples.macro_network()
+    coarse_grain = macro.CoarseGrain(((0, 1), (2, 3)),
+                                     (((0, 1), (2,)), ((0, 1), (2,))))
+    return macro.MacroSubsystem(network, (0,) * 4, network.node_indices,
+                                coarse_grain=coarse_grain)
+
+
+class BenchmarkMacroSubsystem:
+    """The SIA of blackboxed and coarse-grained macro systems, which applies
+    every cut to the micro elements.
+    """
+
+    params = [['blackbox', 'coarse_grain']]
+    param_names = ['kind']
+    timer = timeit.default_timer
+    number = 1
+    repeat = 3
+
+    def setup(self, kind):
+        self.default_config = config.snapshot()
+        config.PROGRESS_BARS = False
+        config.CACHE_SIAS = False
+        config.PARALLEL_CUT_EVALUATION = False
+        self.subsystem = _macro_subsystem(kind)
+
+    def teardown(self, kind):
+        config.load_dict(self.default_config)
+
+    def time_sia(self, kind):
+        # Clear the cached stages of the micro-to-macro pipeline
+        if hasattr(self.subsystem, '_stage_cache'):
+            self.subsystem._stage_cache.clear()
+        clear_subsystem_caches(self.subsystem)
+        compute.sia(self.subsystem)
+
+    def time_apply_cuts(self, kind):
+        if hasattr(self.subsystem, '_stage_cache'):
+            self.subsystem._stage_cache.clear()
+        nodes = self.subsystem.cut_indices
+        for from_nodes, to_nodes in directed_bipartition(nodes,
+                                                         nontrivial=True):
+            self.subsystem.apply_cut(Cut(from_nodes, to_nodes))
+
+
+class BenchmarkActual(_Benchmark):
+    """Actual causation analysis of the transition into the benchmark state,
+    with the cuts of the transition evaluated sequentially and in parallel.
+    """
+
+    params = [networks.KINDS, [3, 4, 5], ['sequential', 'parallel']]
+    param_names = ['kind', 'size', 'mode']
+    number = 1
+    repeat = 1
+
+    def setup(self, kind, size, mode):
+        super().setup(kind, size)
+        config.PARALLEL_CUT_EVALUATION = False
+        config.PARALLEL_AC_CUT_EVALUATION = (mode == 'parallel')
+        # The network transitions from the all-off state to `self.state`
+        before_state = (0,) * size
+        nodes = self.network.node_indices
+        self.transition = actual.Transition(
+            self.network, before_state, self.state, nodes, nodes)
+
+    def time_sia(self, kind, size, mode):
+        self.transition._causal_link_cache.clear()
+        actual.sia(self.transition)
+
+    def time_nexus(self, kind, size, mode):
+        actual.causal_nexus(self.network, (0,) * size, self.state)
+
+    def time_apply_cuts(self, kind, size, mode):
+        for cut in actual._get_cuts(self.transition, Direction.BIDIRECTIONAL):
+            self.transition.apply_cut(cut)
+
+
+class BenchmarkProfilingNetworks:
+    """The networks in ``profiling/networks``."""
+
+    params = [networks.profiling_network_names(max_size=6),
+              ['sequential', 'parallel']]
+    param_names = ['network', 'mode']
+    timer = timeit.default_timer
+    number = 1
+    repeat = 1
+    timeout = 3600
+
+    def setup(self, name, mode):
+        self.default_config = config.snapshot()
+        config.PROGRESS_BARS = False
+        config.CACHE_SIAS = False
+        _set_mode(mode)
+
+        self.network, self.state = networks.load_profiling_network(name)
+        self.subsystem = Subsystem(self.network, self.state)
+
+    def teardown(self, name, mode):
+        config.load_dict(self.default_config)
+
+    def time_sia(self, name, mode):
+        compute.sia(self.subsystem)
+
+    def peakmem_sia(self, name, mode):
+        compute.sia(self.subsystem)
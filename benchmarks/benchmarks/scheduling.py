@@ -0,0 +1,42 @@
+from pyphi import compute, config
+from pyphi.compute import scheduling
+
+from . import networks
+
+# All the complexes of the larger networks take too long to find
+NETWORKS = networks.profiling_network_names(max_size=5)
+
+
+class BenchmarkScheduling:
+    """Simulated makespan of finding all complexes of a network.
+
+    The cost of each subsystem is the measured time of its SIA, so these track
+    how well the cost model orders the tasks, independently of the machine.
+    """
+
+    params = [
+        ['enumeration', 'cost'],
+        NETWORKS,
+        [2, 4, 8],
+    ]
+    param_names = ['order', 'network', 'workers']
+    timeout = 3600
+
+    def setup_cache(self):
+        config.PROGRESS_BARS = False
+        config.PARALLEL_CUT_EVALUATION = False
+        times = {}
+        for name in NETWORKS:
+            network, state = networks.load_profiling_network(name)
+            sias = compute.all_complexes(network, state)
+            times[name] = [(scheduling.cost_model.predict(sia.subsystem),
+                            sia.time) for sia in sias]
+        return times
+
+    def track_makespan(self, times, order, network, workers):
+        tasks = times[network]
+        if order == 'cost':
+            tasks = sorted(tasks, key=lambda task: task[0], reverse=True)
+        return scheduling.makespan([time for _, time in tasks], workers)
+
+    track_makespan.unit = 'seconds'
@@ -203,6 +203,7 @@ r"""
 .. |EPSILON| replace:: :const:`~pyphi.constants.EPSILON`
 .. |PICK_SMALLEST_PURVIEW| replace:: :const:`~pyphi.config.PICK_SMALLEST_PURVIEW`
 .. |PARTITION_TYPE| replace:: :const:`~pyphi.config.PARTITION_TYPE`
+.. |MEASURE| replace:: :const:`~pyphi.config.MEASURE`
 .. |PRECISION| replace:: :const:`~pyphi.config.PRECISION`
 """,
 # Modules
@@ -211,6 +212,7 @@ r"""
 .. |compute.distance| replace:: :mod:`pyphi.compute.distance`
 .. |compute.network| replace:: :mod:`pyphi.compute.network`
 .. |compute.parallel| replace:: :mod:`pyphi.compute.parallel`
+.. |compute.scheduling| replace:: :mod:`pyphi.compute.scheduling`
 .. |compute.subsystem| replace:: :mod:`pyphi.compute.subsystem`
 
 .. |models.subsystem| replace:: :mod:`pyphi.models.subsystem`
@@ -233,6 +235,7 @@ r"""
 r"""
 .. |compute.conceptual_info()| replace:: :func:`~pyphi.compute.subsystem.conceptual_info`
 .. |compute.sia()| replace:: :func:`~pyphi.compute.subsystem.sia`
+.. |compute.sias()| replace:: :func:`~pyphi.compute.subsystem.sias`
 .. |compute.phi()| replace:: :func:`~pyphi.compute.subsystem.phi`
 
 .. |compute.subsystems()| replace:: :func:`~pyphi.compute.network.subsystems`
@@ -240,6 +243,8 @@ r"""
 .. |compute.complexes()| replace:: :func:`~pyphi.compute.network.complexes`
 .. |compute.all_complexes()| replace:: :func:`~pyphi.compute.network.all_complexes`
 .. |compute.condensed()| replace:: :func:`~pyphi.compute.network.condensed`
+.. |compute.major_complex()| replace:: :func:`~pyphi.compute.network.major_complex`
+.. |compute.state_subsystems()| replace:: :func:`~pyphi.compute.network.state_subsystems`
 
 .. |Subsystem.clear_caches()| replace:: :func:`~pyphi.subsystem.Subsystem.clear_caches`
 
@@ -247,6 +252,10 @@ r"""
 
 .. |le_index2state()| replace:: :func:`~pyphi.convert.le_index2state`
 .. |be_index2state()| replace:: :func:`~pyphi.convert.be_index2state`
+
+.. |repertoire_distance()| replace:: :func:`~pyphi.distance.repertoire_distance`
+.. |marginal_bound()| replace:: :func:`~pyphi.distance.marginal_bound`
+.. |mip_partitions()| replace:: :func:`~pyphi.partition.mip_partitions`
 """,
 # Classes
 r"""
@@ -311,6 +320,7 @@ r"""
 .. |Subsystem.find_mip()| replace:: :meth:`~pyphi.subsystem.Subsystem.find_mip`
 .. |find_mip()| replace:: :meth:`~pyphi.subsystem.Subsystem.find_mip`
 .. |Subsystem.find_mice()| replace:: :meth:`~pyphi.subsystem.Subsystem.find_mice`
+.. |Transition.find_causal_link()| replace:: :meth:`~pyphi.actual.Transition.find_causal_link`
 .. |find_mice()| replace:: :meth:`~pyphi.subsystem.Subsystem.find_mice`
 """
 ])
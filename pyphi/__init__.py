@@ -73,13 +73,15 @@ from .__about__ import *  # pylint: disable=wildcard-import
 from .conf import config
 
 from .direction import Direction
-from . import (actual, constants, convert, db, examples, jsonify, macro,
-               models, network, node, subsystem, utils, validate)
+from . import (actual, binary, constants, convert, db, examples,
+               instrumentation, jsonify, macro, models, network, node, store,
+               subsystem, utils, validate)
 from .network import Network
 from .subsystem import Subsystem
 from .actual import Transition
 
 
-__all__ = ['Network', 'Subsystem', 'actual', 'config', 'constants', 'convert',
-           'db', 'examples', 'jsonify', 'macro', 'models', 'network', 'node',
-           'subsystem', 'utils', 'validate']
+__all__ = ['Network', 'Subsystem', 'actual', 'binary', 'config', 'constants',
+           'convert', 'db', 'examples', 'instrumentation', 'jsonify', 'macro',
+           'models', 'network', 'node', 'store', 'subsystem', 'utils',
+           'validate']
@@ -6,20 +6,23 @@
 Methods for computing actual causation of subsystems and mechanisms.
 """
 
+import copy
 import logging
-from itertools import chain
+from itertools import chain, islice
 from math import log2 as _log2
 
 import numpy as np
 
-from . import (Direction, compute, config, connectivity, constants, exceptions,
-               utils, validate)
+from . import (Direction, cache, compute, config, connectivity, constants,
+               exceptions, instrumentation, utils, validate)
 from .models import (Account, AcRepertoireIrreducibilityAnalysis,
                      AcSystemIrreducibilityAnalysis, ActualCut, CausalLink,
                      DirectedAccount, Event, NullCut, _null_ac_ria,
                      _null_ac_sia, fmt)
+from .node import Node
 from .partition import mip_partitions
 from .subsystem import Subsystem
+from .tpm import marginalize_out
 
 log = logging.getLogger(__name__)
 
@@ -29,6 +32,59 @@ def log2(x):
     return round(_log2(x), config.PRECISION)
 
 
+def _system_view(system, state=None, cut=None, cm=None, node_cache=None):
+    """Return a copy of a |Subsystem| in a different state or with a
+    different cut, which shares the conditioned TPM of ``system`` and the
+    nodes whose connections are unchanged.
+
+    Unlike a new |Subsystem|, the view is not validated, and the state of the
+    view only determines the states of its nodes: the TPM remains conditioned
+    on the background conditions of ``system``.
+
+    Keyword Args:
+        state (tuple[int]): The state of the view.
+        cut (ActualCut): The cut of the view.
+        cm (np.ndarray): The connectivity matrix of the network with ``cut``
+            applied, if already computed.
+        node_cache (dict): Nodes rebuilt for other cuts of views of the same
+            system, keyed by index and connections.
+    """
+    view = copy.copy(system)
+    view._mice_cache = cache.MICECache(view)
+    view._single_node_repertoire_cache = cache.DictCache()
+    view._repertoire_cache = cache.DictCache()
+
+    if state is not None:
+        view.state = tuple(state)
+        nodes = []
+        for node in system.nodes:
+            node = copy.copy(node)
+            node.state = view.state[node.index]
+            nodes.append(node)
+        view.nodes = tuple(nodes)
+
+    if cut is not None:
+        view.cut = cut
+        view.cm = cut.apply_cut(system.network.cm) if cm is None else cm
+        # Rebuild the nodes whose inputs or outputs have changed
+        changed = (view.cm != system.cm)
+        changed = set(np.flatnonzero(changed.any(0) | changed.any(1)))
+        node_cache = {} if node_cache is None else node_cache
+        nodes = []
+        for node in view.nodes:
+            if node.index in changed:
+                i = node.index
+                key = (i, view.cm[:, i].tobytes(), view.cm[i].tobytes())
+                if key not in node_cache:
+                    node_cache[key] = Node(view.tpm, view.cm, i, node.state,
+                                           node.node_labels)
+                node = node_cache[key]
+            nodes.append(node)
+        view.nodes = tuple(nodes)
+
+    return view
+
+
 class Transition:
     """A state transition between two sets of nodes in a network.
 
@@ -53,6 +109,9 @@ class Transition:
     Keyword Args:
         noise_background (bool): If ``True``, background conditions are
             noised instead of frozen.
+        causal_link_cache (CausalLinkCache): The causal link cache of the
+            uncut version of this transition. Links which are unaffected by
+            ``cut`` are reused.
 
     Attributes:
         node_indices (tuple[int]): The indices of the nodes in the system.
@@ -76,11 +135,14 @@ class Transition:
     """
 
     def __init__(self, network, before_state, after_state, cause_indices,
-                 effect_indices, cut=None, noise_background=False):
+                 effect_indices, cut=None, noise_background=False,
+                 causal_link_cache=None, _background_system=None,
+                 _purview_cache=None):
 
         self.network = network
         self.before_state = before_state
         self.after_state = after_state
+        self.noise_background = noise_background
 
         coerce_to_indices = self.node_labels.coerce_to_indices
         self.cause_indices = coerce_to_indices(cause_indices)
@@ -103,21 +165,27 @@ class Transition:
             external_indices = tuple(sorted(
                 set(network.node_indices) - set(cause_indices)))
 
-        # Both are conditioned on the `before_state`, but we then change the
-        # state of the cause context to `after_state` to reflect the fact that
-        # that we are computing cause repertoires of mechanisms in that state.
-        with config.override(VALIDATE_SUBSYSTEM_STATES=False):
-            self.effect_system = Subsystem(network, before_state,
-                                           self.node_indices, self.cut,
-                                           _external_indices=external_indices)
+        # Both are conditioned on the `before_state`, but the state of the
+        # cause system is `after_state` to reflect the fact that that we are
+        # computing cause repertoires of mechanisms in that state. The cause
+        # system shares the conditioned TPM of the effect system.
+        if _background_system is None:
+            with config.override(VALIDATE_SUBSYSTEM_STATES=False):
+                self.effect_system = Subsystem(
+                    network, before_state, self.node_indices, self.cut,
+                    _external_indices=external_indices)
+        else:
+            # A system of the uncut transition, conditioned on the same
+            # background conditions
+            validate.state_length(before_state, network.size)
+            self.effect_system = _system_view(_background_system,
+                                              state=before_state)
 
-            self.cause_system = Subsystem(network, before_state,
-                                          self.node_indices, self.cut,
-                                          _external_indices=external_indices)
+        self.cause_system = _system_view(self.effect_system, state=after_state)
 
-        self.cause_system.state = after_state
-        for node in self.cause_system.nodes:
-            node.state = after_state[node.index]
+        # The nodes of cut versions of the systems, which are shared by all
+        # cut versions of this transition
+        self._node_cache = {Direction.CAUSE: {}, Direction.EFFECT: {}}
 
         # Validate the cause system
         # The state of the effect system does not need to be reachable
@@ -131,6 +199,18 @@ class Transition:
             Direction.EFFECT: self.effect_system
         }
 
+        # Reusable cache for causal links
+        self._causal_link_cache = cache.CausalLinkCache(self,
+                                                        causal_link_cache)
+
+        # Cache for the probabilities of parts of partitions, which are shared
+        # by many partitions
+        self._probability_cache = cache.DictCache()
+
+        # Potential purviews only depend on the connectivity of the
+        # transition, so they can be shared by transitions in other states
+        self._purview_cache = _purview_cache or cache.PurviewCache()
+
     def __repr__(self):
         return fmt.fmt_transition(self)
 
@@ -174,9 +254,35 @@ class Transition:
         }
 
     def apply_cut(self, cut):
-        """Return a cut version of this transition."""
-        return Transition(self.network, self.before_state, self.after_state,
-                          self.cause_indices, self.effect_indices, cut)
+        """Return a cut version of this transition.
+
+        The cut transition shares the conditioned TPMs of this transition and
+        the nodes whose connections are not severed by ``cut``. Causal links
+        of this transition which are unaffected by ``cut`` are reused if this
+        transition is uncut.
+        """
+        parent_cache = self._causal_link_cache if self.cut.is_null else None
+
+        transition = copy.copy(self)
+        transition.cut = cut
+
+        cm = cut.apply_cut(self.network.cm)
+        transition.effect_system = _system_view(
+            self.effect_system, cut=cut, cm=cm,
+            node_cache=self._node_cache[Direction.EFFECT])
+        transition.cause_system = _system_view(
+            self.cause_system, cut=cut, cm=cm,
+            node_cache=self._node_cache[Direction.CAUSE])
+        transition.system = {
+            Direction.CAUSE: transition.cause_system,
+            Direction.EFFECT: transition.effect_system
+        }
+
+        transition._causal_link_cache = cache.CausalLinkCache(transition,
+                                                              parent_cache)
+        transition._probability_cache = cache.DictCache()
+        transition._purview_cache = cache.PurviewCache()
+        return transition
 
     def cause_repertoire(self, mechanism, purview):
         """Return the cause repertoire."""
@@ -201,8 +307,11 @@ class Transition:
             direction (str): The temporal direction, specifiying the cause or
                 effect repertoire.
         """
-        system = self.system[direction]
-        node_labels = system.node_labels
+        self._validate(direction, mechanism, purview)
+        return self.system[direction].repertoire(direction, mechanism, purview)
+
+    def _validate(self, direction, mechanism, purview):
+        node_labels = self.node_labels
 
         if not set(purview).issubset(self.purview_indices(direction)):
             raise ValueError('{} is not a {} purview in {}'.format(
@@ -212,8 +321,6 @@ class Transition:
             raise ValueError('{} is no a {} mechanism in {}'.format(
                 fmt.fmt_mechanism(mechanism, node_labels), direction, self))
 
-        return system.repertoire(direction, mechanism, purview)
-
     def state_probability(self, direction, repertoire, purview,):
         """Compute the probability of the purview in its current state given
         the repertoire.
@@ -234,10 +341,102 @@ class Transition:
     def probability(self, direction, mechanism, purview):
         """Probability that the purview is in it's current state given the
         state of the mechanism.
-        """
-        repertoire = self.repertoire(direction, mechanism, purview)
 
-        return self.state_probability(direction, repertoire, purview)
+        This is the entry of the repertoire of the mechanism over the purview
+        at the state of the purview, but it is computed directly from the node
+        TPMs without computing the repertoire.
+        """
+        self._validate(direction, mechanism, purview)
+        return self._point_probability(direction, mechanism, purview)
+
+    @cache.method('_probability_cache')
+    def _point_probability(self, direction, mechanism, purview):
+        if not purview:
+            return 1.0
+        if direction == Direction.CAUSE:
+            return self._cause_probability(mechanism, purview)
+        return self._effect_probability(mechanism, purview)
+
+    def _cause_probability(self, mechanism, purview):
+        """The entry of the cause repertoire at ``before_state``.
+
+        See :meth:`Subsystem.cause_repertoire`. The numerator is the product
+        of the entries of the single-node cause repertoires; the normalization
+        sums their product over the states of the purview, one contraction of
+        the single-node repertoires, so the joint distribution is never
+        formed.
+        """
+        # The unconstrained cause repertoire is the uniform distribution
+        if not mechanism:
+            return 0.5 ** len(purview)
+
+        purview = frozenset(purview)
+        nodes = self.cause_system._index2node
+        factors = [
+            self._single_node_cause_factor(index,
+                                           nodes[index].inputs & purview)
+            for index in mechanism]
+
+        probability = 1.0
+        for _, inputs, value in factors:
+            probability *= value
+        if probability == 0:
+            return 0.0
+
+        # Purview nodes which are not inputs of the mechanism contribute a
+        # uniform factor
+        uniform = purview.difference(*(inputs for _, inputs, _ in factors))
+        if len(factors) == 1:
+            normalization = factors[0][0].sum()
+        else:
+            # Label the axes of the contraction by position in the purview
+            axes = {i: axis for axis, i in enumerate(sorted(purview))}
+            operands = []
+            for tpm, inputs, _ in factors:
+                operands += [tpm, [axes[i] for i in inputs]]
+            normalization = np.einsum(*operands, [],
+                                      optimize=len(factors) > 2)
+        return probability / (normalization * 2 ** len(uniform))
+
+    @cache.method('_probability_cache', Direction.CAUSE)
+    def _single_node_cause_factor(self, index, purview):
+        """The single-node cause repertoire of a mechanism node over its
+        inputs in the purview, the inputs, and the entry of the repertoire at
+        ``before_state``.
+        """
+        node = self.cause_system._index2node[index]
+        tpm = marginalize_out(node.inputs - purview, node.tpm[..., node.state])
+        inputs = tuple(i for i, size in enumerate(tpm.shape) if size > 1)
+        value = tpm[tuple(self.before_state[i] if i in inputs else 0
+                          for i in range(tpm.ndim))]
+        return tpm.reshape([2] * len(inputs)), inputs, value
+
+    def _effect_probability(self, mechanism, purview):
+        """The entry of the effect repertoire at ``after_state``.
+
+        See :meth:`Subsystem.effect_repertoire`. This is the product of the
+        entries of the single-node effect repertoires.
+        """
+        mechanism = frozenset(mechanism)
+        nodes = self.effect_system._index2node
+        probability = 1.0
+        for index in purview:
+            probability *= self._single_node_effect_probability(
+                index, nodes[index].inputs & mechanism)
+        return probability
+
+    @cache.method('_probability_cache', Direction.EFFECT)
+    def _single_node_effect_probability(self, index, mechanism):
+        """The entry of the single-node effect repertoire of a purview node
+        at ``after_state``.
+        """
+        node = self.effect_system._index2node[index]
+        tpm = node.tpm[..., self.after_state[index]]
+        # Condition on the inputs in the mechanism and marginalize out the
+        # others
+        return tpm[tuple(
+            self.effect_system.state[i] if i in mechanism else slice(None)
+            for i in range(tpm.ndim))].mean()
 
     def unconstrained_probability(self, direction, purview):
         """Unconstrained probability of the purview."""
@@ -296,14 +495,21 @@ class Transition:
     def partitioned_probability(self, direction, partition):
         """Compute the probability of the mechanism over the purview in
         the partition.
+
+        This is the product of the probabilities of the parts, so as with
+        :meth:`probability` no repertoires are computed.
         """
-        repertoire = self.partitioned_repertoire(direction, partition)
-        return self.state_probability(direction, repertoire, partition.purview)
+        probability = 1.0
+        for part in partition:
+            probability *= self._point_probability(direction, part.mechanism,
+                                                   part.purview)
+        return probability
 
     # MIP methods
     # =========================================================================
 
     # TODO: alias to `irreducible_cause/effect ratio?
+    @cache.method('_causal_link_cache', 'find_mip')
     def find_mip(self, direction, mechanism, purview, allow_neg=False):
         """Find the ratio minimum information partition for a mechanism
         over a purview.
@@ -375,6 +581,9 @@ class Transition:
         Keyword Args:
             purviews (tuple[int]): Optional subset of purviews of interest.
         """
+        if purviews is False:
+            return self._all_potential_purviews(direction, mechanism)
+
         system = self.system[direction]
         return [
             purview for purview in system.potential_purviews(
@@ -382,8 +591,16 @@ class Transition:
             if set(purview).issubset(self.purview_indices(direction))
         ]
 
-    # TODO: Implement mice cache
-    # @cache.method('_mice_cache')
+    @cache.method('_purview_cache')
+    def _all_potential_purviews(self, direction, mechanism):
+        system = self.system[direction]
+        return [
+            purview for purview in system.potential_purviews(
+                direction, mechanism)
+            if set(purview).issubset(self.purview_indices(direction))
+        ]
+
+    @cache.method('_causal_link_cache')
     def find_causal_link(self, direction, mechanism, purviews=False,
                          allow_neg=False):
         """Return the maximally irreducible cause or effect ratio for a
@@ -469,6 +686,172 @@ def account(transition, direction=Direction.BIDIRECTIONAL):
                    directed_account(transition, Direction.EFFECT))
 
 
+@cache.cache(cache={})
+def _background_system(network, background_state, node_indices,
+                       external_indices):
+    """The uncut system of a transition, with its TPM conditioned on the
+    background conditions.
+
+    The system only depends on the states of the external nodes, so it is
+    shared by all transitions with the same background conditions.
+    """
+    with config.override(VALIDATE_SUBSYSTEM_STATES=False):
+        return Subsystem(network, background_state, node_indices,
+                         _external_indices=external_indices)
+
+
+@cache.cache(cache={})
+def _batch_purview_cache(network, cause_indices, effect_indices):
+    """The potential purviews of the uncut transitions between two sets of
+    nodes, which do not depend on the states of the transitions.
+    """
+    return cache.PurviewCache()
+
+
+def _batch_transition(network, before_state, after_state, cause_indices,
+                      effect_indices, noise_background):
+    """Return a transition whose conditioned TPM and nodes are shared with
+    all other transitions of the batch with the same background conditions.
+    """
+    node_indices = tuple(sorted(set(cause_indices + effect_indices)))
+    if noise_background:
+        external_indices = ()
+    else:
+        external_indices = tuple(sorted(
+            set(network.node_indices) - set(cause_indices)))
+    # Only the states of the external nodes matter
+    background_state = tuple(before_state[i] if i in external_indices else 0
+                             for i in network.node_indices)
+
+    system = _background_system(network, background_state, node_indices,
+                                external_indices)
+    purview_cache = _batch_purview_cache(network, cause_indices,
+                                         effect_indices)
+    return Transition(network, before_state, after_state, cause_indices,
+                      effect_indices, noise_background=noise_background,
+                      _background_system=system, _purview_cache=purview_cache)
+
+
+class ComputeAccounts(compute.parallel.MapReduce):
+    """Computation engine for the accounts of many transitions of a network.
+
+    Tasks are chunks of ``(position, before_state, after_state)`` triples, and
+    the result is a dictionary mapping the position of each transition to its
+    account.
+    """
+    # pylint: disable=unused-argument,arguments-differ
+
+    description = 'Computing accounts'
+
+    def empty_result(self, *args):
+        return {}
+
+    @staticmethod
+    def compute(chunk, network, cause_indices, effect_indices, direction,
+                noise_background):
+        return [
+            (position, account(
+                _batch_transition(network, before_state, after_state,
+                                  cause_indices, effect_indices,
+                                  noise_background),
+                direction))
+            for position, before_state, after_state in chunk]
+
+    def process_result(self, new_result, accounts):
+        accounts.update(new_result)
+        return accounts
+
+
+def accounts(network, state_pairs, cause_indices=None, effect_indices=None,
+             direction=Direction.BIDIRECTIONAL, noise_background=False,
+             parallel=None, chunk_size=100):
+    """Compute the accounts of many transitions of the same network, *e.g.*
+    the successive transitions of a time series.
+
+    This is equivalent to computing the |Account| of a |Transition| for each
+    pair of states, but the systems of the transitions are only conditioned
+    on each distinct set of background conditions once, and the nodes of
+    each system are shared by all transitions with the same background
+    conditions. Accounts are yielded as they are computed, so results can be
+    written out while the computation continues.
+
+    Args:
+        network (Network): The network.
+        state_pairs (Iterable[tuple[tuple[int], tuple[int]]]): The
+            ``(before_state, after_state)`` pairs of the transitions.
+
+    Keyword Args:
+        cause_indices (tuple[int] or tuple[str]): The nodes of the cause
+            system of each transition. Defaults to the whole network.
+        effect_indices (tuple[int] or tuple[str]): The nodes of the effect
+            system of each transition. Defaults to the whole network.
+        direction (Direction): By default the accounts contain actual causes
+            and actual effects.
+        noise_background (bool): If ``True``, background conditions are
+            noised instead of frozen.
+        parallel (bool): Whether to compute the accounts in parallel.
+            Defaults to :data:`config.PARALLEL_COMPLEX_EVALUATION`.
+        chunk_size (int): The number of transitions in each task of a
+            parallel computation.
+
+    Yields:
+        Account: The account of each transition, in the order of
+        ``state_pairs``.
+
+    Raises:
+        StateUnreachableError: If the ``after_state`` of a transition cannot
+            be reached from any state.
+
+    Example:
+        >>> from pyphi import actual, examples
+        >>> network = examples.actual_causation()
+        >>> pairs = [((0, 1), (1, 0)), ((1, 1), (1, 1))]
+        >>> [len(account) for account in actual.accounts(network, pairs)]
+        [5, 5]
+    """
+    if parallel is None:
+        parallel = config.PARALLEL_COMPLEX_EVALUATION
+
+    coerce_to_indices = network.node_labels.coerce_to_indices
+    if cause_indices is None:
+        cause_indices = network.node_indices
+    if effect_indices is None:
+        effect_indices = network.node_indices
+    cause_indices = coerce_to_indices(cause_indices)
+    effect_indices = coerce_to_indices(effect_indices)
+
+    triples = ((position, tuple(before_state), tuple(after_state))
+               for position, (before_state, after_state)
+               in enumerate(state_pairs))
+
+    try:
+        if not parallel:
+            for _, before_state, after_state in triples:
+                transition = _batch_transition(
+                    network, before_state, after_state, cause_indices,
+                    effect_indices, noise_background)
+                yield account(transition, direction)
+            return
+
+        # Run the engine on enough chunks at a time to keep every process
+        # busy, and yield the accounts of each batch of chunks in order.
+        batch_size = 4 * compute.parallel.get_num_processes()
+        while True:
+            batch = [chunk for chunk in (list(islice(triples, chunk_size))
+                                         for _ in range(batch_size)) if chunk]
+            if not batch:
+                return
+            engine = ComputeAccounts(batch, network, cause_indices,
+                                     effect_indices, direction,
+                                     noise_background)
+            results = engine.run(parallel)
+            for position in sorted(results):
+                yield results[position]
+    finally:
+        _background_system.cache_clear()
+        _batch_purview_cache.cache_clear()
+
+
 # =============================================================================
 # AcSystemIrreducibilityAnalysiss and System cuts
 # =============================================================================
@@ -510,15 +893,14 @@ def _evaluate_cut(transition, cut, unpartitioned_account,
 # TODO: implement CUT_ONE approximation?
 def _get_cuts(transition, direction):
     """A list of possible cuts to a transition."""
-    n = transition.network.size
-
     if direction is Direction.BIDIRECTIONAL:
         yielded = set()
         for cut in chain(_get_cuts(transition, Direction.CAUSE),
                          _get_cuts(transition, Direction.EFFECT)):
-            cm = utils.np_hashable(cut.cut_matrix(n))
-            if cm not in yielded:
-                yielded.add(cm)
+            # Skip cuts which sever the same connections as an earlier cut
+            key = cut.severed_key()
+            if key not in yielded:
+                yielded.add(key)
                 yield cut
 
     else:
@@ -544,21 +926,38 @@ def sia(transition, direction=Direction.BIDIRECTIONAL):
     validate.direction(direction, allow_bi=True)
     log.info("Calculating big-alpha for %s...", transition)
 
+    if _trivially_reducible(transition):
+        return _null_ac_sia(transition, direction)
+
+    log.debug("Finding unpartitioned account...")
+    unpartitioned_account = account(transition, direction)
+    log.debug("Found unpartitioned account.")
+
+    return _sia(transition, direction, unpartitioned_account)
+
+
+def _trivially_reducible(transition):
+    """Return whether a transition is empty or not weakly connected, in which
+    case its |big_alpha| is zero.
+    """
     if not transition:
         log.info('Transition %s is empty; returning null SIA '
                  'immediately.', transition)
-        return _null_ac_sia(transition, direction)
+        return True
 
     if not connectivity.is_weak(transition.network.cm,
                                 transition.node_indices):
         log.info('%s is not strongly/weakly connected; returning null SIA '
                  'immediately.', transition)
-        return _null_ac_sia(transition, direction)
+        return True
 
-    log.debug("Finding unpartitioned account...")
-    unpartitioned_account = account(transition, direction)
-    log.debug("Found unpartitioned account.")
+    return False
 
+
+def _sia(transition, direction, unpartitioned_account):
+    """Return the |AcSystemIrreducibilityAnalysis| of a transition, given its
+    unpartitioned account.
+    """
     if not unpartitioned_account:
         log.info('Empty unpartitioned account; returning null AC SIA '
                  'immediately.')
@@ -567,7 +966,7 @@ def sia(transition, direction=Direction.BIDIRECTIONAL):
     cuts = _get_cuts(transition, direction)
     engine = ComputeACSystemIrreducibility(
         cuts, transition, direction, unpartitioned_account)
-    result = engine.run_sequential()
+    result = engine.run(config.PARALLEL_AC_CUT_EVALUATION)
     log.info("Finished calculating big-ac-phi data for %s.", transition)
     log.debug("RESULT: \n%s", result)
     return result
@@ -603,12 +1002,10 @@ class ComputeACSystemIrreducibility(compute.parallel.MapReduce):
 # =============================================================================
 
 
-# TODO: Fix this to test whether the transition is possible
-def transitions(network, before_state, after_state):
-    """Return a generator of all **possible** transitions of a network.
+def _transition_subsets(network):
+    """Yield the ``(cause_subset, effect_subset)`` pairs of all potential
+    transitions of a network.
     """
-    # TODO: Does not return subsystems that are in an impossible transitions.
-
     # Elements without inputs are reducibe effects,
     # elements without outputs are reducible causes.
     possible_causes = np.where(np.sum(network.cm, 1) > 0)[0]
@@ -616,32 +1013,147 @@ def transitions(network, before_state, after_state):
 
     for cause_subset in utils.powerset(possible_causes, nonempty=True):
         for effect_subset in utils.powerset(possible_effects, nonempty=True):
+            yield cause_subset, effect_subset
+
+
+# TODO: Fix this to test whether the transition is possible
+def transitions(network, before_state, after_state):
+    """Return a generator of all **possible** transitions of a network.
+    """
+    # TODO: Does not return subsystems that are in an impossible transitions.
+    for cause_subset, effect_subset in _transition_subsets(network):
+        try:
+            yield Transition(network, before_state, after_state,
+                             cause_subset, effect_subset)
+        except exceptions.StateUnreachableError:
+            pass
+
+
+class FindNexus(compute.parallel.MapReduce):
+    """Computation engine for the irreducible nexus of a network.
+
+    Potential transitions are given as ``(position, cause_subset,
+    effect_subset)`` triples, and the result is a list of ``(position, sia)``
+    pairs for the transitions with |big_alpha > 0|.
+
+    If ``prune`` is ``True``, only the maximal nexus is needed. The account of
+    each transition is computed before its cuts: since |big_alpha| is the
+    difference between the total |alpha| of the unpartitioned and partitioned
+    accounts, the total |alpha| of the account is an upper bound on it. If the
+    bound is less than the |big_alpha| of a transition which has already been
+    evaluated, the transition cannot be maximal and its cuts are not
+    evaluated. The number of such transitions is recorded in ``pruned``.
+    Because the tasks of a parallel computation are queued before any results
+    are available, pruning is only effective sequentially.
+    """
+    # pylint: disable=unused-argument,arguments-differ
+
+    description = 'Evaluating transitions'
+
+    def __init__(self, subsets, network, before_state, after_state,
+                 direction, prune=False):
+        self.prune = prune
+        self.pruned = 0
+        # The largest |big_alpha| found so far
+        self.max_alpha = float('-inf')
+        super().__init__(subsets, network, before_state, after_state,
+                         direction)
+
+    def empty_result(self, *args):
+        return []
+
+    def pending_tasks(self):
+        network, before_state, after_state, direction = self.context
+        for index, (position, causes, effects) in super().pending_tasks():
             try:
-                yield Transition(network, before_state, after_state,
-                                 cause_subset, effect_subset)
+                transition = Transition(network, before_state, after_state,
+                                        causes, effects)
             except exceptions.StateUnreachableError:
-                pass
+                self.progress.update(1)
+                continue
+
+            unpartitioned_account = None
+            if self.prune:
+                if _trivially_reducible(transition):
+                    bound = 0
+                else:
+                    unpartitioned_account = account(transition, direction)
+                    bound = sum(link.alpha for link in unpartitioned_account)
+
+                if bound + constants.EPSILON < self.max_alpha:
+                    self.pruned += 1
+                    instrumentation.count('actual.pruned')
+                    self.progress.update(1)
+                    continue
+
+            yield index, (position, transition, unpartitioned_account)
+
+    @staticmethod
+    def compute(task, network, before_state, after_state, direction):
+        position, transition, unpartitioned_account = task
+        if unpartitioned_account is None:
+            return position, sia(transition, direction)
+        return position, _sia(transition, direction, unpartitioned_account)
+
+    def process_result(self, new_result, sias):
+        position, new_sia = new_result
+        if new_sia:
+            sias.append((position, new_sia))
+            self.max_alpha = max(self.max_alpha, new_sia.alpha)
+        return sias
+
+
+def _nexus(network, before_state, after_state, direction, prune=False,
+           parallel=None):
+    """Return the ``(position, sia)`` pairs of the irreducible transitions of a
+    network, ordered by the position of the transition in ``transitions``.
+    """
+    if parallel is None:
+        parallel = config.PARALLEL_COMPLEX_EVALUATION
+
+    subsets = ((position,) + pair for position, pair in
+               enumerate(_transition_subsets(network)))
+    if prune:
+        # Evaluate large transitions first, since their accounts and
+        # |big_alpha| tend to be larger and give a tighter bound.
+        subsets = sorted(subsets, key=lambda s: -len(s[1]) - len(s[2]))
+
+    engine = FindNexus(subsets, network, before_state, after_state,
+                       direction, prune=prune)
+    return sorted(engine.run(parallel), key=lambda result: result[0])
 
 
 def nexus(network, before_state, after_state,
           direction=Direction.BIDIRECTIONAL):
-    """Return a tuple of all irreducible nexus of the network."""
+    """Return a tuple of all irreducible nexus of the network.
+
+    Transitions are evaluated in parallel if
+    :data:`config.PARALLEL_COMPLEX_EVALUATION` is enabled.
+    """
     validate.is_network(network)
 
-    sias = (sia(transition, direction) for transition in
-            transitions(network, before_state, after_state))
-    return tuple(sorted(filter(None, sias), reverse=True))
+    sias = (sia for _, sia in
+            _nexus(network, before_state, after_state, direction))
+    return tuple(sorted(sias, reverse=True))
 
 
 def causal_nexus(network, before_state, after_state,
                  direction=Direction.BIDIRECTIONAL):
-    """Return the causal nexus of the network."""
+    """Return the causal nexus of the network.
+
+    When transitions are evaluated sequentially, transitions which cannot be
+    maximal are skipped (see :class:`FindNexus`).
+    """
     validate.is_network(network)
 
     log.info("Calculating causal nexus...")
-    result = nexus(network, before_state, after_state, direction)
+    parallel = config.PARALLEL_COMPLEX_EVALUATION
+    result = _nexus(network, before_state, after_state, direction,
+                    prune=not parallel, parallel=parallel)
     if result:
-        result = max(result)
+        # The first maximal transition, as in ``max(nexus(...))``
+        result = max((sia.order_by(), -position, sia)
+                     for position, sia in result)[2]
     else:
         null_transition = Transition(
             network, before_state, after_state, (), ())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# binary.py
+
+"""
+Compact binary serialization of PyPhi objects.
+
+This is an alternative to :mod:`pyphi.jsonify` for large results. Objects are
+serialized using the same ``to_json`` and ``from_json`` methods, but
+
+- NumPy arrays (TPMs, connectivity matrices, repertoires) are stored as raw
+  little-endian buffers instead of nested lists of numbers. When loading, they
+  are read-only views of the loaded data rather than copies;
+- objects which occur more than once in the object graph (*e.g.* the subsystem
+  and network shared by every concept of a cause-effect structure) are stored
+  once and referenced elsewhere.
+
+Usage mirrors the ``json`` module::
+
+    >>> from pyphi import binary, examples
+    >>> subsystem = examples.basic_subsystem()
+    >>> binary.loads(binary.dumps(subsystem)) == subsystem
+    True
+
+The format consists of the magic bytes ``PYPHIBIN``, the length of the header
+as a little-endian unsigned 64-bit integer, the header, and the array data. The
+header is UTF-8 encoded JSON containing the PyPhi version, the object table,
+the shape, type, and offset of each array, and the root object. Arrays are
+aligned to ``ALIGNMENT`` bytes.
+"""
+
+import json
+import mmap
+import struct
+
+import numpy as np
+
+import pyphi
+
+from .jsonify import CLASS_KEY, _check_version, _loadable_models
+
+MAGIC = b'PYPHIBIN'
+ALIGNMENT = 64
+
+REF_KEY = '__ref__'
+ARRAY_KEY = '__array__'
+FIELDS_KEY = '__fields__'
+
+_HEADER_LENGTH = struct.Struct('<Q')
+
+
+def _pad(n):
+    """The number of bytes needed to align offset ``n``."""
+    return -n % ALIGNMENT
+
+
+def _object_key(obj):
+    """Objects with equal keys are only stored once.
+
+    As with :mod:`pyphi.jsonify`, objects of the same class and hash are
+    considered identical.
+    """
+    try:
+        return (type(obj).__name__, hash(obj))
+    except TypeError:
+        return (type(obj).__name__, id(obj))
+
+
+class _Encoder:
+    """Convert an object graph to a JSON-encodable tree, an object table, and
+    a list of arrays.
+    """
+
+    def __init__(self):
+        self.objects = []
+        self.object_index = {}
+        self.arrays = []
+        self.array_index = {}
+
+    def encode(self, obj):  # pylint: disable=too-many-return-statements
+        # PyPhi models are stored once in the object table
+        if hasattr(obj, 'to_json'):
+            return {REF_KEY: self.encode_model(obj)}
+
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.hasobject:
+                return self.encode(obj.tolist())
+            return {ARRAY_KEY: self.encode_array(obj)}
+
+        # NumPy datatypes
+        if isinstance(obj, np.generic):
+            return obj.item()
+
+        if isinstance(obj, dict):
+            return {key: self.encode(value) for key, value in obj.items()}
+
+        if hasattr(obj, '__dict__'):
+            return self.encode(obj.__dict__)
+
+        if isinstance(obj, (list, tuple)):
+            return [self.encode(item) for item in obj]
+
+        return obj
+
+    def encode_model(self, obj):
+        key = _object_key(obj)
+        if key not in self.object_index:
+            # Reserve the index before encoding the fields, which may add
+            # other objects to the table.
+            index = len(self.objects)
+            self.object_index[key] = index
+            self.objects.append(None)
+            self.objects[index] = {
+                CLASS_KEY: type(obj).__name__,
+                FIELDS_KEY: self.encode(obj.to_json())
+            }
+        return self.object_index[key]
+
+    def encode_array(self, array):
+        # Arrays are only deduplicated by identity: the encoder holds a
+        # reference to each array, so ids are not reused.
+        if id(array) not in self.array_index:
+            self.array_index[id(array)] = len(self.arrays)
+            self.arrays.append(array)
+        return self.array_index[id(array)]
+
+
+def _little_endian(array):
+    """Return a contiguous, little-endian version of ``array``."""
+    return np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+
+
+def dumps(obj):
+    """Serialize ``obj`` to bytes."""
+    encoder = _Encoder()
+    root = encoder.encode(obj)
+    arrays = [_little_endian(array) for array in encoder.arrays]
+
+    specs = []
+    offset = 0
+    for array in arrays:
+        offset += _pad(offset)
+        specs.append({'dtype': array.dtype.str, 'shape': array.shape,
+                      'offset': offset})
+        offset += array.nbytes
+
+    header = json.dumps({
+        'version': pyphi.__version__,
+        'objects': encoder.objects,
+        'arrays': specs,
+        'root': root
+    }, separators=(',', ':')).encode('utf-8')
+
+    # Align the start of the array data
+    start = len(MAGIC) + _HEADER_LENGTH.size + len(header)
+    header += b' ' * _pad(start)
+
+    chunks = [MAGIC, _HEADER_LENGTH.pack(len(header)), header]
+    position = 0
+    for array, spec in zip(arrays, specs):
+        chunks.append(b'\0' * (spec['offset'] - position))
+        chunks.append(array.tobytes())
+        position = spec['offset'] + array.nbytes
+
+    return b''.join(chunks)
+
+
+def dump(obj, fp):
+    """Serialize ``obj`` and write it to ``fp`` (a ``.write()``-supporting
+    binary file-like object).
+    """
+    fp.write(dumps(obj))
+
+
+class _Decoder:
+    """Rebuild an object graph from a header and the buffer containing its
+    arrays.
+    """
+
+    def __init__(self, header, buffer, start):
+        self.header = header
+        self.buffer = buffer
+        self.start = start
+        self.models = _loadable_models()
+        self.loaded = {}
+
+    def decode(self, obj):
+        if isinstance(obj, dict):
+            if REF_KEY in obj:
+                return self.load_model(obj[REF_KEY])
+            if ARRAY_KEY in obj:
+                return self.load_array(obj[ARRAY_KEY])
+            return {key: self.decode(value) for key, value in obj.items()}
+
+        # As with `jsonify`, lists are cast to tuples.
+        if isinstance(obj, list):
+            return tuple(self.decode(item) for item in obj)
+
+        return obj
+
+    def load_model(self, index):
+        if index not in self.loaded:
+            dct = self.header['objects'][index]
+            cls = self.models[dct[CLASS_KEY]]
+            fields = self.decode(dct[FIELDS_KEY])
+
+            if hasattr(cls, 'from_json'):
+                self.loaded[index] = cls.from_json(fields)
+            else:
+                self.loaded[index] = cls(**fields)
+
+        return self.loaded[index]
+
+    def load_array(self, index):
+        spec = self.header['arrays'][index]
+        dtype = np.dtype(spec['dtype'])
+        shape = tuple(spec['shape'])
+        count = int(np.prod(shape))
+        if not count:
+            return np.empty(shape, dtype=dtype)
+        return np.frombuffer(self.buffer, dtype=dtype, count=count,
+                             offset=self.start + spec['offset']).reshape(shape)
+
+
+def _load_buffer(buffer):
+    """Deserialize an object from a buffer."""
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError('Not a PyPhi binary file')
+
+    position = len(MAGIC)
+    length, = _HEADER_LENGTH.unpack_from(buffer, position)
+    position += _HEADER_LENGTH.size
+
+    header = json.loads(bytes(buffer[position:position + length])
+                        .decode('utf-8'))
+    _check_version(header['version'])
+
+    decoder = _Decoder(header, buffer, position + length)
+    return decoder.decode(header['root'])
+
+
+def loads(data):
+    """Deserialize an object from bytes.
+
+    Arrays in the result are read-only views of ``data``.
+    """
+    return _load_buffer(data)
+
+
+def load(fp, use_mmap=True):
+    """Deserialize an object from ``fp`` (a ``.read()``-supporting binary
+    file-like object).
+
+    Keyword Args:
+        use_mmap (bool): If ``True`` and ``fp`` is a file on disk, it is
+            memory-mapped instead of read, so array data is only read when the
+            arrays are accessed.
+    """
+    if use_mmap:
+        try:
+            fileno = fp.fileno()
+        except (AttributeError, OSError):
+            pass
+        else:
+            return _load_buffer(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+
+    return _load_buffer(fp.read())
@@ -15,10 +15,11 @@ import os
 import pickle
 from functools import namedtuple, update_wrapper, wraps
 
+import numpy as np
 import psutil
 import redis
 
-from . import config, constants
+from . import config, constants, instrumentation
 
 _CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "currsize"])
 
@@ -414,8 +415,92 @@ def MICECache(subsystem, parent_cache=None):
     return cls(subsystem, parent_cache=parent_cache)
 
 
+class CausalLinkCache(DictCache):
+    """A transition-local cache for |CausalLink| objects and the
+    irreducibility analyses of mechanisms over single purviews.
+
+    Like |MICECache|, the cache of a cut transition is initialized with the
+    entries of its uncut parent which are unaffected by the cut.
+
+    Args:
+        transition (Transition): The transition that this is a cache for.
+
+    Kwargs:
+        parent_cache (CausalLinkCache): The cache generated by the uncut
+            version of ``transition``. If None, the cache is initialized
+            empty.
+    """
+
+    def __init__(self, transition, parent_cache=None):
+        super().__init__()
+        self.transition = transition
+        self._connections = {}
+
+        if parent_cache is not None:
+            if not parent_cache.transition.cut.is_null:
+                raise ValueError('parent_cache must be from an uncut '
+                                 'transition')
+            self._build(parent_cache)
+
+    def _build(self, parent_cache):
+        """Build the initial cache from the parent.
+
+        Only include the entries which are unaffected by the cut of the
+        transition. An entry is affected if the cut severs any connection
+        between its mechanism and its purview, or, for a |CausalLink|, the
+        purviews it was chosen from: from the purview to the mechanism in the
+        |CAUSE| direction, and from the mechanism to the purview in the
+        |EFFECT| direction. The repertoires of a mechanism over a purview only
+        depend on these connections, and cutting connections never adds a
+        purview to the candidates of a link.
+        """
+        cut_matrix = self.transition.cut.cut_matrix(
+            self.transition.network.size)
+        # Bit ``j`` of ``severed[i]`` is set if the connection from node ``i``
+        # to node ``j`` is severed
+        severed = [sum(1 << int(j) for j in np.flatnonzero(row))
+                   for row in cut_matrix]
+
+        for key, value in parent_cache.cache.items():
+            _from, to = parent_cache.connections(key)
+            if not any(severed[i] & to for i in _from):
+                self.cache[key] = value
+
+    def connections(self, key):
+        """Return the connections which an entry depends on, as a tuple of
+        the nodes they come from and a bitmask of the nodes they go to.
+        """
+        if key not in self._connections:
+            prefix, direction, mechanism, purview, _ = key
+            if prefix is None:
+                candidates = self.transition.potential_purviews(
+                    direction, mechanism, purview)
+                purview = tuple(set().union(*candidates))
+            _from, to = direction.order(mechanism, purview)
+            self._connections[key] = (_from, sum(1 << i for i in to))
+        return self._connections[key]
+
+    def set(self, key, value):
+        """Set a value in the cache.
+
+        Only cache if the transition is uncut (caches are only inherited from
+        uncut transitions) and memory is not too full.
+        """
+        if self.transition.cut.is_null and not memory_full():
+            self.cache[key] = value
+
+    def key(self, direction, mechanism, purviews=False, allow_neg=False,
+            _prefix=None):
+        """Cache key. This is the call signature of
+        |Transition.find_causal_link()| and ``Transition.find_mip()``.
+        """
+        if purviews is not False:
+            purviews = tuple(purviews)
+        return (_prefix, direction, mechanism, purviews, allow_neg)
+
+
 class PurviewCache(DictCache):
-    """A network-level cache for possible purviews."""
+    """A network- or subsystem-level cache for possible purviews."""
 
     def set(self, key, value):
         """Only set if purview caching is enabled"""
@@ -436,10 +521,18 @@ def method(cache_name, key_prefix=None):
             to the method arguments.
     """
     def decorator(func):
-        if (func.__name__ in ['cause_repertoire', 'effect_repertoire'] and
+        if (func.__name__ in ['cause_repertoire', 'effect_repertoire',
+                              '_repertoire_marginals'] and
                 not config.CACHE_REPERTOIRES):
             return func
 
+        # Instrumentation counters, e.g. `cache.repertoire.hits`
+        name = cache_name.strip('_')
+        if name.endswith('_cache'):
+            name = name[:-len('_cache')]
+        hits = 'cache.{}.hits'.format(name)
+        misses = 'cache.{}.misses'.format(name)
+
         @wraps(func)
         def wrapper(obj, *args, **kwargs):
             cache = getattr(obj, cache_name)
@@ -450,8 +543,11 @@ def method(cache_name, key_prefix=None):
             # Get cached value, or compute
             value = cache.get(key)
             if value is None:  # miss
+                instrumentation.count(misses)
                 value = func(obj, *args, **kwargs)
                 cache.set(key, value)
+            else:
+                instrumentation.count(hits)
             return value
 
         return wrapper
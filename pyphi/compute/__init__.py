@@ -3,8 +3,8 @@
 # compute/__init__.py
 
 """
-See |compute.subsystem|, |compute.network|, |compute.distance|, and
-|compute.parallel| for documentation.
+See |compute.subsystem|, |compute.network|, |compute.distance|,
+|compute.parallel|, and |compute.scheduling| for documentation.
 
 Attributes:
     all_complexes: Alias for :func:`pyphi.compute.network.all_complexes`.
@@ -17,19 +17,25 @@ Attributes:
     condensed: Alias for :func:`pyphi.compute.network.condensed`.
     evaluate_cut: Alias for :func:`pyphi.compute.subsystem.evaluate_cut`.
     major_complex: Alias for :func:`pyphi.compute.network.major_complex`.
+    major_complexes: Alias for
+        :func:`pyphi.compute.network.major_complexes`.
     phi: Alias for :func:`pyphi.compute.subsystem.phi`.
     possible_complexes: Alias for
         :func:`pyphi.compute.network.possible_complexes`.
     sia: Alias for :func:`pyphi.compute.subsystem.sia`.
+    sias: Alias for :func:`pyphi.compute.subsystem.sias`.
+    state_subsystems: Alias for
+        :func:`pyphi.compute.network.state_subsystems`.
     subsystems: Alias for :func:`pyphi.compute.network.subsystems`.
 """
 
 # pylint: disable=unused-import
 
-from .subsystem import (sia, phi, evaluate_cut, ConceptStyleSystem,
+from .subsystem import (sia, sias, phi, evaluate_cut, ConceptStyleSystem,
                         sia_concept_style, concept_cuts,
                         SystemIrreducibilityAnalysisConceptStyle,
                         conceptual_info, ces)
 from .network import (all_complexes, complexes, condensed, major_complex,
-                      possible_complexes, subsystems)
+                      major_complexes, possible_complexes, state_subsystems,
+                      subsystems)
 from .distance import concept_distance, ces_distance
@@ -7,30 +7,91 @@ Functions for computing network-level properties.
 """
 
 import logging
+from itertools import islice
 
-from .. import config, exceptions, utils, validate
+from .. import cache, config, exceptions, utils, validate
 from ..models import _null_sia
 from ..subsystem import Subsystem
 from .parallel import MapReduce
-from .subsystem import sia
+from .scheduling import cost_model, schedule, schedule_key
+from .subsystem import _config_cache_key, sia, sias
 
 # Create a logger for this module.
 log = logging.getLogger(__name__)
 
 
-def _reachable_subsystems(network, indices, state):
-    """A generator over all subsystems in a valid state."""
+def _shared_subsystem(network, state, node_indices, caches):
+    """Return a subsystem which shares the caches of state-independent
+    structures with the other subsystems of the same nodes in ``caches``.
+
+    Potential purviews are shared by all subsystems of the same nodes. Single
+    node repertoires are shared by those in which the external nodes are in the
+    same state, since the TPM of the subsystem is conditioned on that state.
+    """
+    purview_cache, repertoire_caches = caches.setdefault(
+        node_indices, (cache.PurviewCache(), {}))
+    external_state = tuple(state[i] for i in range(network.size)
+                           if i not in node_indices)
+    repertoire_cache = repertoire_caches.setdefault(external_state,
+                                                    cache.DictCache())
+    return Subsystem(network, state, node_indices,
+                     single_node_repertoire_cache=repertoire_cache,
+                     purview_cache=purview_cache)
+
+
+def _reachable_subsystems(network, indices, state, caches=None):
+    """A generator over all subsystems in a valid state.
+
+    If ``caches`` is given, the subsystems share their state-independent
+    caches with other subsystems of the same nodes.
+    """
     validate.is_network(network)
 
     # Return subsystems largest to smallest to optimize parallel
     # resource usage.
     for subset in utils.powerset(indices, nonempty=True, reverse=True):
         try:
-            yield Subsystem(network, state, subset)
+            if caches is None:
+                yield Subsystem(network, state, subset)
+            else:
+                yield _shared_subsystem(network, state, subset, caches)
         except exceptions.StateUnreachableError:
             pass
 
 
+def state_subsystems(network, states, nodes=None):
+    """Return the subsystems of the same nodes of a network in each of many
+    states.
+
+    The subsystems share the structures which do not depend on their state:
+    the potential purviews of mechanisms, and the repertoires of single nodes
+    for states in which the nodes outside the subsystem are in the same state.
+    Cut subsystems share them too. Use |compute.sias()| to compute the |SIAs|
+    of all the subsystems at once.
+
+    Args:
+        network (Network): The |Network| of interest.
+        states (Iterable[tuple[int]]): The states of the network.
+
+    Keyword Args:
+        nodes (tuple[int] or tuple[str]): The nodes of the subsystems. Defaults
+            to the whole network.
+
+    Returns:
+        list[Subsystem]: The subsystem in each state.
+
+    Raises:
+        StateUnreachableError: If the subsystem cannot be in one of the
+            states.
+    """
+    validate.is_network(network)
+    node_indices = network.node_labels.coerce_to_indices(nodes)
+
+    caches = {}
+    return [_shared_subsystem(network, state, node_indices, caches)
+            for state in states]
+
+
 def subsystems(network, state):
     """Return a generator of all **possible** subsystems of a network.
 
@@ -78,11 +139,16 @@ class FindAllComplexes(MapReduce):
 
     description = 'Finding complexes'
 
-    def empty_result(self):
+    def empty_result(self, *args):
         return []
 
+    def checkpoint_key(self):
+        network, state = self.context
+        return ((hash(network), tuple(state)) + _config_cache_key() +
+                schedule_key())
+
     @staticmethod
-    def compute(subsystem):
+    def compute(subsystem, network, state):
         return sia(subsystem)
 
     def process_result(self, new_sia, sias):
@@ -105,7 +171,9 @@ def all_complexes(network, state):
         SystemIrreducibilityAnalysis: A |SIA| for each |Subsystem| of the
         |Network|.
     """
-    engine = FindAllComplexes(subsystems(network, state))
+    engine = FindAllComplexes(
+        schedule(subsystems(network, state), cost_model.predict),
+        network, state)
     return engine.run(config.PARALLEL_COMPLEX_EVALUATION)
 
 
@@ -129,7 +197,9 @@ def complexes(network, state):
         SystemIrreducibilityAnalysis: A |SIA| for each |Subsystem| of the
         |Network|, excluding those with |big_phi = 0|.
     """
-    engine = FindIrreducibleComplexes(possible_complexes(network, state))
+    engine = FindIrreducibleComplexes(
+        schedule(possible_complexes(network, state), cost_model.predict),
+        network, state)
     return engine.run(config.PARALLEL_COMPLEX_EVALUATION)
 
 
@@ -158,6 +228,62 @@ def major_complex(network, state):
     return result
 
 
+def major_complexes(network, states, chunk_size=16):
+    """Compute the major complex of the network in each of many states.
+
+    This is equivalent to calling |compute.major_complex()| for each state, but
+    the candidate complexes of the same nodes share the structures which do
+    not depend on their state (see |compute.state_subsystems()|), and the cuts
+    of all candidate complexes in a chunk of states are evaluated in one
+    computation. Cuts are evaluated in parallel if
+    :data:`config.PARALLEL_COMPLEX_EVALUATION` or
+    :data:`config.PARALLEL_CUT_EVALUATION` is enabled.
+
+    Args:
+        network (Network): The |Network| of interest.
+        states (Iterable[tuple[int]]): The states of the network.
+
+    Keyword Args:
+        chunk_size (int): The number of states whose candidate complexes are
+            evaluated together. Larger chunks keep more processes busy but use
+            more memory.
+
+    Yields:
+        SystemIrreducibilityAnalysis: The |SIA| of the major complex in each
+        state, in the order of ``states``.
+    """
+    validate.is_network(network)
+    parallel = (config.PARALLEL_COMPLEX_EVALUATION or
+                config.PARALLEL_CUT_EVALUATION)
+
+    caches = {}
+    states = iter(states)
+    while True:
+        chunk = [tuple(state) for state in islice(states, chunk_size)]
+        if not chunk:
+            return
+
+        # The candidate complexes of each state, in the order in which
+        # `complexes` evaluates them
+        candidates = [
+            list(schedule(_reachable_subsystems(
+                network, network.causally_significant_nodes, state, caches),
+                cost_model.predict))
+            for state in chunk]
+        results = iter(sias([subsystem for subsystems in candidates
+                             for subsystem in subsystems], parallel))
+
+        for state, subsystems in zip(chunk, candidates):
+            result = [new_sia for new_sia in islice(results, len(subsystems))
+                      if new_sia.phi > 0]
+            if result:
+                result = max(result)
+            else:
+                empty_subsystem = Subsystem(network, state, ())
+                result = _null_sia(empty_subsystem)
+            yield result
+
+
 def condensed(network, state):
     """Return a list of maximal non-overlapping complexes.
 
@@ -7,16 +7,23 @@
 Utilities for parallel computation.
 """
 
+import hashlib
 import logging
 import multiprocessing
+import os
+import pickle
+import queue
 import sys
 import threading
+import uuid
 from itertools import chain, islice
+from multiprocessing.managers import BaseManager, EventProxy
+from time import sleep, time
 
 from tblib import Traceback
 from tqdm import tqdm
 
-from .. import config
+from .. import config, constants, instrumentation
 
 log = logging.getLogger(__name__)
 
@@ -88,9 +95,19 @@ class MapReduce:
     The engine includes a builtin ``tqdm`` progress bar; this can be disabled
     by setting ``pyphi.config.PROGRESS_BARS`` to ``False``.
 
+    Long-running computations can be checkpointed by setting
+    ``pyphi.config.CHECKPOINT_DIRECTORY``. Subclasses which implement
+    ``checkpoint_key`` then periodically save the accumulated result and the
+    indices of all completed tasks; a later run of the same computation
+    resumes from the checkpoint, skipping the tasks that are already done.
+
     Parallel operations start a daemon thread which handles log messages sent
     from worker processes.
 
+    If ``pyphi.config.DISTRIBUTED_ADDRESS`` is set, parallel computations are
+    instead shipped to worker processes, possibly on other machines, which
+    connect to a task broker at that address; see ``distributed_worker``.
+
     Subprocesses spawned by ``MapReduce`` cannot spawn more subprocesses; be
     aware of this when composing nested computations. This is not an issue in
     practice because it is typically most efficient to only parallelize the top
@@ -100,6 +117,11 @@ class MapReduce:
     # Description for the tqdm progress bar
     description = ''
 
+    #: The number of tasks which are queued before any results are available.
+    #: Further tasks are taken from ``pending_tasks`` as results are returned,
+    #: so subclasses which skip tasks based on earlier results can queue fewer.
+    queue_size = Q_MAX_SIZE
+
     def __init__(self, iterable, *context):
         self.iterable = iterable
         self.context = context
@@ -116,6 +138,11 @@ class MapReduce:
         self.tasks = None
         self.complete = None
 
+        # Attributes used for checkpointing
+        self.checkpoint_path = None
+        self.completed = set()
+        self.last_checkpoint = None
+
     def empty_result(self, *context):
         """Return the default result with which to begin the computation."""
         raise NotImplementedError
@@ -137,6 +164,17 @@ class MapReduce:
         """
         raise NotImplementedError
 
+    def checkpoint_key(self):
+        """Return a key identifying this computation across program runs.
+
+        The key must be deterministic (*e.g.*, built from model hashes and
+        configuration values rather than object ids) and must identify the
+        exact sequence of tasks in ``self.iterable``, since completed tasks are
+        recorded by their position. If ``None`` (the default), the computation
+        is never checkpointed.
+        """
+        return None
+
     #: Is this process a subprocess in a parallel computation?
     _forked = False
 
@@ -157,6 +195,127 @@ class MapReduce:
         return tqdm(total=total, disable=disable, leave=False,
                     desc=self.description)
 
+    def get_checkpoint_path(self):
+        """Return the file in which the state of this computation is saved, or
+        ``None`` if checkpointing is disabled.
+        """
+        # Only the top-level computation is checkpointed; results computed by
+        # workers are checkpointed by the parent process.
+        if MapReduce._forked or config.CHECKPOINT_DIRECTORY is None:
+            return None
+
+        key = self.checkpoint_key()
+        if key is None:
+            return None
+
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        filename = '{}-{}.pkl'.format(type(self).__name__, digest)
+        return os.path.join(config.CHECKPOINT_DIRECTORY, filename)
+
+    def load_checkpoint(self):
+        """Return the checkpointed state of this computation, or ``None`` if
+        there is no checkpoint.
+
+        The state is a dictionary with the accumulated ``result``, the set of
+        ``completed`` task indices, and the ``done`` flag.
+        """
+        path = self.checkpoint_path
+        if path is None or not os.path.exists(path):
+            return None
+
+        log.info('Resuming %s from checkpoint %s', type(self).__name__, path)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def save_checkpoint(self, result):
+        """Save the accumulated result and the completed task indices."""
+        path = self.checkpoint_path
+        if path is None:
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        state = {
+            'result': result,
+            'completed': self.completed,
+            'done': self.done,
+        }
+        # Write to a temporary file first so that a crash while writing can't
+        # clobber an existing checkpoint.
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=constants.PICKLE_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        self.last_checkpoint = time()
+        log.debug('Saved checkpoint with %s completed tasks to %s',
+                  len(self.completed), path)
+
+    def maybe_save_checkpoint(self, result):
+        """Save a checkpoint if ``CHECKPOINT_INTERVAL`` seconds have elapsed
+        since the last one.
+        """
+        if (self.checkpoint_path is not None and
+                time() - self.last_checkpoint >= config.CHECKPOINT_INTERVAL):
+            self.save_checkpoint(result)
+
+    def remove_checkpoint(self):
+        """Delete the checkpoint of a finished computation."""
+        path = self.checkpoint_path
+        if path is not None and os.path.exists(path):
+            log.debug('Removing checkpoint %s', path)
+            os.remove(path)
+
+    def initial_result(self):
+        """Return the result with which to begin the computation.
+
+        This is ``empty_result``, unless the computation is being resumed from
+        a checkpoint.
+        """
+        self.checkpoint_path = self.get_checkpoint_path()
+        self.last_checkpoint = time()
+        self.completed = set()
+
+        checkpoint = self.load_checkpoint()
+        if checkpoint is None:
+            return self.empty_result(*self.context)
+
+        self.completed = checkpoint['completed']
+        self.done = checkpoint['done']
+        self.progress.update(len(self.completed))
+        return checkpoint['result']
+
+    def pending_tasks(self):
+        """Generator over ``(index, obj)`` pairs of all tasks which have not
+        been completed.
+        """
+        for index, obj in enumerate(self.iterable):
+            if index not in self.completed:
+                yield index, obj
+
+    def record_result(self, index, new_result, result):
+        """Reduce a new result and mark its task as completed."""
+        if isinstance(new_result, instrumentation.Recorded):
+            instrumentation.merge(new_result.report)
+            new_result = new_result.value
+
+        result = self.process_result(new_result, result)
+        self.completed.add(index)
+        self.progress.update(1)
+        self.maybe_save_checkpoint(result)
+        return result
+
+    def remote_compute(self):
+        """Return the function run by worker processes for each task.
+
+        If a report is being recorded, each task also returns the report of
+        the work done by the worker so that it can be merged into the report
+        of this process.
+        """
+        if instrumentation.recording():
+            return instrumentation.RecordedTask(self.compute)
+        return self.compute
+
     @staticmethod  # coverage: disable
     def worker(compute, task_queue, result_queue, log_queue, complete,
                *context):
@@ -167,13 +326,13 @@ class MapReduce:
 
             configure_worker_logging(log_queue)
 
-            for obj in iter(task_queue.get, POISON_PILL):
+            for index, obj in iter(task_queue.get, POISON_PILL):
                 if complete.is_set():
                     log.debug('Worker received signal - exiting early')
                     break
 
                 log.debug('Worker got %s', obj)
-                result_queue.put(compute(obj, *context))
+                result_queue.put((index, compute(obj, *context)))
                 log.debug('Worker finished %s', obj)
 
             result_queue.put(POISON_PILL)
@@ -196,7 +355,7 @@ class MapReduce:
         # the computation to terminate early.
         self.complete = multiprocessing.Event()
 
-        args = (self.compute, self.task_queue, self.result_queue,
+        args = (self.remote_compute(), self.task_queue, self.result_queue,
                 self.log_queue, self.complete) + self.context
         self.processes = [
             multiprocessing.Process(target=self.worker, args=args, daemon=True)
@@ -217,8 +376,9 @@ class MapReduce:
         full, so further tasks are enqueued as results are returned.
         """
         # Add a poison pill to shutdown each process.
-        self.tasks = chain(self.iterable, [POISON_PILL] * self.num_processes)
-        for task in islice(self.tasks, Q_MAX_SIZE):
+        self.tasks = chain(self.pending_tasks(),
+                           [POISON_PILL] * self.num_processes)
+        for task in islice(self.tasks, self.queue_size):
             log.debug('Putting %s on queue', task)
             self.task_queue.put(task)
 
@@ -237,9 +397,14 @@ class MapReduce:
         queue and passing them to ``process_result``.
         """
         try:
-            self.start_parallel()
+            result = self.initial_result()
+
+            # Resumed a computation which had already terminated early?
+            if self.done:
+                self.remove_checkpoint()
+                return result
 
-            result = self.empty_result(*self.context)
+            self.start_parallel()
 
             while self.num_processes > 0:
                 r = self.result_queue.get()
@@ -252,14 +417,15 @@ class MapReduce:
                     r.reraise()
 
                 else:
-                    result = self.process_result(r, result)
-                    self.progress.update(1)
+                    index, r = r
+                    result = self.record_result(index, r, result)
 
                     # Did `process_result` decide to terminate early?
                     if self.done:
                         self.complete.set()
 
             self.finish_parallel()
+            self.remove_checkpoint()
         except Exception:
             raise
         finally:
@@ -289,16 +455,17 @@ class MapReduce:
         objects in memory at a time.
         """
         try:
-            result = self.empty_result(*self.context)
-
-            for obj in self.iterable:
-                r = self.compute(obj, *self.context)
-                result = self.process_result(r, result)
-                self.progress.update(1)
+            result = self.initial_result()
 
+            for index, obj in self.pending_tasks():
                 # Short-circuited?
                 if self.done:
                     break
+
+                r = self.compute(obj, *self.context)
+                result = self.record_result(index, r, result)
+
+            self.remove_checkpoint()
         except Exception as e:
             raise e
         finally:
@@ -306,6 +473,85 @@ class MapReduce:
 
         return result
 
+    def start_distributed(self):
+        """Start the task broker and publish this computation to the workers
+        connected to it.
+        """
+        address = tuple(config.DISTRIBUTED_ADDRESS)
+        log.info('Starting task broker at %s', address)
+
+        authkey = config.DISTRIBUTED_AUTHKEY.encode()
+        self.broker = BrokerManager(address=address, authkey=authkey)
+        self.broker.start()
+
+        self.task_queue = self.broker.get_task_queue()
+        self.result_queue = self.broker.get_result_queue()
+        self.complete = self.broker.get_complete()
+
+        # Workers run with the same configuration as this process, except
+        # that nested computations are always sequential.
+        job = pickle.dumps((self.remote_compute(), self.context,
+                            config.snapshot()),
+                           protocol=constants.PICKLE_PROTOCOL)
+        self.broker.get_job().set(uuid.uuid4().hex, job)
+
+        self.tasks = self.pending_tasks()
+        self.num_pending = 0
+        for task in islice(self.tasks, self.queue_size):
+            self.task_queue.put(task)
+            self.num_pending += 1
+
+    def run_distributed(self):
+        """Perform the computation on remote workers, reading results from the
+        broker and passing them to ``process_result``.
+        """
+        self.broker = None
+
+        try:
+            result = self.initial_result()
+
+            # Resumed a computation which had already terminated early?
+            if self.done:
+                self.remove_checkpoint()
+                return result
+
+            self.start_distributed()
+
+            while self.num_pending > 0:
+                r = self.result_queue.get()
+                self.num_pending -= 1
+
+                if isinstance(r, ExceptionWrapper):
+                    r.reraise()
+
+                index, r = r
+                result = self.record_result(index, r, result)
+
+                # Did `process_result` decide to terminate early?
+                if self.done:
+                    break
+
+                task = next(self.tasks, None)
+                if task is not None:
+                    self.task_queue.put(task)
+                    self.num_pending += 1
+
+            self.remove_checkpoint()
+        finally:
+            self.finish_distributed()
+            log.debug('Removing progress bar')
+            self.progress.close()
+
+        return result
+
+    def finish_distributed(self):
+        """Signal the workers that this computation is over and stop the
+        broker.
+        """
+        if self.broker is not None:
+            self.complete.set()
+            self.broker.shutdown()
+
     def run(self, parallel=True):
         """Perform the computation.
 
@@ -313,11 +559,162 @@ class MapReduce:
             parallel (boolean): If True, run the computation in parallel.
                 Otherwise, operate sequentially.
         """
+        if parallel and config.DISTRIBUTED_ADDRESS is not None:
+            return self.run_distributed()
         if parallel:
             return self.run_parallel()
         return self.run_sequential()
 
 
+class Job:
+    """The computation currently published by a task broker.
+
+    Attributes:
+        id (str): A unique identifier for the computation, or ``None`` if no
+            computation has been published yet.
+        payload (bytes): The pickled ``compute`` function, context, and
+            configuration of the computation.
+    """
+
+    def __init__(self):
+        self.id = None
+        self.payload = None
+
+    def set(self, job_id, payload):
+        self.id = job_id
+        self.payload = payload
+
+    def get(self):
+        return self.id, self.payload
+
+
+class BrokerManager(BaseManager):
+    """Serves the task and result queues of a distributed ``MapReduce``
+    computation to remote workers.
+
+    The queues live in the manager's server process. Since each computation
+    starts a new server, they are created on first access.
+    """
+
+
+_broker_state = {}
+
+
+def _broker_object(name, factory):
+    # pylint: disable=missing-docstring
+    if name not in _broker_state:
+        _broker_state[name] = factory()
+    return _broker_state[name]
+
+
+def _get_task_queue():
+    # pylint: disable=missing-docstring
+    return _broker_object('tasks', queue.Queue)
+
+
+def _get_result_queue():
+    # pylint: disable=missing-docstring
+    return _broker_object('results', queue.Queue)
+
+
+def _get_complete():
+    # pylint: disable=missing-docstring
+    return _broker_object('complete', threading.Event)
+
+
+def _get_job():
+    # pylint: disable=missing-docstring
+    return _broker_object('job', Job)
+
+
+BrokerManager.register('get_task_queue', callable=_get_task_queue)
+BrokerManager.register('get_result_queue', callable=_get_result_queue)
+BrokerManager.register('get_complete', callable=_get_complete,
+                       proxytype=EventProxy)
+BrokerManager.register('get_job', callable=_get_job)
+
+
+def distributed_worker(address, authkey, poll_interval=1,
+                       max_jobs=None):  # coverage: disable
+    """Run a worker for distributed ``MapReduce`` computations.
+
+    The worker repeatedly connects to the task broker at ``address``, waits
+    for a new computation to be published, and processes its tasks until all
+    results are in or the computation terminates early. Workers can be started
+    on any machine that can reach the broker, e.g.::
+
+        python -m pyphi.compute.parallel HOST PORT AUTHKEY
+
+    Args:
+        address (tuple[str, int]): The address of the broker; this should be
+            the same as ``config.DISTRIBUTED_ADDRESS`` on the machine running
+            the computation.
+        authkey (str): The key used to authenticate with the broker; see
+            ``config.DISTRIBUTED_AUTHKEY``.
+
+    Keyword Args:
+        poll_interval (float): Seconds to wait between checks for a new
+            computation or a broker to connect to.
+        max_jobs (int): Exit after working on this many computations. If
+            ``None``, run forever.
+    """
+    MapReduce._forked = True
+    address = tuple(address)
+    if isinstance(authkey, str):
+        authkey = authkey.encode()
+
+    num_jobs = 0
+    last_job_id = None
+
+    while max_jobs is None or num_jobs < max_jobs:
+        try:
+            broker = BrokerManager(address=address, authkey=authkey)
+            broker.connect()
+
+            job_id, payload = broker.get_job().get()
+            if job_id is None or job_id == last_job_id:
+                sleep(poll_interval)
+                continue
+
+            log.debug('Worker starting job %s', job_id)
+            last_job_id = job_id
+            _work(broker, payload, poll_interval)
+            num_jobs += 1
+            log.debug('Worker finished job %s', job_id)
+
+        except (OSError, EOFError):
+            # No broker is running, or it was shut down while we were working.
+            sleep(poll_interval)
+
+
+def _work(broker, payload, poll_interval):  # coverage: disable
+    """Process the tasks of a single distributed computation."""
+    compute, context, snapshot = pickle.loads(payload)
+
+    task_queue = broker.get_task_queue()
+    result_queue = broker.get_result_queue()
+    complete = broker.get_complete()
+
+    snapshot.update(PARALLEL_CONCEPT_EVALUATION=False,
+                    PARALLEL_CUT_EVALUATION=False,
+                    PARALLEL_COMPLEX_EVALUATION=False,
+                    PARALLEL_MACRO_EVALUATION=False,
+                    PARALLEL_AC_CUT_EVALUATION=False,
+                    DISTRIBUTED_ADDRESS=None)
+
+    with config.override(**snapshot):
+        while not complete.is_set():
+            try:
+                index, obj = task_queue.get(timeout=poll_interval)
+            except queue.Empty:
+                continue
+
+            try:
+                result_queue.put((index, compute(obj, *context)))
+            except Exception as e:  # pylint: disable=broad-except
+                result_queue.put(ExceptionWrapper(e))
+
+
 # TODO: maintain a single log thread?
 class LogThread(threading.Thread):
     """Thread which handles log records sent from ``MapReduce`` processes.
@@ -358,3 +755,12 @@ def configure_worker_logging(queue):  # coverage: disable
             'handlers': ['queue']
         },
     })
+
+
+if __name__ == '__main__':
+    # Start a distributed worker with
+    #     python -m pyphi.compute.parallel HOST PORT KEY
+    # Import the worker from the package so that it shares state with the
+    # engines it runs, rather than with this `__main__` module.
+    from pyphi.compute.parallel import distributed_worker as _worker
+    _worker((sys.argv[1], int(sys.argv[2])), sys.argv[3])
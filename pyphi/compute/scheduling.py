@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# compute/scheduling.py
+
+"""
+Cost models used to schedule the tasks of parallel computations.
+
+The time needed to compute the |SIA| of a subsystem varies by orders of
+magnitude with its size and connectivity. When the tasks of a parallel
+computation are taken from a shared queue in enumeration order, an expensive
+task that happens to be enumerated last leaves all but one worker idle until
+it finishes. Scheduling the most expensive tasks first (longest-processing-time
+first) bounds this tail: it is the online version of the greedy LPT
+bin-packing of tasks onto workers.
+
+Cost-based scheduling is enabled with :data:`config.SCHEDULE_BY_COST`.
+"""
+
+import numpy as np
+
+from .. import config
+
+
+def subsystem_features(subsystem):
+    """Return the features used to predict the cost of computing the |SIA| of
+    a subsystem.
+
+    These are a constant term, the number of nodes, and the mean number of
+    connections per node within the subsystem (which bounds the number of
+    irreducible purviews of each mechanism).
+    """
+    n = len(subsystem)
+    if not n:
+        return np.array([1.0, 0.0, 0.0])
+
+    indices = subsystem.node_indices
+    cm = subsystem.cm[np.ix_(indices, indices)]
+    return np.array([1.0, n, cm.sum() / n])
+
+
+class CostModel:
+    """A log-linear model of the wall time of |compute.sia()|.
+
+    The logarithm of the time is predicted as a linear function of
+    ``subsystem_features``. The default coefficients were fit to the networks
+    in ``profiling/networks``; use ``calibrate`` to fit them to timings from
+    your own machine and networks.
+
+    Keyword Args:
+        coefficients (np.ndarray): The coefficients of the model.
+    """
+
+    #: Coefficients fit to the subsystems of the 5-node profiling networks.
+    DEFAULT_COEFFICIENTS = np.array([-10.3, 1.4, 1.6])
+
+    #: Timings below this many seconds are considered noise.
+    MIN_TIME = 1e-4
+
+    def __init__(self, coefficients=None):
+        if coefficients is None:
+            coefficients = self.DEFAULT_COEFFICIENTS
+        self.coefficients = np.array(coefficients, dtype=float)
+
+    def predict(self, subsystem):
+        """Return the predicted time, in seconds, to compute the |SIA| of a
+        subsystem.
+        """
+        return float(np.exp(subsystem_features(subsystem) @
+                            self.coefficients))
+
+    def calibrate(self, sias):
+        """Fit the model to the recorded timings of previously computed
+        |SIAs|.
+
+        Uses the ``time`` attribute with which |compute.sia()| annotates its
+        results.
+
+        Args:
+            sias (Iterable[SystemIrreducibilityAnalysis]): The results to fit
+                the model to.
+
+        Returns:
+            CostModel: This model.
+
+        Raises:
+            ValueError: If fewer results are given than the model has
+                coefficients.
+        """
+        sias = list(sias)
+        if len(sias) < len(self.coefficients):
+            raise ValueError(
+                'Need at least {} timed results to calibrate the cost '
+                'model.'.format(len(self.coefficients)))
+
+        features = np.array([subsystem_features(sia.subsystem)
+                             for sia in sias])
+        times = np.array([max(sia.time, self.MIN_TIME) for sia in sias])
+
+        self.coefficients = np.linalg.lstsq(features, np.log(times),
+                                            rcond=None)[0]
+        return self
+
+
+#: The cost model used to schedule subsystems.
+cost_model = CostModel()
+
+
+def cut_cost(subsystem, cut):
+    """Return the relative cost of evaluating a system cut.
+
+    This is the number of connections within the subsystem that the cut
+    severs: every concept whose mechanism or purview spans a severed connection
+    must be recomputed for the cut subsystem.
+    """
+    indices = subsystem.cut_indices
+    cut_matrix = cut.cut_matrix(subsystem.network.size)
+    return int(np.sum(cut_matrix[np.ix_(indices, indices)] *
+                      subsystem.cm[np.ix_(indices, indices)]))
+
+
+def schedule(tasks, cost):
+    """Return tasks in the order in which they should be computed.
+
+    If :data:`config.SCHEDULE_BY_COST` is enabled, tasks are sorted from most
+    to least expensive. Otherwise they are returned unchanged.
+
+    Args:
+        tasks (Iterable): The tasks to schedule.
+        cost (Callable): A function returning the (relative) cost of a task.
+
+    Returns:
+        Iterable: The scheduled tasks.
+    """
+    if not config.SCHEDULE_BY_COST:
+        return tasks
+    # `sorted` is stable, so equally expensive tasks keep their order.
+    return sorted(tasks, key=cost, reverse=True)
+
+
+def schedule_key():
+    """The configuration which determines the order of scheduled tasks.
+
+    Checkpoints record completed tasks by position, so this must be part of
+    the checkpoint key of any computation whose tasks are scheduled.
+    """
+    if not config.SCHEDULE_BY_COST:
+        return (False,)
+    return (True, tuple(cost_model.coefficients))
+
+
+def makespan(costs, num_workers):
+    """Return the time needed to process tasks in order on parallel workers.
+
+    Simulates workers which take the next task from a shared queue as soon as
+    they finish their current one, as ``MapReduce`` workers do.
+
+    Args:
+        costs (Iterable[float]): The cost of each task, in the order in which
+            the tasks are queued.
+        num_workers (int): The number of workers.
+
+    Returns:
+        float: The time at which the last task finishes.
+
+    Example:
+        >>> makespan([1, 1, 4], 2)
+        5
+        >>> makespan([4, 1, 1], 2)
+        4
+    """
+    workers = [0] * num_workers
+    for cost in costs:
+        # The next task goes to the first worker to become free.
+        i = workers.index(min(workers))
+        workers[i] += cost
+    return max(workers)
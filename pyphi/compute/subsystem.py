@@ -8,15 +8,18 @@ Functions for computing subsystem-level properties.
 
 import functools
 import logging
+from time import time
 
-from .. import Direction, config, connectivity, memory, utils
+from .. import (Direction, config, connectivity, instrumentation, memory,
+               utils)
 from ..models import (CauseEffectStructure, Concept, Cut, KCut,
                       SystemIrreducibilityAnalysis, _null_sia, cmp, fmt)
 from ..partition import (directed_bipartition, directed_bipartition_of_one,
                          mip_partitions)
 from ..utils import time_annotated
 from .distance import ces_distance
-from .parallel import MapReduce
+from .parallel import MapReduce, get_num_processes
+from .scheduling import cut_cost, schedule, schedule_key
 
 # Create a logger for this module.
 log = logging.getLogger(__name__)
@@ -35,6 +38,14 @@ class ComputeCauseEffectStructure(MapReduce):
     def empty_result(self, *args):
         return []
 
+    def checkpoint_key(self):
+        # Completed tasks are recorded by position, so the key must identify
+        # the mechanisms themselves. There are at most 2^n of them.
+        self.iterable = list(self.iterable)
+        subsystem, purviews, cause_purviews, effect_purviews = self.context
+        return (_sia_cache_key(subsystem), tuple(self.iterable), purviews,
+                cause_purviews, effect_purviews)
+
     @staticmethod
     def compute(mechanism, subsystem, purviews, cause_purviews,
                 effect_purviews):
@@ -61,6 +72,15 @@ class ComputeCauseEffectStructure(MapReduce):
             concepts.append(new_concept)
         return concepts
 
+    def initial_result(self):
+        """Ensure that concepts restored from a checkpoint reference this
+        subsystem, like all other concepts in the CES.
+        """
+        concepts = super().initial_result()
+        for concept in concepts:
+            concept.subsystem = self.subsystem
+        return concepts
+
 
 @time_annotated
 def ces(subsystem, mechanisms=False, purviews=False, cause_purviews=False,
@@ -110,6 +130,7 @@ def conceptual_info(subsystem):
     return round(ci, config.PRECISION)
 
 
+@instrumentation.timed('evaluate_cut')
 def evaluate_cut(uncut_subsystem, cut, unpartitioned_ces):
     """Compute the system irreducibility for a given cut.
 
@@ -162,6 +183,10 @@ class ComputeSystemIrreducibility(MapReduce):
         """
         return _null_sia(subsystem, phi=float('inf'))
 
+    def checkpoint_key(self):
+        subsystem, _ = self.context
+        return _sia_cache_key(subsystem) + schedule_key()
+
     @staticmethod
     def compute(cut, subsystem, unpartitioned_ces):
         """Evaluate a cut."""
@@ -211,6 +236,7 @@ def _ces(subsystem):
 
 @memory.cache(ignore=["subsystem"])
 @time_annotated
+@instrumentation.reported
 def _sia(cache_key, subsystem):
     """Return the minimal information partition of a subsystem.
 
@@ -226,8 +252,39 @@ def _sia(cache_key, subsystem):
 
     log.info('Calculating big-phi data for %s...', subsystem)
 
-    # Check for degenerate cases
-    # =========================================================================
+    if _is_degenerate(subsystem):
+        return _null_sia(subsystem)
+
+    log.debug('Finding unpartitioned CauseEffectStructure...')
+    unpartitioned_ces = _ces(subsystem)
+
+    if not unpartitioned_ces:
+        log.info('Empty unpartitioned CauseEffectStructure; returning null '
+                 'SIA immediately.')
+        # Short-circuit if there are no concepts in the unpartitioned CES.
+        return _null_sia(subsystem)
+
+    log.debug('Found unpartitioned CauseEffectStructure.')
+
+    cuts = schedule(_sia_cuts(subsystem),
+                    functools.partial(cut_cost, subsystem))
+
+    engine = ComputeSystemIrreducibility(
+        cuts, subsystem, unpartitioned_ces)
+    result = engine.run(config.PARALLEL_CUT_EVALUATION)
+    instrumentation.count('cuts.pruned', len(cuts) - len(engine.completed))
+
+    if config.CLEAR_SUBSYSTEM_CACHES_AFTER_COMPUTING_SIA:
+        log.debug('Clearing subsystem caches.')
+        subsystem.clear_caches()
+
+    log.info('Finished calculating big-phi data for %s.', subsystem)
+
+    return result
+
+
+def _is_degenerate(subsystem):
+    """Return whether |big_phi| is necessarily zero for the subsystem."""
     # Phi is necessarily zero if the subsystem is:
     #   - not strongly connected;
     #   - empty;
@@ -236,12 +293,12 @@ def _sia(cache_key, subsystem):
     if not subsystem:
         log.info('Subsystem %s is empty; returning null SIA '
                  'immediately.', subsystem)
-        return _null_sia(subsystem)
+        return True
 
     if not connectivity.is_strong(subsystem.cm, subsystem.node_indices):
         log.info('%s is not strongly connected; returning null SIA '
                  'immediately.', subsystem)
-        return _null_sia(subsystem)
+        return True
 
     # Handle elementary micro mechanism cases.
     # Single macro element systems have nontrivial bipartitions because their
@@ -251,57 +308,40 @@ def _sia(cache_key, subsystem):
         if not subsystem.cm[subsystem.node_indices][subsystem.node_indices]:
             log.info('Single micro nodes %s without selfloops cannot have '
                      'phi; returning null SIA immediately.', subsystem)
-            return _null_sia(subsystem)
+            return True
         # Even if the node has a self-loop, we may still define phi to be zero.
         elif not config.SINGLE_MICRO_NODES_WITH_SELFLOOPS_HAVE_PHI:
             log.info('Single micro nodes %s with selfloops cannot have '
                      'phi; returning null SIA immediately.', subsystem)
-            return _null_sia(subsystem)
-    # =========================================================================
-
-    log.debug('Finding unpartitioned CauseEffectStructure...')
-    unpartitioned_ces = _ces(subsystem)
+            return True
 
-    if not unpartitioned_ces:
-        log.info('Empty unpartitioned CauseEffectStructure; returning null '
-                 'SIA immediately.')
-        # Short-circuit if there are no concepts in the unpartitioned CES.
-        return _null_sia(subsystem)
+    return False
 
-    log.debug('Found unpartitioned CauseEffectStructure.')
 
+def _sia_cuts(subsystem):
+    """The cuts to evaluate to find the |big_phi| of a subsystem."""
     # TODO: move this into sia_bipartitions?
     # Only True if SINGLE_MICRO_NODES...=True, no?
     if len(subsystem.cut_indices) == 1:
-        cuts = [Cut(subsystem.cut_indices, subsystem.cut_indices,
+        return [Cut(subsystem.cut_indices, subsystem.cut_indices,
                     subsystem.cut_node_labels)]
-    else:
-        cuts = sia_bipartitions(subsystem.cut_indices,
-                                subsystem.cut_node_labels)
-
-    engine = ComputeSystemIrreducibility(
-        cuts, subsystem, unpartitioned_ces)
-    result = engine.run(config.PARALLEL_CUT_EVALUATION)
-
-    if config.CLEAR_SUBSYSTEM_CACHES_AFTER_COMPUTING_SIA:
-        log.debug('Clearing subsystem caches.')
-        subsystem.clear_caches()
-
-    log.info('Finished calculating big-phi data for %s.', subsystem)
-
-    return result
+    return sia_bipartitions(subsystem.cut_indices, subsystem.cut_node_labels)
 
 
-# TODO(maintainance): don't forget to add any new configuration options here if
-# they can change big-phi values
 def _sia_cache_key(subsystem):
     """The cache key of the subsystem.
 
     This includes the native hash of the subsystem and all configuration values
     which change the results of ``sia``.
     """
+    return (hash(subsystem),) + _config_cache_key()
+
+
+# TODO(maintainance): don't forget to add any new configuration options here if
+# they can change big-phi values
+def _config_cache_key():
+    """The configuration values which change the results of ``sia``."""
     return (
-        hash(subsystem),
         config.ASSUME_CUTS_CANNOT_CREATE_NEW_CONCEPTS,
         config.CUT_ONE_APPROXIMATION,
         config.MEASURE,
@@ -329,6 +369,163 @@ def phi(subsystem):
     return sia(subsystem).phi
 
 
+class ComputeSystemsIrreducibility(MapReduce):
+    """Computation engine for the system irreducibility of many subsystems.
+
+    Tasks are ``(position, cut)`` pairs, where ``position`` is the index of a
+    subsystem in the context, so that the cuts of all subsystems are evaluated
+    in one computation. The result is the list of the minimal |SIAs| of the
+    subsystems, annotated with the time spent on each subsystem. Once a cut
+    with |big_phi = 0| is found for a subsystem, its other cuts are skipped.
+    """
+    # pylint: disable=unused-argument,arguments-differ
+
+    description = 'Evaluating {} cuts'.format(fmt.BIG_PHI)
+
+    @property
+    def queue_size(self):
+        """Queue a few tasks per process, so that the cuts of subsystems which
+        are found to be reducible can still be skipped.
+        """
+        return 4 * get_num_processes()
+
+    def empty_result(self, subsystems, unpartitioned_ceses):
+        """Begin with a |SIA| with infinite |big_phi| for each subsystem."""
+        min_sias = [_null_sia(subsystem, phi=float('inf'))
+                    for subsystem in subsystems]
+        for min_sia, unpartitioned_ces in zip(min_sias, unpartitioned_ceses):
+            min_sia.time = unpartitioned_ces.time
+        return min_sias
+
+    def checkpoint_key(self):
+        subsystems, _ = self.context
+        return ((tuple(hash(subsystem) for subsystem in subsystems),) +
+                _config_cache_key() + schedule_key())
+
+    def initial_result(self):
+        """Record the subsystems which are already known to be reducible if the
+        computation is resumed from a checkpoint.
+        """
+        min_sias = super().initial_result()
+        self.reducible = {position for position, min_sia
+                          in enumerate(min_sias) if min_sia.phi == 0}
+        return min_sias
+
+    def pending_tasks(self):
+        """Skip the cuts of reducible subsystems."""
+        for index, (position, cut) in super().pending_tasks():
+            if position not in self.reducible:
+                yield index, (position, cut)
+
+    @staticmethod
+    def compute(task, subsystems, unpartitioned_ceses):
+        """Evaluate a cut of a subsystem."""
+        position, cut = task
+        start = time()
+        new_sia = evaluate_cut(subsystems[position], cut,
+                               unpartitioned_ceses[position])
+        new_sia.time = time() - start
+        return position, new_sia
+
+    def process_result(self, new_result, min_sias):
+        """Check if the new SIA has smaller |big_phi| than the standing result
+        for its subsystem.
+        """
+        position, new_sia = new_result
+        min_sia = min_sias[position]
+        # Cuts which were queued before the subsystem was found to be
+        # reducible
+        if position in self.reducible:
+            return min_sias
+
+        new_sia.time += min_sia.time
+        min_sia.time = new_sia.time
+
+        if new_sia.phi == 0:
+            self.reducible.add(position)
+            min_sias[position] = new_sia
+        elif new_sia < min_sia:
+            min_sias[position] = new_sia
+
+        return min_sias
+
+
+def sias(subsystems, parallel=None):
+    """Return the |SIA| of each of many subsystems.
+
+    This is equivalent to calling |compute.sia()| for each subsystem, but the
+    cuts of all the subsystems are evaluated in a single computation, so that
+    all processes are kept busy even if each subsystem has few cuts. To share
+    state-independent structures between subsystems of the same nodes in
+    different states, create them with |compute.state_subsystems()|.
+
+    Args:
+        subsystems (Iterable[Subsystem]): The subsystems.
+
+    Keyword Args:
+        parallel (bool): Whether to evaluate the cuts in parallel. Defaults to
+            :data:`config.PARALLEL_CUT_EVALUATION`.
+
+    Returns:
+        list[SystemIrreducibilityAnalysis]: The |SIA| of each subsystem, in
+        the order of ``subsystems``.
+    """
+    if config.SYSTEM_CUTS == 'CONCEPT_STYLE':
+        return [sia(subsystem) for subsystem in subsystems]
+
+    if parallel is None:
+        parallel = config.PARALLEL_CUT_EVALUATION
+
+    results = []
+    # The subsystems whose cuts must be evaluated, their unpartitioned CESs,
+    # and their positions in `results`
+    candidates, unpartitioned_ceses, positions = [], [], []
+    tasks = []
+    for subsystem in subsystems:
+        log.info('Calculating big-phi data for %s...', subsystem)
+
+        if _is_degenerate(subsystem):
+            results.append(_null_sia(subsystem))
+            results[-1].time = 0.0
+            continue
+
+        unpartitioned_ces = _ces(subsystem)
+
+        if not unpartitioned_ces:
+            log.info('Empty unpartitioned CauseEffectStructure; returning '
+                     'null SIA immediately.')
+            results.append(_null_sia(subsystem))
+            results[-1].time = unpartitioned_ces.time
+            continue
+
+        tasks.extend((len(candidates), cut) for cut in _sia_cuts(subsystem))
+        positions.append(len(results))
+        results.append(None)
+        candidates.append(subsystem)
+        unpartitioned_ceses.append(unpartitioned_ces)
+
+    # Sorting is stable, so the cuts of each subsystem are evaluated in the
+    # same order as by `sia`.
+    tasks = schedule(tasks, lambda task: cut_cost(candidates[task[0]],
+                                                  task[1]))
+
+    engine = ComputeSystemsIrreducibility(tasks, candidates,
+                                          unpartitioned_ceses)
+    min_sias = engine.run(parallel)
+    instrumentation.count('cuts.pruned', len(tasks) - len(engine.completed))
+
+    for position, min_sia in zip(positions, min_sias):
+        min_sia.time = round(min_sia.time, config.PRECISION)
+        results[position] = min_sia
+
+    if config.CLEAR_SUBSYSTEM_CACHES_AFTER_COMPUTING_SIA:
+        log.debug('Clearing subsystem caches.')
+        for subsystem in candidates:
+            subsystem.clear_caches()
+
+    return results
+
+
 class ConceptStyleSystem:
     """A functional replacement for ``Subsystem`` implementing concept-style
     system cuts.
@@ -352,6 +549,10 @@ class ConceptStyleSystem:
             return getattr(self.subsystem, name)
         raise AttributeError(name)
 
+    def __getstate__(self):
+        # Don't pass through to the basic subsystem's `__getstate__`.
+        return self.__dict__
+
     def __len__(self):
         return len(self.subsystem)
 
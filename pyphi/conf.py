@@ -75,12 +75,20 @@ long time!), resulting in data loss.
 - :attr:`~pyphi.conf.PyphiConfig.PARALLEL_CONCEPT_EVALUATION`
 - :attr:`~pyphi.conf.PyphiConfig.PARALLEL_CUT_EVALUATION`
 - :attr:`~pyphi.conf.PyphiConfig.PARALLEL_COMPLEX_EVALUATION`
+- :attr:`~pyphi.conf.PyphiConfig.PARALLEL_MACRO_EVALUATION`
+- :attr:`~pyphi.conf.PyphiConfig.PARALLEL_AC_CUT_EVALUATION`
 - :attr:`~pyphi.conf.PyphiConfig.NUMBER_OF_CORES`
 - :attr:`~pyphi.conf.PyphiConfig.MAXIMUM_CACHE_MEMORY_PERCENTAGE`
+- :attr:`~pyphi.conf.PyphiConfig.SCHEDULE_BY_COST`
+- :attr:`~pyphi.conf.PyphiConfig.CHECKPOINT_DIRECTORY`
+- :attr:`~pyphi.conf.PyphiConfig.CHECKPOINT_INTERVAL`
+- :attr:`~pyphi.conf.PyphiConfig.DISTRIBUTED_ADDRESS`
+- :attr:`~pyphi.conf.PyphiConfig.DISTRIBUTED_AUTHKEY`
 
   .. important::
     Only one of ``PARALLEL_CONCEPT_EVALUATION``, ``PARALLEL_CUT_EVALUATION``,
-    and ``PARALLEL_COMPLEX_EVALUATION`` can be set to ``True`` at a time.
+    ``PARALLEL_COMPLEX_EVALUATION``, ``PARALLEL_MACRO_EVALUATION``, and
+    ``PARALLEL_AC_CUT_EVALUATION`` can be set to ``True`` at a time.
 
     **For most networks,** ``PARALLEL_CUT_EVALUATION`` **is the most
     efficient.** This is because the algorithm is exponential time in the
@@ -105,6 +113,7 @@ PyPhi provides a number of ways to cache intermediate results.
 - :attr:`~pyphi.conf.PyphiConfig.MONGODB_CONFIG`
 - :attr:`~pyphi.conf.PyphiConfig.REDIS_CACHE`
 - :attr:`~pyphi.conf.PyphiConfig.REDIS_CONFIG`
+- :attr:`~pyphi.conf.PyphiConfig.PARTITION_LIST_DIRECTORY`
 
 
 Logging
@@ -120,6 +129,7 @@ See the `documentation on Python's logger
 - :attr:`~pyphi.conf.PyphiConfig.LOG_FILE_LEVEL`
 - :attr:`~pyphi.conf.PyphiConfig.LOG_FILE`
 - :attr:`~pyphi.conf.PyphiConfig.PROGRESS_BARS`
+- :attr:`~pyphi.conf.PyphiConfig.INSTRUMENTATION`
 - :attr:`~pyphi.conf.PyphiConfig.REPR_VERBOSITY`
 - :attr:`~pyphi.conf.PyphiConfig.PRINT_FRACTIONS`
 
@@ -408,7 +418,16 @@ class PyphiConfig(Config):
 
     PARALLEL_COMPLEX_EVALUATION = Option(False, doc="""
     Controls whether systems are evaluated in parallel when computing
-    complexes.""")
+    complexes, and whether transitions are evaluated in parallel when computing
+    the nexus of a network with :mod:`pyphi.actual`.""")
+
+    PARALLEL_MACRO_EVALUATION = Option(False, doc="""
+    Controls whether candidate macro systems are evaluated in parallel when
+    searching for emergence.""")
+
+    PARALLEL_AC_CUT_EVALUATION = Option(False, doc="""
+    Controls whether the cuts of a |Transition| are evaluated in parallel when
+    computing its |big_alpha| with :func:`pyphi.actual.sia`.""")
 
     NUMBER_OF_CORES = Option(-1, doc="""
     Controls the number of CPU cores used to evaluate unidirectional cuts.
@@ -421,6 +440,47 @@ class PyphiConfig(Config):
     of them; to avoid thrashing, this setting limits the percentage of a
     system's RAM that the caches can collectively use.""")
 
+    SCHEDULE_BY_COST = Option(False, doc="""
+    Controls whether the subsystems evaluated when finding complexes and the
+    cuts evaluated when computing |big_phi| are ordered from most to least
+    expensive, as predicted by the cost model in
+    :mod:`pyphi.compute.scheduling`, rather than in enumeration order. This
+    keeps parallel workers busy until the end of the computation instead of
+    leaving them idle while a single expensive task finishes last. When
+    several cuts are minimal, the order in which cuts are evaluated determines
+    which is reported as the MIP.""")
+
+    CHECKPOINT_DIRECTORY = Option(None, doc="""
+    If set to a directory, long-running parallel and sequential computations
+    (finding complexes, evaluating system cuts, and computing cause-effect
+    structures) periodically save their progress to a file in this directory.
+    If the computation is interrupted, e.g. because the machine running it
+    died, running it again with the same network, state, and configuration
+    resumes from the last checkpoint instead of starting over. Checkpoints are
+    deleted when the computation finishes. If ``None``, computations are not
+    checkpointed.""")
+
+    CHECKPOINT_INTERVAL = Option(600, doc="""
+    The minimum number of seconds between checkpoints of a computation. Only
+    has an effect if ``CHECKPOINT_DIRECTORY`` is set.""")
+
+    DISTRIBUTED_ADDRESS = Option(None, doc="""
+    If set to a ``(host, port)`` pair, parallel computations are not run on
+    local processes but are distributed to worker processes which connect to a
+    task broker at this address. The broker is started by the process running
+    the computation; workers can run on any machine which can reach it and are
+    started with::
+
+        python -m pyphi.compute.parallel HOST PORT AUTHKEY
+
+    Workers use the configuration of the process running the computation.""")
+
+    DISTRIBUTED_AUTHKEY = Option('pyphi', doc="""
+    The key used to authenticate workers with the task broker when
+    ``DISTRIBUTED_ADDRESS`` is set. **Change this** if the broker is reachable
+    from an untrusted network: the broker and workers exchange pickled
+    objects.""")
+
     CACHE_SIAS = Option(False, doc="""
     PyPhi is equipped with a transparent caching system for
     |SystemIrreducibilityAnalysis| objects which stores them as they are
@@ -431,14 +491,14 @@ class PyphiConfig(Config):
     reason it is disabled by default.""")
 
     CACHE_REPERTOIRES = Option(True, doc="""
-    PyPhi caches cause and effect repertoires. This greatly improves speed, but
-    can consume a significant amount of memory. If you are experiencing memory
-    issues, try disabling this.""")
+    PyPhi caches cause and effect repertoires and their marginals. This greatly
+    improves speed, but can consume a significant amount of memory. If you are
+    experiencing memory issues, try disabling this.""")
 
     CACHE_POTENTIAL_PURVIEWS = Option(True, doc="""
-    Controls whether the potential purviews of mechanisms of a network are
-    cached. Caching speeds up computations by not recomputing expensive
-    reducibility checks, but uses additional memory.""")
+    Controls whether the potential purviews of the mechanisms of networks and
+    subsystems are cached. Caching speeds up computations by not recomputing
+    expensive reducibility checks, but uses additional memory.""")
 
     CLEAR_SUBSYSTEM_CACHES_AFTER_COMPUTING_SIA = Option(False, doc="""
     Controls whether a |Subsystem|'s repertoire and MICE caches are cleared
@@ -483,6 +543,12 @@ class PyphiConfig(Config):
     Configure the Redis database backend. These are the defaults in the
     provided ``redis.conf`` file.""")
 
+    PARTITION_LIST_DIRECTORY = Option(None, doc="""
+    If set to a directory, the partitions of more than nine micro-elements
+    generated when searching for coarse-grainings are saved to a file in this
+    directory and read from it in later computations. If ``None``, they are
+    generated every time they are needed.""")
+
     LOG_FILE = Option('pyphi.log', on_change=configure_logging, doc="""
     Controls the name of the log file.""")
 
@@ -506,6 +572,14 @@ class PyphiConfig(Config):
         If you are iterating over many systems rather than doing one
         long-running calculation, consider disabling this for speed.""")
 
+    INSTRUMENTATION = Option(False, doc="""
+    Controls whether to count and time the stages of |big_phi| computations
+    (computing repertoires, finding MIPs, computing EMDs, evaluating cuts, and
+    looking up cached results). If enabled, each |SIA| has a ``report``
+    attribute with the counters and timers recorded while computing it. See
+    :mod:`pyphi.instrumentation` for details, and to record reports of other
+    computations.""")
+
     PRECISION = Option(6, doc="""
     If ``MEASURE`` is ``EMD``, then the Earth Mover's Distance is calculated
     with an external C++ library that a numerical optimizer to find a good
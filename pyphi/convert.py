@@ -144,6 +144,23 @@ def be_index2state(i, number_of_nodes):
     return le_index2state(i, number_of_nodes)[::-1]
 
 
+def le_states(number_of_nodes):
+    """Return all states of a system as the rows of an array, in little-endian
+    order.
+
+    This is the array version of :func:`pyphi.utils.all_states`.
+
+    Example:
+        >>> le_states(2)
+        array([[0, 0],
+               [1, 0],
+               [0, 1],
+               [1, 1]])
+    """
+    return ((np.arange(2**number_of_nodes)[:, np.newaxis] >>
+             np.arange(number_of_nodes)) & 1)
+
+
 def be2le_state_by_state(tpm):
     """Convert a state-by-state TPM from big-endian to little-endian or vice
     versa.
@@ -248,20 +265,13 @@ def state_by_state2state_by_node(tpm):
     S = tpm.shape[-1]
     # Get the number of nodes from the number of states.
     N = int(log2(S))
-    # Initialize the new state-by node TPM.
-    sbn_tpm = np.zeros(([2] * N + [N]))
-    # Map indices to state-tuples with the little-endian convention.
-    states = {i: le_index2state(i, N) for i in range(S)}
-    # Get an array for each node with 1 in positions that correspond to that
-    # node being on in the next state, and a 0 otherwise.
-    node_on = np.array([[states[i][n] for i in range(S)] for n in range(N)])
-    on_probabilities = [tpm * node_on[n] for n in range(N)]
-    for i, state in states.items():
-        # Get the probability of each node being on given the previous state i,
-        # i.e., a row of the state-by-node TPM.
-        # Assign that row to the ith state in the state-by-node TPM.
-        sbn_tpm[state] = [np.sum(on_probabilities[n][i]) for n in range(N)]
-    return sbn_tpm
+    # The probability that a node is on is the total probability of the next
+    # states in which it is on, so every row of the state-by-node TPM is the
+    # corresponding row of the state-by-state TPM times the matrix of the
+    # little-endian states.
+    sbn_tpm = np.dot(tpm, le_states(N))
+    # Rows are in little-endian order.
+    return to_multidimensional(sbn_tpm)
 
 
 # TODO support nondeterministic TPMs
@@ -311,37 +321,28 @@ def state_by_node2state_by_state(tpm):
            [0., 0., 0., 0., 0., 0., 0., 1.],
            [0., 0., 0., 0., 0., 1., 0., 0.]])
     """
-    # Cast to np.array.
-    tpm = np.array(tpm)
-    # Convert to multidimensional form.
-    tpm = to_multidimensional(tpm)
+    # Cast to np.array and convert to 2-dimensional form, with rows in
+    # little-endian order.
+    tpm = to_2dimensional(tpm)
     # Get the number of nodes from the last dimension of the TPM.
     N = tpm.shape[-1]
     # Get the number of states.
     S = 2**N
-    # Initialize the state-by-state TPM.
-    sbs_tpm = np.zeros((S, S))
     if not np.any(np.logical_and(tpm < 1, tpm > 0)):
-        # TPM is deterministic.
-        for previous_state_index in range(S):
-            # Use the little-endian convention to get the row and column
-            # indices.
-            previous_state = le_index2state(previous_state_index, N)
-            current_state_index = state2le_index(tpm[previous_state])
-            sbs_tpm[previous_state_index, current_state_index] = 1
-    else:
-        # TPM is nondeterministic.
-        for previous_state_index in range(S):
-            # Use the little-endian convention to get the row and column
-            # indices.
-            previous_state = le_index2state(previous_state_index, N)
-            marginal_tpm = tpm[previous_state]
-            for current_state_index in range(S):
-                current_state = np.array(
-                    [i for i in le_index2state(current_state_index, N)])
-                sbs_tpm[previous_state_index, current_state_index] = (
-                    np.prod(marginal_tpm[current_state == 1]) *
-                    np.prod(1 - marginal_tpm[current_state == 0]))
+        # TPM is deterministic: each row has a single 1, in the column of the
+        # little-endian index of the next state.
+        sbs_tpm = np.zeros((S, S))
+        next_states = np.dot(tpm.astype(np.int64), 1 << np.arange(N))
+        sbs_tpm[np.arange(S), next_states] = 1
+        return sbs_tpm
+    # TPM is nondeterministic. Build the probabilities of the states of the
+    # first ``n`` nodes one node at a time: since node ``n`` is the ``n``th
+    # bit of the little-endian index, the probabilities of the states in
+    # which it is off precede those in which it is on.
+    sbs_tpm = np.ones((S, 1))
+    for n in range(N):
+        on = tpm[:, n:n + 1]
+        sbs_tpm = np.concatenate([sbs_tpm * (1 - on), sbs_tpm * on], axis=1)
     return sbs_tpm
 
 
@@ -13,7 +13,8 @@ from pyemd import emd
 from scipy.spatial.distance import cdist
 from scipy.stats import entropy
 
-from . import Direction, config, constants, utils, validate
+from . import (Direction, config, constants, instrumentation, utils,
+               validate)
 from .distribution import flatten, marginal_zero
 from .registry import Registry
 
@@ -239,6 +240,7 @@ def klm(p, q):
     return max(abs(p * np.nan_to_num(np.log(p / q))))
 
 
+@instrumentation.timed('emd')
 def directional_emd(direction, d1, d2):
     """Compute the EMD between two repertoires for a given direction.
 
@@ -264,6 +266,7 @@ def directional_emd(direction, d1, d2):
         # TODO: test that ValueError is raised
         validate.direction(direction)
 
+    instrumentation.observe('emd', d1.size)
     return round(func(d1, d2), config.PRECISION)
 
 
@@ -286,6 +289,54 @@ def repertoire_distance(direction, r1, r2):
     return round(dist, config.PRECISION)
 
 
+# The EMD solver is only accurate to about 1e-5, so the bound is loosened to
+# stay below the distances it computes.
+_EMD_BOUND_TOLERANCE = 1e-4
+
+
+def _emd_marginal_bound(marginals1, marginals2):
+    # Hamming distances are sums over nodes, so any transport plan moves at
+    # least the difference of the marginals of each node.
+    return (np.absolute(marginals1 - marginals2).sum() -
+            _EMD_BOUND_TOLERANCE)
+
+
+def _l1_marginal_bound(marginals1, marginals2):
+    # Marginalizing does not increase the L1 distance.
+    return 2 * np.absolute(marginals1 - marginals2).max()
+
+
+_marginal_bounds = {
+    'EMD': _emd_marginal_bound,
+    'L1': _l1_marginal_bound,
+}
+
+
+def has_marginal_bound():
+    """Return whether |marginal_bound()| bounds the current |MEASURE|."""
+    return config.MEASURE in _marginal_bounds
+
+
+def marginal_bound(marginals1, marginals2):
+    """Return a lower bound on the |repertoire_distance()| between two
+    repertoires from the marginal distributions of their nodes.
+
+    The bound is ``0`` for measures without a known bound.
+
+    Args:
+        marginals1 (np.ndarray): The probability that each node of the first
+            repertoire is OFF.
+        marginals2 (np.ndarray): The probability that each node of the second
+            repertoire is OFF.
+
+    Returns:
+        float: A lower bound on the distance between the repertoires.
+    """
+    if not has_marginal_bound() or not len(marginals1):
+        return 0.0
+    return _marginal_bounds[config.MEASURE](marginals1, marginals2)
+
+
 def system_repertoire_distance(r1, r2):
     """Compute the distance between two repertoires of a system.
 
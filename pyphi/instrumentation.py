@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# instrumentation.py
+
+"""
+Counters and timers for the stages of a computation.
+
+Recording is disabled unless :data:`config.INSTRUMENTATION` is enabled or a
+:func:`record` block is active, in which case each instrumented stage costs a
+single global lookup. Use :func:`record` to measure an arbitrary block of
+code::
+
+    >>> from pyphi import compute, examples, instrumentation
+    >>> subsystem = examples.basic_subsystem()
+    >>> with instrumentation.record() as report:
+    ...     sia = compute.sia(subsystem)
+    >>> report.counts['evaluate_cut']
+    6
+
+or enable :data:`config.INSTRUMENTATION` to attach the report of each
+computation to the resulting |SIA| as its ``report`` attribute.
+
+The following stages are timed, and the number of times each is run is
+counted:
+
+- ``cause_repertoire`` and ``effect_repertoire``: computing a repertoire which
+  is not cached;
+- ``find_mip``: finding the MIP of a mechanism over a purview;
+- ``find_mice``: finding the MICE of a mechanism which is not cached;
+- ``emd``: computing the EMD between two repertoires;
+- ``evaluate_cut``: evaluating a system cut.
+
+Additionally,
+
+- ``find_mip.partitions`` counts the partitions evaluated by ``find_mip``;
+- ``cuts.pruned`` counts the system cuts which were not evaluated because the
+  |big_phi| of the system was found to be zero;
+- ``macro.duplicates`` and ``macro.pruned`` count the candidate macro systems
+  which were not evaluated because they were identical to another candidate or
+  could not be maximal;
+- ``actual.pruned`` counts the transitions whose cuts were not evaluated
+  because they could not be the causal nexus;
+- ``cache.<name>.hits`` and ``cache.<name>.misses`` count lookups in each
+  object-level cache, *e.g.* ``cache.repertoire.hits`` or
+  ``cache.mice.misses``;
+- ``sizes['emd']`` is the distribution of the number of states of the
+  repertoires passed to the EMD.
+
+Work done by the worker processes of a parallel computation is included in
+the report of the process which started the computation.
+"""
+
+import collections
+import functools
+from contextlib import contextmanager
+from time import perf_counter
+
+import decorator
+
+from . import config
+
+# The report of the innermost active `record` block.
+_active = None
+
+
+class Report:
+    """The counters and timers recorded during a computation.
+
+    Attributes:
+        counts (dict[str, int]): The number of times each stage ran or each
+            event occurred.
+        times (dict[str, float]): The total number of seconds spent in each
+            stage.
+        sizes (dict[str, collections.Counter]): The distribution of the sizes
+            of the inputs of each stage.
+    """
+
+    def __init__(self):
+        self.counts = collections.defaultdict(int)
+        self.times = collections.defaultdict(float)
+        self.sizes = collections.defaultdict(collections.Counter)
+
+    def update(self, other):
+        """Add the measurements of another report to this one."""
+        for name, n in other.counts.items():
+            self.counts[name] += n
+        for name, seconds in other.times.items():
+            self.times[name] += seconds
+        for name, sizes in other.sizes.items():
+            self.sizes[name].update(sizes)
+
+    def __bool__(self):
+        return bool(self.counts or self.sizes)
+
+    def __repr__(self):
+        return 'Report(counts={}, times={}, sizes={})'.format(
+            dict(self.counts), dict(self.times),
+            {name: dict(sizes) for name, sizes in self.sizes.items()})
+
+    def __str__(self):
+        width = max(map(len, self.counts), default=0)
+        lines = []
+        for name in sorted(self.counts):
+            line = '{:<{width}}  {:>10}'.format(name, self.counts[name],
+                                               width=width)
+            if name in self.times:
+                line += '  {:>10.4f}s'.format(self.times[name])
+            lines.append(line)
+        for name in sorted(self.sizes):
+            lines.append('{:<{width}}  sizes {}'.format(
+                name, dict(sorted(self.sizes[name].items())), width=width))
+        return '\n'.join(lines)
+
+    def to_json(self):
+        return {
+            'counts': dict(self.counts),
+            'times': dict(self.times),
+            'sizes': {name: dict(sizes) for name, sizes in self.sizes.items()}
+        }
+
+
+def recording():
+    """Return whether a report is being recorded."""
+    return _active is not None
+
+
+@contextmanager
+def record():
+    """Record a :class:`Report` of the instrumented stages run within this
+    block.
+
+    Blocks can be nested: the measurements of an inner block are also added
+    to the report of the enclosing block.
+
+    Yields:
+        Report: The report, which is complete when the block exits.
+    """
+    global _active  # pylint: disable=global-statement
+    outer, report = _active, Report()
+    _active = report
+    try:
+        yield report
+    finally:
+        _active = outer
+        if outer is not None:
+            outer.update(report)
+
+
+def count(name, n=1):
+    """Add ``n`` to the counter ``name``."""
+    if _active is not None:
+        _active.counts[name] += n
+
+
+def observe(name, size):
+    """Record an input of size ``size`` to the stage ``name``."""
+    if _active is not None:
+        _active.sizes[name][size] += 1
+
+
+def merge(report):
+    """Add a report recorded elsewhere, *e.g.* by a worker process, to the
+    active report.
+    """
+    if _active is not None:
+        _active.update(report)
+
+
+def timed(name):
+    """Decorator which counts and times the calls of a function as the stage
+    ``name``.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            report = _active
+            if report is None:
+                return func(*args, **kwargs)
+
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                report.counts[name] += 1
+                report.times[name] += perf_counter() - start
+
+        return wrapper
+    return decorate
+
+
+# Using ``decorator`` preserves the function signature of the wrapped function,
+# allowing joblib to properly introspect the function arguments.
+@decorator.decorator
+def reported(func, *args, **kwargs):
+    """Annotate the result of the decorated function with the :class:`Report`
+    of the call, if :data:`config.INSTRUMENTATION` is enabled or a report is
+    being recorded.
+
+    The result is annotated with a ``report`` attribute.
+    """
+    if not (config.INSTRUMENTATION or recording()):
+        return func(*args, **kwargs)
+
+    with record() as report:
+        result = func(*args, **kwargs)
+    result.report = report
+    return result
+
+
+Recorded = collections.namedtuple('Recorded', ['value', 'report'])
+
+
+class RecordedTask:
+    """Wraps the ``compute`` function of a ``MapReduce`` computation to return
+    the :class:`Report` of each task along with its result, so that work done
+    in other processes can be merged into the report of the main process.
+    """
+
+    def __init__(self, compute):
+        self.compute = compute
+
+    def __call__(self, *args):
+        with record() as report:
+            value = self.compute(*args)
+        return Recorded(value, report)
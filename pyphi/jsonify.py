@@ -34,9 +34,32 @@ The JSON encoder adds the name of the object and the current PyPhi version to
 the JSON stream. The JSON decoder uses this metadata to recursively deserialize
 the stream to a nested PyPhi object structure. The decoder will raise an
 exception if current PyPhi version doesn't match the version in the JSON data.
+
+``dump`` writes objects to a file incrementally, without building the
+JSON-encodable representation of the entire object in memory. To read only
+some fields of a large stored object, use ``lazy_load``::
+
+    >>> import io
+    >>> from pyphi import compute, examples
+    >>> f = io.StringIO()
+    >>> dump(compute.sia(examples.basic_subsystem()), f)
+    >>> _ = f.seek(0)
+    >>> sia = lazy_load(f)
+    >>> sia['phi']
+    2.3125
+    >>> sia['cut_subsystem']['cut'].load()
+    Cut [1, 2] ━━/ /━━➤ [0]
+    >>> len(sia['ces']['concepts'])
+    4
+
+Fields which are serialized PyPhi models are returned lazily; other fields
+are decoded when they are accessed.
 """
 
 import json
+import mmap
+import re
+from collections.abc import Mapping
 
 import numpy as np
 
@@ -166,11 +189,77 @@ def dumps(obj, **user_kwargs):
     return json.dumps(obj, **_encoder_kwargs(user_kwargs))
 
 
+def _iterencode(obj, encode):  # pylint: disable=too-many-return-statements
+    """Generator over chunks of the JSON encoding of ``obj``.
+
+    Equivalent to encoding ``jsonify(obj)``, but only holds the
+    representation of one object at a time in memory.
+
+    Args:
+        encode (Callable): Encodes native leaf values.
+    """
+    if hasattr(obj, 'to_json'):
+        d = obj.to_json()
+        _push_metadata(d, obj)
+        yield from _iterencode(d, encode)
+
+    elif isinstance(obj, np.ndarray):
+        yield encode(obj.tolist())
+
+    elif isinstance(obj, (np.int32, np.int64)):
+        yield encode(int(obj))
+    elif isinstance(obj, np.float64):
+        yield encode(float(obj))
+
+    elif isinstance(obj, dict) or hasattr(obj, '__dict__'):
+        if not isinstance(obj, dict):
+            obj = obj.__dict__
+        yield '{'
+        for i, (key, value) in enumerate(obj.items()):
+            if i:
+                yield ','
+            # Keys are converted to strings as by `json`
+            yield encode(key if isinstance(key, str) else encode(key)) + ':'
+            yield from _iterencode(value, encode)
+        yield '}'
+
+    elif isinstance(obj, (list, tuple)):
+        yield '['
+        for i, item in enumerate(obj):
+            if i:
+                yield ','
+            yield from _iterencode(item, encode)
+        yield ']'
+
+    else:
+        yield encode(obj)
+
+
+# The number of characters to buffer before writing to the file.
+_WRITE_BUFFER_SIZE = 2 ** 16
+
+
 def dump(obj, fp, **user_kwargs):
     """Serialize ``obj`` as a JSON-formatted stream and write to ``fp`` (a
     ``.write()``-supporting file-like object.
+
+    Unless formatting options are passed in ``user_kwargs``, the output is
+    written incrementally, so the representation of the entire object is
+    never held in memory.
     """
-    return json.dump(obj, fp, **_encoder_kwargs(user_kwargs))
+    if user_kwargs:
+        return json.dump(obj, fp, **_encoder_kwargs(user_kwargs))
+
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    chunks, size = [], 0
+    for chunk in _iterencode(obj, encode):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > _WRITE_BUFFER_SIZE:
+            fp.write(''.join(chunks))
+            chunks, size = [], 0
+    fp.write(''.join(chunks))
 
 
 def _check_version(version):
@@ -256,3 +345,153 @@ def loads(string):
 def load(fp):
     """Deserialize a JSON stream to a Python object."""
     return json.load(fp, cls=PyPhiJSONDecoder)
+
+
+# Regular expressions used to scan JSON without decoding it
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"')
+_STRUCTURE = re.compile(rb'[\[\]{}"]')
+_SCALAR = re.compile(rb'[^,\]}\s]+')
+
+
+def _skip_whitespace(buf, pos):
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _skip_value(buf, pos):
+    """Return the position of the end of the JSON value starting at ``pos``.
+    """
+    char = buf[pos:pos + 1]
+
+    if char == b'"':
+        return _STRING.match(buf, pos).end()
+
+    if char in (b'[', b'{'):
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(buf, pos)
+            if match is None:
+                raise ValueError('Unterminated JSON value')
+            token = match.group()
+            if token == b'"':
+                pos = _STRING.match(buf, match.start()).end()
+                continue
+            depth += 1 if token in (b'[', b'{') else -1
+            pos = match.end()
+            if depth == 0:
+                return pos
+
+    return _SCALAR.match(buf, pos).end()
+
+
+def _scan_object(buf, pos):
+    """Return the span of the value of each field of the JSON object starting
+    at ``pos``, without decoding the values.
+    """
+    pos = _skip_whitespace(buf, pos)
+    if buf[pos:pos + 1] != b'{':
+        raise ValueError('Expected a JSON object at position {}'.format(pos))
+
+    spans = {}
+    pos = _skip_whitespace(buf, pos + 1)
+    if buf[pos:pos + 1] == b'}':
+        return spans
+
+    while True:
+        end = _STRING.match(buf, pos).end()
+        key = json.loads(bytes(buf[pos:end]).decode('utf-8'))
+
+        pos = _skip_whitespace(buf, end)
+        if buf[pos:pos + 1] != b':':
+            raise ValueError('Expected ":" at position {}'.format(pos))
+        pos = _skip_whitespace(buf, pos + 1)
+
+        end = _skip_value(buf, pos)
+        spans[key] = (pos, end)
+
+        pos = _skip_whitespace(buf, end)
+        if buf[pos:pos + 1] == b'}':
+            return spans
+        pos = _skip_whitespace(buf, pos + 1)
+
+
+def _lists_to_tuples(obj):
+    """Cast lists to tuples, as ``PyPhiJSONDecoder`` does for all lists
+    except the top-level value.
+    """
+    if isinstance(obj, list):
+        return tuple(_lists_to_tuples(item) for item in obj)
+    return obj
+
+
+class LazyModel(Mapping):
+    """A serialized PyPhi model whose fields are decoded on access.
+
+    Fields which are themselves serialized models are returned as
+    ``LazyModel`` instances; other fields are fully decoded. Use ``load`` to
+    decode the entire model.
+    """
+
+    def __init__(self, buf, pos=0, spans=None):
+        self._buf = buf
+        self._pos = pos
+        self._spans = spans if spans is not None else _scan_object(buf, pos)
+
+        if CLASS_KEY not in self._spans:
+            raise ValueError('Not a serialized PyPhi model')
+        _check_version(self._decode(*self._spans[VERSION_KEY]))
+
+    def _decode(self, start, end):
+        return _lists_to_tuples(
+            loads(bytes(self._buf[start:end]).decode('utf-8')))
+
+    @property
+    def classname(self):
+        """str: The name of the class of the model."""
+        return self._decode(*self._spans[CLASS_KEY])
+
+    def __getitem__(self, key):
+        start, end = self._spans[key]
+
+        if self._buf[start:start + 1] == b'{':
+            spans = _scan_object(self._buf, start)
+            if CLASS_KEY in spans:
+                return LazyModel(self._buf, start, spans)
+
+        return self._decode(start, end)
+
+    def __iter__(self):
+        metadata = (CLASS_KEY, VERSION_KEY, ID_KEY)
+        return (key for key in self._spans if key not in metadata)
+
+    def __len__(self):
+        return len(self._spans) - 3
+
+    def __repr__(self):
+        return 'LazyModel({}, fields={})'.format(self.classname, list(self))
+
+    def load(self):
+        """Decode the entire model."""
+        return self._decode(self._pos, _skip_value(self._buf, self._pos))
+
+
+def lazy_loads(string):
+    """Return a ``LazyModel`` of the PyPhi model serialized in a JSON string.
+    """
+    if isinstance(string, str):
+        string = string.encode('utf-8')
+    return LazyModel(string)
+
+
+def lazy_load(fp):
+    """Return a ``LazyModel`` of the PyPhi model serialized in a JSON file.
+
+    Files on disk are memory-mapped, so only the parts of the file which are
+    needed to decode the requested fields are read.
+    """
+    try:
+        fileno = fp.fileno()
+    except (AttributeError, OSError):
+        return lazy_loads(fp.read())
+
+    return LazyModel(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
@@ -8,26 +8,32 @@ Methods for coarse-graining systems to different levels of spatial analysis.
 
 import itertools
 import logging
+import os
 from collections import namedtuple
 
 import numpy as np
 from scipy.stats import entropy
 
-from . import compute, config, constants, convert, distribution, utils, validate
+from . import (compute, config, connectivity, constants, convert,
+               instrumentation, timescale, utils, validate)
+from .cache import DictCache, cache
+from .compute.parallel import MapReduce
 from .exceptions import ConditionallyDependentError, StateUnreachableError
 from .labels import NodeLabels
+from .models import Cut
 from .network import irreducible_purviews
 from .node import expand_node_tpm, generate_nodes
+from .partition import (directed_bipartition, growth_string_partition,
+                        restricted_growth_strings)
 from .subsystem import Subsystem
 from .tpm import is_state_by_state, marginalize_out, tpm_indices
 
 # Create a logger for this module.
 log = logging.getLogger(__name__)
 
-# Load precomputed partition lists.
+# Partition lists of fewer elements than this are precomputed. They are
+# loaded when first used.
 _NUM_PRECOMPUTED_PARTITION_LISTS = 10
-_partition_lists = utils.load_data('partition_lists',
-                                   _NUM_PRECOMPUTED_PARTITION_LISTS)
 
 
 def reindex(indices):
@@ -78,14 +84,8 @@ def run_tpm(system, steps, blackbox):
         node_tpms.append(node_tpm)
 
     noised_tpm = rebuild_system_tpm(node_tpms)
-    noised_tpm = convert.state_by_node2state_by_state(noised_tpm)
 
-    tpm = convert.state_by_node2state_by_state(system.tpm)
-
-    # Muliply by noise
-    tpm = np.dot(tpm, np.linalg.matrix_power(noised_tpm, steps - 1))
-
-    return convert.state_by_state2state_by_node(tpm)
+    return timescale.run_tpm(system.tpm, steps, noise_tpm=noised_tpm)
 
 
 class SystemAttrs(namedtuple('SystemAttrs',
@@ -121,6 +121,48 @@ class SystemAttrs(namedtuple('SystemAttrs',
         system.state = self.state
 
 
+class _ByContent:
+    """Wraps an argument of a pipeline stage so that it is hashed and compared
+    by its content rather than its identity.
+    """
+
+    __slots__ = ('value', 'key')
+
+    def __init__(self, value):
+        self.value = value
+        self.key = self._content_key(value)
+
+    @classmethod
+    def _content_key(cls, value):
+        if isinstance(value, np.ndarray):
+            return (value.shape, value.dtype.str, value.tobytes())
+        if isinstance(value, SystemAttrs):
+            return tuple(cls._content_key(field) for field in value)
+        return value
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+def _run_stage(stage_cache, stage, *args):
+    """Apply a stage of the micro-to-macro pipeline, reusing its output from
+    ``stage_cache`` if it has already been applied to equal arguments.
+
+    Stages are pure functions of their arguments, so systems which differ only
+    in a cut share the outputs of every stage whose input the cut does not
+    change. The outputs are shared and must not be modified.
+    """
+    key = (stage,) + tuple(map(_ByContent, args))
+    output = stage_cache.get(key)
+    if output is None:
+        output = stage(*args)
+        stage_cache.set(key, output)
+    return output
+
+
 class MacroSubsystem(Subsystem):
     """A subclass of |Subsystem| implementing macro computations.
 
@@ -143,7 +185,8 @@ class MacroSubsystem(Subsystem):
     # abstract the logic into a discrete, disconnected transformation.
 
     def __init__(self, network, state, nodes=None, cut=None, mice_cache=None,
-                 time_scale=1, blackbox=None, coarse_grain=None):
+                 time_scale=1, blackbox=None, coarse_grain=None,
+                 stage_cache=None):
 
         # Ensure indices are not a `range`
         micro_node_indices = network.node_labels.coerce_to_indices(nodes)
@@ -161,35 +204,45 @@ class MacroSubsystem(Subsystem):
 
         system = SystemAttrs.pack(self)
 
+        # The outputs of each stage are cached by the content of its input,
+        # so the stages are only recomputed for cuts which change that input.
+        # The cache is shared by the cut versions of this system.
+        self._stage_cache = stage_cache or DictCache()
+
         # Shrink TPM to size of internal indices
         # ======================================
-        system = self._squeeze(system)
+        system = _run_stage(self._stage_cache, self._squeeze, system)
+        micro_cm = system.cm
 
         # Blackbox partial freeze
         # =======================
         if blackbox is not None:
             validate.blackbox(blackbox)
             blackbox = blackbox.reindex()
-            system = self._blackbox_partial_noise(blackbox, system)
+            system = _run_stage(self._stage_cache,
+                                self._blackbox_partial_noise, blackbox, system)
 
         # Blackbox over time
         # ==================
         if time_scale != 1:
             assert blackbox is not None
             validate.time_scale(time_scale)
-            system = self._blackbox_time(time_scale, blackbox, system)
+            system = _run_stage(self._stage_cache, self._blackbox_time,
+                                time_scale, blackbox, system)
 
         # Blackbox in space
         # =================
         if blackbox is not None:
-            system = self._blackbox_space(blackbox, system)
+            system = _run_stage(self._stage_cache, self._blackbox_space,
+                                blackbox, micro_cm, system)
 
         # Coarse-grain in space
         # =====================
         if coarse_grain is not None:
             validate.coarse_grain(coarse_grain)
             coarse_grain = coarse_grain.reindex()
-            system = self._coarsegrain_space(coarse_grain, self.is_cut, system)
+            system = _run_stage(self._stage_cache, self._coarsegrain_space,
+                                coarse_grain, self.is_cut, system)
 
         system.apply(self)
 
@@ -254,13 +307,14 @@ class MacroSubsystem(Subsystem):
 
         return SystemAttrs(tpm, cm, system.node_indices, system.state)
 
-    def _blackbox_space(self, blackbox, system):
+    @staticmethod
+    def _blackbox_space(blackbox, micro_cm, system):
         """Blackbox the TPM and CM in space.
 
-        Conditions the TPM on the current value of the hidden nodes. The CM is
-        set to universal connectivity.
-
-        .. TODO: change this ^
+        Conditions the TPM on the current value of the hidden nodes. A box is
+        connected to another if any of its outputs is connected to an element
+        of the other box in ``micro_cm``, the squeezed connectivity matrix of
+        the micro elements.
 
         This shrinks the size of the TPM by the number of hidden indices; now
         there is only `len(output_indices)` dimensions in the TPM and in the
@@ -274,10 +328,9 @@ class MacroSubsystem(Subsystem):
         n = len(blackbox)
         cm = np.zeros((n, n))
         for i, j in itertools.product(range(n), repeat=2):
-            # TODO: don't pull cm from self
-            outputs = self.blackbox.outputs_of(i)
-            to = self.blackbox.partition[j]
-            if self.cm[np.ix_(outputs, to)].sum() > 0:
+            outputs = blackbox.outputs_of(i)
+            to = blackbox.partition[j]
+            if micro_cm[np.ix_(outputs, to)].sum() > 0:
                 cm[i, j] = 1
 
         state = blackbox.macro_state(system.state)
@@ -349,7 +402,24 @@ class MacroSubsystem(Subsystem):
             cut=cut,
             time_scale=self.time_scale,
             blackbox=self.blackbox,
-            coarse_grain=self.coarse_grain)
+            coarse_grain=self.coarse_grain,
+            stage_cache=self._stage_cache)
+
+    def cache_info(self):
+        """Report repertoire and pipeline stage cache statistics."""
+        info = super().cache_info()
+        info['stage'] = self._stage_cache.info()
+        return info
+
+    def clear_caches(self):
+        """Clear the mice, repertoire, and pipeline stage caches."""
+        super().clear_caches()
+        self._stage_cache.clear()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['_stage_cache'] = DictCache()
+        return state
 
     def potential_purviews(self, direction, mechanism, purviews=False):
         """Override Subsystem implementation using Network-level indices."""
@@ -485,15 +555,16 @@ class CoarseGrain(namedtuple('CoarseGrain', ['partition', 'grouping'])):
         """
         assert len(micro_state) == len(self.micro_indices)
 
-        # TODO: only reindex if this coarse grain is not already from 0..n?
-        # make_mapping calls this in a tight loop so it might be more efficient
-        # to reindex conditionally.
-        reindexed = self.reindex()
-
         micro_state = np.array(micro_state)
-        return tuple(0 if sum(micro_state[list(reindexed.partition[i])])
+        return tuple(0 if sum(micro_state[list(part)])
                      in self.grouping[i][0] else 1
-                     for i in self.macro_indices)
+                     for i, part in enumerate(self._reindexed_partition()))
+
+    def _reindexed_partition(self):
+        """The partition of the squeezed micro indices ``0..n``."""
+        if self.micro_indices == tuple(range(len(self.micro_indices))):
+            return self.partition
+        return self.reindex().partition
 
     def make_mapping(self):
         """Return a mapping from micro-state to the macro-states based on the
@@ -504,14 +575,18 @@ class CoarseGrain(namedtuple('CoarseGrain', ['partition', 'grouping'])):
             |ith| entry in the mapping is the macro-state corresponding to the
             |ith| micro-state.
         """
-        micro_states = utils.all_states(len(self.micro_indices))
-
-        # Find the corresponding macro-state for each micro-state.
-        # The i-th entry in the mapping is the macro-state corresponding to the
-        # i-th micro-state.
-        mapping = [convert.state2le_index(self.macro_state(micro_state))
-                   for micro_state in micro_states]
-        return np.array(mapping)
+        # The i-th row is the i-th micro-state, in little-endian order.
+        micro_states = convert.le_states(len(self.micro_indices))
+
+        # A macro-element is on if the number of its micro-elements which are
+        # on is not in the 'off' group of its state grouping. The index of
+        # the macro-state is the little-endian number with those bits.
+        mapping = np.zeros(len(micro_states), dtype=int)
+        for i, part in enumerate(self._reindexed_partition()):
+            num_on = micro_states[:, list(part)].sum(axis=1)
+            macro_bit = ~np.isin(num_on, self.grouping[i][0])
+            mapping |= macro_bit.astype(int) << i
+        return mapping
 
     def macro_tpm_sbs(self, state_by_state_micro_tpm):
         """Create a state-by-state coarse-grained macro TPM.
@@ -527,20 +602,18 @@ class CoarseGrain(namedtuple('CoarseGrain', ['partition', 'grouping'])):
         mapping = self.make_mapping()
 
         num_macro_states = 2 ** len(self.macro_indices)
-        macro_tpm = np.zeros((num_macro_states, num_macro_states))
 
-        micro_states = range(2 ** len(self.micro_indices))
-        micro_state_transitions = itertools.product(micro_states, repeat=2)
-
-        # For every possible micro-state transition, get the corresponding
-        # previous and next macro-state using the mapping and add that
-        # probability to the state-by-state macro TPM.
-        for previous_state, current_state in micro_state_transitions:
-            macro_tpm[mapping[previous_state], mapping[current_state]] += (
-                state_by_state_micro_tpm[previous_state, current_state])
+        # Every micro-state transition contributes its probability to the
+        # transition between the corresponding macro-states. Summing them is
+        # the product with the one-hot matrix of the mapping on both sides.
+        one_hot = np.zeros((len(mapping), num_macro_states))
+        one_hot[np.arange(len(mapping)), mapping] = 1
+        macro_tpm = one_hot.T.dot(state_by_state_micro_tpm).dot(one_hot)
 
         # Re-normalize each row because we're going from larger to smaller TPM
-        return np.array([distribution.normalize(row) for row in macro_tpm])
+        row_sums = macro_tpm.sum(axis=1, keepdims=True)
+        return np.divide(macro_tpm, row_sums, out=macro_tpm,
+                         where=(row_sums != 0))
 
     def macro_tpm(self, micro_tpm, check_independence=True):
         """Create a coarse-grained macro TPM.
@@ -662,6 +735,74 @@ class Blackbox(namedtuple('Blackbox', ['partition', 'output_indices'])):
         return a in self.hidden_indices and not self.in_same_box(a, b)
 
 
+@cache(cache={}, maxmem=None)
+def _precomputed_partitions_list(N):
+    """Load the precomputed list of partitions of ``N`` elements."""
+    return utils.load_datum('partition_lists', N).tolist()
+
+
+def _growth_strings(N):
+    """Return the restricted growth strings of the partitions of ``N``
+    elements, other than the partition into a single part.
+
+    If :data:`config.PARTITION_LIST_DIRECTORY` is set, the strings are saved to
+    a file in that directory the first time they are generated and are read
+    from it, memory-mapped, afterwards.
+    """
+    strings = restricted_growth_strings(N)
+    next(strings)  # The single part
+
+    directory = config.PARTITION_LIST_DIRECTORY
+    if directory is None:
+        return strings
+
+    path = os.path.join(directory, '{}.npy'.format(N))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        array = np.array(list(strings), dtype=np.uint8).reshape(-1, N)
+        # Write to a temporary file first so an interrupted write can't leave
+        # a truncated list behind.
+        tmp_path = path + '.tmp.npy'
+        np.save(tmp_path, array)
+        os.replace(tmp_path, path)
+
+    return np.load(path, mmap_mode='r')
+
+
+def _partitions(N, max_blocks=None):
+    """Generate the partitions of ``N`` elements, other than the partition
+    into a single part.
+
+    Partitions of fewer than ``_NUM_PRECOMPUTED_PARTITION_LISTS`` elements are
+    read from the precomputed lists. Larger partitions are generated on the
+    fly, in the lexicographic order of their restricted growth strings.
+
+    Args:
+        N (int): The number of elements.
+
+    Keyword Args:
+        max_blocks (int): If given, only generate the partitions with at most
+            this many parts.
+
+    Yields:
+        list[list]: The next partition.
+    """
+    if N < _NUM_PRECOMPUTED_PARTITION_LISTS:
+        for partition in _precomputed_partitions_list(N):
+            if max_blocks is None or len(partition) <= max_blocks:
+                yield partition
+        return
+
+    if max_blocks is not None:
+        strings = restricted_growth_strings(N, max_blocks)
+        next(strings)  # The single part
+    else:
+        strings = _growth_strings(N)
+
+    for string in strings:
+        yield growth_string_partition(string)
+
+
 def _partitions_list(N):
     """Return a list of partitions of the |N| binary nodes.
 
@@ -676,12 +817,7 @@ def _partitions_list(N):
         >>> _partitions_list(3)
         [[[0, 1], [2]], [[0, 2], [1]], [[0], [1, 2]], [[0], [1], [2]]]
     """
-    if N < (_NUM_PRECOMPUTED_PARTITION_LISTS):
-        return list(_partition_lists[N])
-    else:
-        raise ValueError(
-            'Partition lists not yet available for system with {} '
-            'nodes or more'.format(_NUM_PRECOMPUTED_PARTITION_LISTS))
+    return list(_partitions(N))
 
 
 def all_partitions(indices):
@@ -695,13 +831,17 @@ def all_partitions(indices):
         is a tuple of micro-elements which correspond to macro-elements.
     """
     n = len(indices)
-    partitions = _partitions_list(n)
-    if n > 0:
-        partitions[-1] = [list(range(n))]
+    if n == 0:
+        return
+
+    # The partition into singletons, which is last, is replaced by the
+    # partition into a single part.
+    for partition in _partitions(n):
+        if len(partition) < n:
+            yield tuple(tuple(indices[i] for i in part)
+                        for part in partition)
 
-    for partition in partitions:
-        yield tuple(tuple(indices[i] for i in part)
-                    for part in partition)
+    yield (tuple(indices),)
 
 
 def all_groupings(partition):
@@ -722,13 +862,14 @@ def all_groupings(partition):
         raise ValueError('Each part of the partition must have at least one '
                          'element.')
 
-    micro_groupings = [_partitions_list(len(part) + 1) if len(part) > 1
-                       else [[[0], [1]]] for part in partition]
+    # Each macro-element has two states, so the numbers of micro-elements of a
+    # part which are on are grouped into two groups.
+    micro_groupings = [list(_partitions(len(part) + 1, max_blocks=2))
+                       for part in partition]
 
     for grouping in itertools.product(*micro_groupings):
-        if all(len(element) < 3 for element in grouping):
-            yield tuple(tuple(tuple(tuple(state) for state in states)
-                              for states in grouping))
+        yield tuple(tuple(tuple(tuple(state) for state in states)
+                          for states in grouping))
 
 
 def all_coarse_grains(indices):
@@ -824,35 +965,6 @@ class MacroNetwork:
         return round(self.phi - self.micro_phi, config.PRECISION)
 
 
-def coarse_graining(network, state, internal_indices):
-    """Find the maximal coarse-graining of a micro-system.
-
-    Args:
-        network (Network): The network in question.
-        state (tuple[int]): The state of the network.
-        internal_indices (tuple[int]): Nodes in the micro-system.
-
-    Returns:
-        tuple[int, CoarseGrain]: The phi-value of the maximal |CoarseGrain|.
-    """
-    max_phi = float('-inf')
-    max_coarse_grain = CoarseGrain((), ())
-
-    for coarse_grain in all_coarse_grains(internal_indices):
-        try:
-            subsystem = MacroSubsystem(network, state, internal_indices,
-                                       coarse_grain=coarse_grain)
-        except ConditionallyDependentError:
-            continue
-
-        phi = compute.phi(subsystem)
-        if (phi - max_phi) > constants.EPSILON:
-            max_phi = phi
-            max_coarse_grain = coarse_grain
-
-    return (max_phi, max_coarse_grain)
-
-
 # TODO: refactor this
 def all_macro_systems(network, state, do_blackbox=False, do_coarse_grain=False,
                       time_scales=None):
@@ -891,8 +1003,245 @@ def all_macro_systems(network, state, do_blackbox=False, do_coarse_grain=False,
                         continue
 
 
+def _macro_key(subsystem):
+    """Return a key identifying the dynamics of a system.
+
+    Systems with equal keys have equal TPMs, connectivity matrices, and states,
+    and the same number of (micro) elements which can be cut.
+    """
+    tpm = np.asarray(subsystem.tpm, dtype=float)
+    cm = np.asarray(subsystem.cm, dtype=float)
+    return (tpm.shape, tpm.tobytes(), cm.tobytes(), tuple(subsystem.state),
+            tuple(subsystem.node_indices), len(subsystem.cut_indices))
+
+
+def _cut_key(subsystem):
+    """Return a key identifying the dynamics of every cut version of a system.
+
+    Since the cuts of a |MacroSubsystem| are applied to its micro elements, two
+    macro systems with the same dynamics can have cut versions with different
+    dynamics. Two systems with equal ``_macro_key`` and ``_cut_key`` are
+    indistinguishable to ``compute.sia``.
+    """
+    cut_indices = subsystem.cut_indices
+    cuts = [Cut(cut_indices, cut_indices)] + [
+        Cut(from_nodes, to_nodes) for from_nodes, to_nodes
+        in directed_bipartition(cut_indices, nontrivial=True)]
+
+    keys = []
+    for cut in cuts:
+        cut_subsystem = subsystem.apply_cut(cut)
+        keys.append(_macro_key(cut_subsystem) +
+                    (tuple(cut_subsystem.cut_mechanisms),))
+    return tuple(keys)
+
+
+def zero_phi_bound(subsystem):
+    """An upper bound on the |big_phi| of a system which is zero if the system
+    is trivially reducible and infinite otherwise.
+
+    As in ``compute.sia``, a system is trivially reducible if it is empty or
+    not strongly connected. Concept-style system cuts are not bounded.
+    """
+    if config.SYSTEM_CUTS != '3.0_STYLE':
+        return float('inf')
+    if not subsystem or not connectivity.is_strong(subsystem.cm,
+                                                    subsystem.node_indices):
+        return 0.0
+    return float('inf')
+
+
+class ComputeMacroPhis(MapReduce):
+    """Computation engine for the |big_phi| of candidate macro systems.
+
+    Each candidate is identified by its position in the iterable of
+    candidates. Candidates which are indistinguishable from an earlier
+    candidate are not evaluated: ``duplicates`` maps their position to the
+    position of that candidate. Candidates whose ``upper_bound`` does not
+    exceed a |big_phi| value which has already been computed are skipped; these
+    are listed in ``pruned``.
+    """
+    # pylint: disable=unused-argument,arguments-differ
+
+    description = 'Evaluating macro systems'
+
+    def __init__(self, candidates, upper_bound=None):
+        self.upper_bound = upper_bound
+        self.duplicates = {}
+        self.pruned = []
+        # A lower bound on the maximal phi of the candidates.
+        self.max_phi = float('-inf')
+        super().__init__(self._deduplicate(candidates))
+
+    def _deduplicate(self, candidates):
+        """Yield ``(position, subsystem)`` pairs of the distinct candidates."""
+        # Candidates grouped by ``_macro_key``, as
+        # ``[position, subsystem, cut_key]`` lists. The cut key is only
+        # computed when the macro keys of two candidates collide.
+        seen = {}
+        for position, subsystem in enumerate(candidates):
+            # The cut key only covers IIT 3.0 system cuts
+            if config.SYSTEM_CUTS != '3.0_STYLE':
+                yield position, subsystem
+                continue
+
+            key = _macro_key(subsystem)
+            cut_key = None
+            for original in seen.get(key, []):
+                if original[2] is None:
+                    original[2] = _cut_key(original[1])
+                if cut_key is None:
+                    cut_key = _cut_key(subsystem)
+                if original[2] == cut_key:
+                    self.duplicates[position] = original[0]
+                    break
+            else:
+                seen.setdefault(key, []).append([position, subsystem, cut_key])
+                yield position, subsystem
+
+        instrumentation.count('macro.duplicates', len(self.duplicates))
+
+    def empty_result(self):
+        return {}
+
+    def pending_tasks(self):
+        for index, (position, subsystem) in super().pending_tasks():
+            if (self.upper_bound is not None and
+                    self.upper_bound(subsystem) - self.max_phi <=
+                    constants.EPSILON):
+                self.pruned.append(position)
+                instrumentation.count('macro.pruned')
+                self.progress.update(1)
+                continue
+
+            # Phi is nonnegative, so the maximum is at least zero once any
+            # candidate is evaluated.
+            self.max_phi = max(self.max_phi, 0.0)
+            yield index, (position, subsystem)
+
+    @staticmethod
+    def compute(candidate):
+        position, subsystem = candidate
+        return position, compute.phi(subsystem)
+
+    def process_result(self, new_result, phis):
+        position, phi = new_result
+        phis[position] = phi
+        self.max_phi = max(self.max_phi, phi)
+        return phis
+
+
+def macro_phis(candidates, upper_bound=None, parallel=None):
+    """Compute the |big_phi| of each of a collection of candidate systems.
+
+    Candidates with the same TPM, connectivity matrix, and state as an earlier
+    candidate, and whose cut versions also have the same TPMs, connectivity
+    matrices, and states, are only evaluated once. (This is only done for IIT
+    3.0 system cuts.)
+
+    Args:
+        candidates (Iterable[Subsystem]): The systems to evaluate, usually
+            instances of |MacroSubsystem|.
+
+    Keyword Args:
+        upper_bound (Callable): If given, a function returning an upper bound
+            on the |big_phi| of a candidate. Candidates whose bound does not
+            exceed the |big_phi| of a candidate which precedes them cannot be
+            maximal and are not evaluated. See :func:`zero_phi_bound`.
+        parallel (bool): Whether to evaluate the candidates in parallel.
+            Defaults to :data:`config.PARALLEL_MACRO_EVALUATION`.
+
+    Returns:
+        dict[int, float]: The |big_phi| of each candidate which was not
+        skipped, keyed by its position in ``candidates``.
+    """
+    if parallel is None:
+        parallel = config.PARALLEL_MACRO_EVALUATION
+
+    engine = ComputeMacroPhis(candidates, upper_bound)
+    phis = engine.run(parallel)
+
+    for position, original in engine.duplicates.items():
+        if original in phis:
+            phis[position] = phis[original]
+
+    return phis
+
+
+def _maximal(phis):
+    """Return the position of the first candidate with maximal |big_phi|, or
+    ``None`` if there are no candidates.
+
+    Candidates are compared in order, and only replace the maximum if they
+    exceed it by more than ``constants.EPSILON``.
+    """
+    max_phi = float('-inf')
+    max_position = None
+    for position in sorted(phis):
+        if (phis[position] - max_phi) > constants.EPSILON:
+            max_phi = phis[position]
+            max_position = position
+    return max_position
+
+
+MacroAttrs = namedtuple('MacroAttrs', ['system', 'time_scale', 'blackbox',
+                                       'coarse_grain', 'size'])
+
+
+def _recorded(subsystems, record):
+    """Yield ``subsystems`` and append the macro attributes of each to
+    ``record``.
+
+    This keeps track of the candidates of a search without keeping the
+    candidates themselves in memory.
+    """
+    for subsystem in subsystems:
+        record.append(MacroAttrs(
+            getattr(subsystem, 'micro_node_indices', subsystem.node_indices),
+            getattr(subsystem, 'time_scale', 1),
+            getattr(subsystem, 'blackbox', None),
+            getattr(subsystem, 'coarse_grain', None),
+            len(subsystem)))
+        yield subsystem
+
+
+def coarse_graining(network, state, internal_indices,
+                    upper_bound=zero_phi_bound):
+    """Find the maximal coarse-graining of a micro-system.
+
+    Args:
+        network (Network): The network in question.
+        state (tuple[int]): The state of the network.
+        internal_indices (tuple[int]): Nodes in the micro-system.
+
+    Keyword Args:
+        upper_bound (Callable): An upper bound on the |big_phi| of a
+            |MacroSubsystem|, used to skip coarse-grainings which cannot be
+            maximal. Defaults to :func:`zero_phi_bound`.
+
+    Returns:
+        tuple[int, CoarseGrain]: The phi-value of the maximal |CoarseGrain|.
+    """
+    def candidates():
+        for coarse_grain in all_coarse_grains(internal_indices):
+            try:
+                yield MacroSubsystem(network, state, internal_indices,
+                                     coarse_grain=coarse_grain)
+            except ConditionallyDependentError:
+                continue
+
+    coarse_grains = []
+    phis = macro_phis(_recorded(candidates(), coarse_grains),
+                      upper_bound=upper_bound)
+
+    position = _maximal(phis)
+    if position is None:
+        return (float('-inf'), CoarseGrain((), ()))
+    return (phis[position], coarse_grains[position].coarse_grain)
+
+
 def emergence(network, state, do_blackbox=False, do_coarse_grain=True,
-              time_scales=None):
+              time_scales=None, upper_bound=zero_phi_bound):
     """Check for the emergence of a micro-system into a macro-system.
 
     Checks all possible blackboxings and coarse-grainings of a system to find
@@ -902,6 +1251,10 @@ def emergence(network, state, do_blackbox=False, do_coarse_grain=True,
     use blackboxing, coarse-graining, or both. The default is to just
     coarse-grain the system.
 
+    Candidate macro systems are evaluated in parallel if
+    :data:`config.PARALLEL_MACRO_EVALUATION` is enabled. See
+    :func:`macro_phis`.
+
     Args:
         network (Network): The network of the micro-system under investigation.
         state (tuple[int]): The state of the network.
@@ -911,6 +1264,10 @@ def emergence(network, state, do_blackbox=False, do_coarse_grain=True,
             Defaults to ``True``.
         time_scales (list[int]): List of all time steps over which to check
             for emergence.
+        upper_bound (Callable): An upper bound on the |big_phi| of a
+            |MacroSubsystem|, used to skip candidates which cannot be maximal,
+            or ``None`` to evaluate every candidate. Defaults to
+            :func:`zero_phi_bound`.
 
     Returns:
         MacroNetwork: The maximal macro-system generated from the
@@ -918,49 +1275,48 @@ def emergence(network, state, do_blackbox=False, do_coarse_grain=True,
     """
     micro_phi = compute.major_complex(network, state).phi
 
-    max_phi = float('-inf')
-    max_network = None
-
-    for subsystem in all_macro_systems(network, state, do_blackbox=do_blackbox,
-                                       do_coarse_grain=do_coarse_grain,
-                                       time_scales=time_scales):
-        phi = compute.phi(subsystem)
+    candidates = []
+    phis = macro_phis(
+        _recorded(all_macro_systems(network, state, do_blackbox=do_blackbox,
+                                    do_coarse_grain=do_coarse_grain,
+                                    time_scales=time_scales), candidates),
+        upper_bound=upper_bound)
 
-        if (phi - max_phi) > constants.EPSILON:
-            max_phi = phi
-            max_network = MacroNetwork(
-                network=network,
-                macro_phi=phi,
-                micro_phi=micro_phi,
-                system=subsystem.micro_node_indices,
-                time_scale=subsystem.time_scale,
-                blackbox=subsystem.blackbox,
-                coarse_grain=subsystem.coarse_grain)
+    position = _maximal(phis)
+    if position is None:
+        return None
 
-    return max_network
+    candidate = candidates[position]
+    return MacroNetwork(
+        network=network,
+        macro_phi=phis[position],
+        micro_phi=micro_phi,
+        system=candidate.system,
+        time_scale=candidate.time_scale,
+        blackbox=candidate.blackbox,
+        coarse_grain=candidate.coarse_grain)
 
 
 # TODO refactor; return a proper model; remove?
 def phi_by_grain(network, state):
     # pylint: disable=missing-docstring
-    list_of_phi = []
-
-    systems = utils.powerset(network.node_indices, nonempty=True)
-    for system in systems:
-        micro_subsystem = Subsystem(network, state, system)
-        phi = compute.phi(micro_subsystem)
-        list_of_phi.append([len(micro_subsystem), phi, system, None])
-
-        for coarse_grain in all_coarse_grains(system):
-            try:
-                subsystem = MacroSubsystem(network, state, system,
-                                           coarse_grain=coarse_grain)
-            except ConditionallyDependentError:
-                continue
-
-            phi = compute.phi(subsystem)
-            list_of_phi.append([len(subsystem), phi, system, coarse_grain])
-    return list_of_phi
+    def candidates():
+        for system in utils.powerset(network.node_indices, nonempty=True):
+            yield Subsystem(network, state, system)
+
+            for coarse_grain in all_coarse_grains(system):
+                try:
+                    yield MacroSubsystem(network, state, system,
+                                         coarse_grain=coarse_grain)
+                except ConditionallyDependentError:
+                    continue
+
+    attrs = []
+    phis = macro_phis(_recorded(candidates(), attrs))
+
+    return [[candidate.size, phis[position], candidate.system,
+             candidate.coarse_grain]
+            for position, candidate in enumerate(attrs)]
 
 
 # TODO write tests
@@ -213,6 +213,31 @@ class KCut(_CutBase):
 
         return cm
 
+    def severed_key(self):
+        """A canonical key of the connections severed by this cut.
+
+        Two cuts have equal keys if and only if they have equal cut matrices,
+        but the key is cheaper to compute and compare. It is a sorted tuple of
+        ``(node, mask)`` pairs, where bit ``j`` of ``mask`` is set if the
+        connection from ``node`` to node ``j`` is severed.
+        """
+        indices = 0
+        for i in self.indices:
+            indices |= 1 << i
+
+        masks = {}
+        for part in self.partition:
+            from_, to = self.direction.order(part.mechanism, part.purview)
+            # All indices external to this part
+            external = indices
+            for i in to:
+                external &= ~(1 << i)
+            if external:
+                for i in from_:
+                    masks[i] = masks.get(i, 0) | external
+
+        return tuple(sorted(masks.items()))
+
     @cmp.sametype
     def __eq__(self, other):
         return (self.partition == other.partition and
@@ -281,6 +306,9 @@ class KPartition(collections.Sequence):
     def __getitem__(self, index):
         return self.parts[index]
 
+    def __iter__(self):
+        return iter(self.parts)
+
     def __eq__(self, other):
         if not isinstance(other, KPartition):
             return NotImplemented
@@ -36,7 +36,8 @@ class RepertoireIrreducibilityAnalysis(cmp.Orderable):
         def _repertoire(repertoire):
             if repertoire is None:
                 return None
-            return np.array(repertoire)
+            # Don't copy arrays, e.g. those loaded by `binary`
+            return np.asarray(repertoire)
 
         self._repertoire = _repertoire(repertoire)
         self._partitioned_repertoire = _repertoire(partitioned_repertoire)
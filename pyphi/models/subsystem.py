@@ -95,16 +95,20 @@ class SystemIrreducibilityAnalysis(cmp.Orderable):
         subsystem (Subsystem): The subsystem this analysis was calculated for.
         cut_subsystem (Subsystem): The subsystem with the minimal cut applied.
         time (float): The number of seconds it took to calculate.
+        report (instrumentation.Report): The counters and timers recorded
+            during the calculation, if :data:`config.INSTRUMENTATION` is
+            enabled.
     """
 
     def __init__(self, phi=None, ces=None, partitioned_ces=None,
-                 subsystem=None, cut_subsystem=None, time=None):
+                 subsystem=None, cut_subsystem=None, time=None, report=None):
         self.phi = phi
         self.ces = ces
         self.partitioned_ces = partitioned_ces
         self.subsystem = subsystem
         self.cut_subsystem = cut_subsystem
         self.time = time
+        self.report = report
 
     def __repr__(self):
         return fmt.make_repr(self, _sia_attributes)
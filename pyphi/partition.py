@@ -6,7 +6,9 @@
 Functions for generating partitions.
 """
 
-from itertools import chain, permutations, product
+from itertools import chain, islice, permutations, product
+
+import numpy as np
 
 from . import config
 from .cache import cache
@@ -43,6 +45,75 @@ def partitions(collection):
         yield [[first]] + smaller
 
 
+def restricted_growth_strings(n, max_blocks=None):
+    """Generate the restricted growth strings of length ``n`` in lexicographic
+    order.
+
+    A restricted growth string encodes a set partition of ``range(n)``:
+    element ``i`` is in the block numbered ``string[i]``, where blocks are
+    numbered in order of their smallest element. See
+    :func:`growth_string_partition`. Strings are generated one at a time, so
+    no list of partitions is held in memory.
+
+    Args:
+        n (int): The length of the strings.
+
+    Keyword Args:
+        max_blocks (int): If given, only generate the strings of partitions
+            with at most this many blocks.
+
+    Yields:
+        tuple[int]: The next restricted growth string.
+
+    Example:
+        >>> list(restricted_growth_strings(3))
+        [(0, 0, 0), (0, 0, 1), (0, 1, 0), (0, 1, 1), (0, 1, 2)]
+        >>> list(restricted_growth_strings(3, max_blocks=2))
+        [(0, 0, 0), (0, 0, 1), (0, 1, 0), (0, 1, 1)]
+    """
+    if n == 0:
+        return
+
+    if max_blocks is None:
+        max_blocks = n
+
+    string = [0] * n
+    # The largest block number in ``string[:i + 1]``
+    prefix_max = [0] * n
+
+    while True:
+        yield tuple(string)
+
+        # Increment the rightmost element which can be incremented: it can be
+        # put in the next block as long as that block already exists (or is
+        # the first new block) and the number of blocks stays in bounds.
+        for i in range(n - 1, 0, -1):
+            if (string[i] <= prefix_max[i - 1] and
+                    string[i] + 1 < max_blocks):
+                break
+        else:
+            return
+
+        string[i] += 1
+        prefix_max[i] = max(prefix_max[i - 1], string[i])
+        for j in range(i + 1, n):
+            string[j] = 0
+            prefix_max[j] = prefix_max[i]
+
+
+def growth_string_partition(string):
+    """Return the set partition encoded by a restricted growth string.
+
+    Example:
+        >>> growth_string_partition((0, 1, 0, 2))
+        [[0, 2], [1], [3]]
+    """
+    blocks = [[] for i in range(max(string) + 1)]
+    for element, block in enumerate(string):
+        blocks[block].append(element)
+    return blocks
+
+
 @cache(cache={}, maxmem=None)
 def bipartition_indices(N):
     """Return indices for undirected bipartitions of a sequence.
@@ -374,6 +445,82 @@ class PartitionRegistry(Registry):
 
 partition_types = PartitionRegistry()
 
+# The built-in partition schemes include the partition which cuts the whole
+# purview away from the mechanism, so the |small_phi| of a mechanism over a
+# purview is at most its cause or effect information.
+INFORMATION_BOUNDED_PARTITION_TYPES = ('BI', 'TRI', 'ALL')
+
+
+# The partitions of a mechanism over a purview depend only on their sizes, so
+# each partition scheme enumerates them once per pair of sizes as templates,
+# which are mapped onto the nodes when the partitions are generated. A template
+# is the number of parts of the partition followed by the part of each
+# mechanism node and of each purview node. The templates of a pair of sizes
+# are kept as a small array. If there are more than ``_MAX_TEMPLATES`` of them,
+# the partitions are instead enumerated lazily for each mechanism and purview.
+_MAX_TEMPLATES = 2 ** 16
+
+
+def _is_sorted(seq):
+    """Return whether a sequence is strictly increasing."""
+    return all(a < b for a, b in zip(seq, seq[1:]))
+
+
+def _encode_template(parts, mechanism_size, purview_size):
+    """Return the template of a partition of the indices of a mechanism and
+    purview.
+    """
+    template = [len(parts)] + [0] * (mechanism_size + purview_size)
+    for label, part in enumerate(parts):
+        for i in part.mechanism:
+            template[1 + i] = label
+        for i in part.purview:
+            template[1 + mechanism_size + i] = label
+    return template
+
+
+def _template_parts(template, mechanism, purview):
+    """Map a partition template onto the nodes of a mechanism and purview."""
+    mechanism_parts = [[] for _ in range(template[0])]
+    purview_parts = [[] for _ in range(template[0])]
+    labels = iter(template[1:])
+    for node, label in zip(mechanism, labels):
+        mechanism_parts[label].append(node)
+    for node, label in zip(purview, labels):
+        purview_parts[label].append(node)
+    return [Part(tuple(m), tuple(p))
+            for m, p in zip(mechanism_parts, purview_parts)]
+
+
+@cache(cache={})
+def _template_array(partition_type, mechanism_size, purview_size):
+    """Return the templates of a partition scheme for a mechanism and purview
+    of the given sizes as an array with a row per template, or ``None`` if
+    there are more than ``_MAX_TEMPLATES`` of them.
+    """
+    generate, _ = _template_partition_types[partition_type]
+    templates = list(islice(generate(tuple(range(mechanism_size)),
+                                     tuple(range(purview_size))),
+                            _MAX_TEMPLATES + 1))
+    if len(templates) > _MAX_TEMPLATES:
+        return None
+    templates = [_encode_template(parts, mechanism_size, purview_size)
+                 for parts in templates]
+    return np.array(templates, dtype=np.int8).reshape(
+        len(templates), 1 + mechanism_size + purview_size)
+
+
+def _partition_parts(partition_type, mechanism, purview):
+    """Return an iterator over the parts of the partitions of a mechanism over
+    a purview in a partition scheme.
+    """
+    array = _template_array(partition_type, len(mechanism), len(purview))
+    if array is None:
+        generate, _ = _template_partition_types[partition_type]
+        return generate(mechanism, purview)
+    return (_template_parts(template, mechanism, purview)
+            for template in array.tolist())
+
 
 def mip_partitions(mechanism, purview, node_labels=None):
     """Return a generator over all mechanism-purview partitions, based on the
@@ -383,6 +530,116 @@ def mip_partitions(mechanism, purview, node_labels=None):
     return func(mechanism, purview, node_labels)
 
 
+def ordered_mip_partitions(mechanism, purview, node_labels=None):
+    """Return the |mip_partitions()| of a mechanism over a purview, with the
+    partitions which sever the fewest mechanism-purview connections first.
+
+    These are the partitions most likely to be minimal. Partitions which sever
+    the same number of connections are kept in their original order. The
+    partitions of the built-in schemes are generated lazily; they are only
+    reordered if the templates of their sizes are kept, and are otherwise
+    generated in their original order. The partitions of custom schemes are
+    generated and sorted up front.
+
+    Calling ``restrict(end)`` on the returned iterator limits it to the
+    partitions before index ``end`` in the original order. The partitions
+    after it are then not generated.
+
+    Returns:
+        Iterator[tuple[int, KPartition]]: The index of each partition in the
+        order of |mip_partitions()|, and the partition.
+    """
+    partition_type = config.PARTITION_TYPE
+    if partition_type not in _template_partition_types:
+        def kept_connections(item):
+            return sum(len(part.mechanism) * len(part.purview)
+                       for part in item[1])
+
+        partitions = enumerate(mip_partitions(mechanism, purview, node_labels))
+        return _OrderedPartitions(
+            sorted(partitions, key=kept_connections, reverse=True),
+            lambda partition: partition)
+
+    generate, cls = _template_partition_types[partition_type]
+    # See `wedge_partitions`.
+    normalize = (cls is Tripartition and
+                 not (_is_sorted(mechanism) and _is_sorted(purview)))
+
+    def build(parts):
+        partition = cls(*parts, node_labels=node_labels)
+        return partition.normalize() if normalize else partition
+
+    templates = _template_array(partition_type, len(mechanism), len(purview))
+    if templates is None:
+        return _OrderedPartitions(enumerate(generate(mechanism, purview)),
+                                  build, increasing=True)
+
+    order = _template_order(partition_type, len(mechanism), len(purview))
+    return _OrderedPartitions(
+        ((index, templates[index]) for index in order.tolist()),
+        lambda template: build(_template_parts(template.tolist(), mechanism,
+                                               purview)))
+
+
+class _OrderedPartitions:
+    """An iterator over the index of each partition in the order of
+    |mip_partitions()| and the partition, which is built from its item with
+    ``build`` only if its index is before the end of the iterator.
+
+    Args:
+        items (Iterable[tuple[int, object]]): The index of each partition and
+            the item it is built from.
+        build (Callable): Builds a partition from its item.
+
+    Keyword Args:
+        increasing (bool): Whether the indices of the items are increasing, so
+            that the iterator stops at the first index past its end.
+    """
+
+    def __init__(self, items, build, increasing=False):
+        self._items = iter(items)
+        self._build = build
+        self._increasing = increasing
+        self._end = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        for index, item in self._items:
+            if self._end is None or index < self._end:
+                return index, self._build(item)
+            if self._increasing:
+                self._items = iter(())
+                break
+        raise StopIteration
+
+    def restrict(self, end):
+        """Only generate the partitions before index ``end`` in the order of
+        |mip_partitions()|.
+        """
+        self._end = end
+
+
+@cache(cache={})
+def _template_order(partition_type, mechanism_size, purview_size):
+    """Return the indices of the kept templates of a partition scheme, ordered
+    by the number of mechanism-purview connections they keep, most first.
+    """
+    templates = _template_array(partition_type, mechanism_size, purview_size)
+    mechanism_labels = templates[:, 1:1 + mechanism_size]
+    purview_labels = templates[:, 1 + mechanism_size:]
+    n_parts = int(templates[:, 0].max()) if len(templates) else 0
+
+    kept = np.zeros(len(templates), dtype=int)
+    for label in range(n_parts):
+        kept += ((mechanism_labels == label).sum(axis=1) *
+                 (purview_labels == label).sum(axis=1))
+
+    # Mergesort is stable, so ties keep their original order
+    return np.argsort(-kept, kind='mergesort')
+
+
 @partition_types.register('BI')
 def mip_bipartitions(mechanism, purview, node_labels=None):
     r"""Return an generator of all |small_phi| bipartitions of a mechanism over
@@ -430,13 +687,20 @@ def mip_bipartitions(mechanism, purview, node_labels=None):
         ─── ✕ ───
         2,3    ∅
     """
+    for parts in _partition_parts('BI', mechanism, purview):
+        yield Bipartition(*parts, node_labels=node_labels)
+
+
+def _mip_bipartition_parts(mechanism, purview):
+    """Generate the parts of the ``mip_bipartitions`` of a mechanism over a
+    purview.
+    """
     numerators = bipartition(mechanism)
     denominators = directed_bipartition(purview)
 
     for n, d in product(numerators, denominators):
         if (n[0] or d[0]) and (n[1] or d[1]):
-            yield Bipartition(Part(n[0], d[0]), Part(n[1], d[1]),
-                              node_labels=node_labels)
+            yield (Part(n[0], d[0]), Part(n[1], d[1]))
 
 
 @partition_types.register('TRI')
@@ -459,6 +723,18 @@ def wedge_partitions(mechanism, purview, node_labels=None):
     Yields:
         Tripartition: all unique tripartitions of this mechanism and purview.
     """
+    # Mapping the templates onto sorted nodes preserves their normal order.
+    normalize = not (_is_sorted(mechanism) and _is_sorted(purview))
+
+    for parts in _partition_parts('TRI', mechanism, purview):
+        tripart = Tripartition(*parts, node_labels=node_labels)
+        yield tripart.normalize() if normalize else tripart
+
+
+def _wedge_partition_parts(mechanism, purview):
+    """Generate the parts of the ``wedge_partitions`` of a mechanism over a
+    purview.
+    """
     numerators = bipartition(mechanism)
     denominators = directed_tripartition(purview)
 
@@ -476,35 +752,34 @@ def wedge_partitions(mechanism, purview, node_labels=None):
              not denominator[1])
         )
 
+    def nonempty(part):
+        """Check that the part is not empty."""
+        return part.mechanism or part.purview
+
+    def compressible(tripart):
+        """Check if the tripartition can be transformed into a causally
+        equivalent partition by combing two of its parts; e.g., A/∅ × B/∅ ×
+        ∅/CD is equivalent to AB/∅ × ∅/CD so we don't include it.
+        """
+        pairs = [
+            (tripart[0], tripart[1]),
+            (tripart[0], tripart[2]),
+            (tripart[1], tripart[2])
+        ]
+        for x, y in pairs:
+            if (nonempty(x) and nonempty(y) and
+                    (x.mechanism + y.mechanism == () or
+                     x.purview + y.purview == ())):
+                return True
+        return False
+
     for n, d in filter(valid, product(numerators, denominators)):
         # Normalize order of parts to remove duplicates.
-        tripart = Tripartition(
+        tripart = tuple(sorted([
             Part(n[0], d[0]),
             Part(n[1], d[1]),
-            Part((), d[2]),
-            node_labels=node_labels
-        ).normalize()  # pylint: disable=bad-whitespace
-
-        def nonempty(part):
-            """Check that the part is not empty."""
-            return part.mechanism or part.purview
-
-        def compressible(tripart):
-            """Check if the tripartition can be transformed into a causally
-            equivalent partition by combing two of its parts; e.g., A/∅ × B/∅ ×
-            ∅/CD is equivalent to AB/∅ × ∅/CD so we don't include it.
-            """
-            pairs = [
-                (tripart[0], tripart[1]),
-                (tripart[0], tripart[2]),
-                (tripart[1], tripart[2])
-            ]
-            for x, y in pairs:
-                if (nonempty(x) and nonempty(y) and
-                        (x.mechanism + y.mechanism == () or
-                         x.purview + y.purview == ())):
-                    return True
-            return False
+            Part((), d[2])
+        ]))
 
         if not compressible(tripart) and tripart not in yielded:
             yielded.add(tripart)
@@ -524,6 +799,14 @@ def all_partitions(mechanism, purview, node_labels=None):
     Yields:
         KPartition: A partition of this mechanism and purview into ``k`` parts.
     """
+    for parts in _partition_parts('ALL', mechanism, purview):
+        yield KPartition(*parts, node_labels=node_labels)
+
+
+def _all_partition_parts(mechanism, purview):
+    """Generate the parts of the ``all_partitions`` of a mechanism over a
+    purview.
+    """
     for mechanism_partition in partitions(mechanism):
         mechanism_partition.append([])
         n_mechanism_parts = len(mechanism_partition)
@@ -552,4 +835,12 @@ def all_partitions(mechanism, purview, node_labels=None):
                     if parts[0].mechanism == mechanism and parts[0].purview:
                         continue
 
-                    yield KPartition(*parts, node_labels=node_labels)
+                    yield parts
+
+
+# The template functions and partition classes of the built-in schemes.
+_template_partition_types = {
+    'BI': (_mip_bipartition_parts, Bipartition),
+    'TRI': (_wedge_partition_parts, Tripartition),
+    'ALL': (_all_partition_parts, KPartition),
+}
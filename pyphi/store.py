@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# store.py
+
+"""
+A columnar on-disk store for large numbers of results.
+
+Results are written as rows of NumPy structured arrays to append-only files in
+a directory: one row per |SIA| or |CauseEffectStructure| in ``systems.bin``,
+and one row per |Concept| in ``concepts.bin``. The layout of the rows is
+recorded in ``schema.json``. Sets of nodes (subsystems, mechanisms, purviews,
+and the parts of cuts) and states are stored as bitmasks, so networks can have
+at most 64 nodes.
+
+Reading a store memory-maps the files, so rows can be filtered with NumPy
+without loading or deserializing any models::
+
+    >>> import tempfile
+    >>> from pyphi import compute, examples, store
+    >>> path = tempfile.mkdtemp()
+    >>> with store.ResultsWriter(path) as writer:
+    ...     _ = writer.write(compute.sia(examples.basic_subsystem()))
+    >>> reader = store.ResultsReader(path)
+    >>> systems = reader.filter(lambda systems: systems['phi'] > 2)
+    >>> systems['phi'].tolist()
+    [2.3125]
+    >>> store.mask_indices(systems['nodes'][0])
+    (0, 1, 2)
+    >>> len(reader.concepts_of(systems))
+    4
+
+Additional columns, *e.g.* the parameters of a sweep, can be declared when a
+store is created and are then passed to ``ResultsWriter.write``.
+"""
+
+import json
+import os
+
+import numpy as np
+
+import pyphi
+
+from .models import CauseEffectStructure
+
+SCHEMA_FILE = 'schema.json'
+SYSTEMS_FILE = 'systems.bin'
+CONCEPTS_FILE = 'concepts.bin'
+
+#: The maximum number of nodes in a network whose results can be stored.
+MAX_NODES = 64
+
+SYSTEM_FIELDS = [
+    ('id', '<u8'),
+    ('network', '<u8'),
+    ('network_size', '<u2'),
+    ('state', '<u8'),
+    ('nodes', '<u8'),
+    ('phi', '<f8'),
+    ('cut_from', '<u8'),
+    ('cut_to', '<u8'),
+    ('num_concepts', '<u4'),
+    ('time', '<f8'),
+]
+
+CONCEPT_FIELDS = [
+    ('system', '<u8'),
+    ('mechanism', '<u8'),
+    ('cause_purview', '<u8'),
+    ('effect_purview', '<u8'),
+    ('phi', '<f8'),
+    ('cause_phi', '<f8'),
+    ('effect_phi', '<f8'),
+]
+
+
+def node_mask(indices):
+    """Return the bitmask of a set of node indices."""
+    mask = 0
+    for i in indices:
+        if not 0 <= i < MAX_NODES:
+            raise ValueError('Node indices must be less than {}, got '
+                             '{}'.format(MAX_NODES, i))
+        mask |= 1 << int(i)
+    return mask
+
+
+def mask_indices(mask):
+    """Return the node indices in a bitmask."""
+    mask = int(mask)
+    return tuple(i for i in range(mask.bit_length()) if mask >> i & 1)
+
+
+def state_mask(state):
+    """Return the bitmask of the nodes which are on in a state."""
+    return node_mask(i for i, s in enumerate(state) if s)
+
+
+def _load_schema(path):
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        schema = json.load(f)
+    return (np.dtype([tuple(field) for field in schema['systems']]),
+            np.dtype([tuple(field) for field in schema['concepts']]))
+
+
+class ResultsWriter:
+    """Appends results to a store.
+
+    Rows are buffered in memory and written to disk every ``buffer_size``
+    rows, when ``flush`` is called, and when the writer is closed. Use the
+    writer as a context manager to make sure it is closed.
+
+    Args:
+        path (str): The directory of the store. It is created if it does not
+            exist; if it does, results are appended to it.
+
+    Keyword Args:
+        extra_fields (list[tuple[str, str]]): Additional columns of the
+            systems table, as ``(name, dtype)`` pairs, *e.g.*
+            ``[('coupling', 'f8')]``. Must match the columns of an existing
+            store.
+        buffer_size (int): The number of rows to buffer before writing.
+
+    Raises:
+        ValueError: If ``extra_fields`` does not match the existing store.
+    """
+
+    def __init__(self, path, extra_fields=(), buffer_size=10000):
+        self.path = path
+        self.buffer_size = buffer_size
+
+        system_dtype = np.dtype(SYSTEM_FIELDS + [
+            (name, np.dtype(dtype).newbyteorder('<').str)
+            for name, dtype in extra_fields])
+        concept_dtype = np.dtype(CONCEPT_FIELDS)
+
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, SCHEMA_FILE)):
+            if _load_schema(path) != (system_dtype, concept_dtype):
+                raise ValueError(
+                    'Fields {} do not match the store at {}'.format(
+                        extra_fields, path))
+        else:
+            with open(os.path.join(path, SCHEMA_FILE), 'w') as f:
+                json.dump({'version': pyphi.__version__,
+                           'systems': system_dtype.descr,
+                           'concepts': concept_dtype.descr}, f)
+
+        self.system_dtype = system_dtype
+        self.concept_dtype = concept_dtype
+        self.extra_fields = system_dtype.names[len(SYSTEM_FIELDS):]
+
+        # Continue numbering the systems of an existing store
+        size = os.path.getsize(os.path.join(path, SYSTEMS_FILE)) \
+            if os.path.exists(os.path.join(path, SYSTEMS_FILE)) else 0
+        self.next_id = size // system_dtype.itemsize
+
+        self._systems = []
+        self._concepts = []
+
+    def write(self, result, **extra):
+        """Append a result.
+
+        Args:
+            result (SystemIrreducibilityAnalysis or CauseEffectStructure): The
+                result. The |big_phi| of a |CauseEffectStructure| is stored as
+                ``NaN``.
+            **extra: The values of the extra fields of the store.
+
+        Returns:
+            int: The id of the result's row in the systems table.
+
+        Raises:
+            ValueError: If the extra fields given do not match those of the
+                store.
+        """
+        if set(extra) != set(self.extra_fields):
+            raise ValueError('Expected values for the fields {}'.format(
+                self.extra_fields))
+
+        if isinstance(result, CauseEffectStructure):
+            ces, phi, cut = result, float('nan'), None
+        else:
+            ces, phi, cut = result.ces, result.phi, result.cut
+
+        subsystem = result.subsystem
+        system_id = self.next_id
+        self.next_id += 1
+
+        self._systems.append((
+            system_id,
+            # Network hashes are deterministic; keep the low 64 bits
+            hash(subsystem.network) % 2 ** 64,
+            subsystem.network.size,
+            state_mask(subsystem.state),
+            node_mask(subsystem.node_indices),
+            phi,
+            node_mask(getattr(cut, 'from_nodes', ())),
+            node_mask(getattr(cut, 'to_nodes', ())),
+            len(ces),
+            np.nan if result.time is None else result.time,
+        ) + tuple(extra[name] for name in self.extra_fields))
+
+        for concept in ces:
+            self._concepts.append((
+                system_id,
+                node_mask(concept.mechanism),
+                node_mask(concept.cause_purview),
+                node_mask(concept.effect_purview),
+                concept.phi,
+                concept.cause.phi,
+                concept.effect.phi,
+            ))
+
+        if len(self._systems) + len(self._concepts) >= self.buffer_size:
+            self.flush()
+
+        return system_id
+
+    def flush(self):
+        """Write all buffered rows to disk."""
+        # Systems are written first, so that the ids of concepts on disk
+        # always refer to systems on disk. An interrupted write can leave a
+        # system with fewer than ``num_concepts`` concepts.
+        for filename, rows, dtype in [
+                (SYSTEMS_FILE, self._systems, self.system_dtype),
+                (CONCEPTS_FILE, self._concepts, self.concept_dtype)]:
+            with open(os.path.join(self.path, filename), 'ab') as f:
+                f.write(np.array(rows, dtype=dtype).tobytes())
+
+        self._systems = []
+        self._concepts = []
+
+    def close(self):
+        """Write all buffered rows to disk."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _memmap(path, dtype):
+    """Memory-map a table, ignoring any partially-written last row."""
+    if not os.path.exists(path):
+        return np.zeros(0, dtype=dtype)
+    num_rows = os.path.getsize(path) // dtype.itemsize
+    if not num_rows:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(num_rows,))
+
+
+class ResultsReader:
+    """Reads a store written by ``ResultsWriter``.
+
+    Attributes:
+        systems (np.ndarray): The memory-mapped systems table.
+        concepts (np.ndarray): The memory-mapped concepts table.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        system_dtype, concept_dtype = _load_schema(path)
+        self.systems = _memmap(os.path.join(path, SYSTEMS_FILE),
+                               system_dtype)
+        self.concepts = _memmap(os.path.join(path, CONCEPTS_FILE),
+                                concept_dtype)
+
+    def __len__(self):
+        return len(self.systems)
+
+    def filter(self, condition):
+        """Return the rows of the systems table which satisfy a condition.
+
+        Args:
+            condition (Callable): A function of the systems table which
+                returns a boolean mask, *e.g.*
+                ``lambda systems: systems['phi'] > 0``.
+        """
+        return self.systems[condition(self.systems)]
+
+    def concepts_of(self, systems):
+        """Return the rows of the concepts table of the given systems.
+
+        Args:
+            systems (np.ndarray): Rows of the systems table, or their ids.
+        """
+        if systems.dtype.names:
+            systems = systems['id']
+        return self.concepts[np.isin(self.concepts['system'], systems)]
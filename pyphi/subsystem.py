@@ -9,15 +9,18 @@ import logging
 
 import numpy as np
 
-from . import Direction, cache, distribution, utils, validate
+from . import (Direction, cache, config, constants, distance,
+               distribution, instrumentation, utils, validate)
 from .distance import repertoire_distance
-from .distribution import max_entropy_distribution, repertoire_shape
+from .distribution import (marginal_zero, max_entropy_distribution,
+                           repertoire_shape)
 from .models import (Concept, MaximallyIrreducibleCause,
                      MaximallyIrreducibleEffect, NullCut,
                      RepertoireIrreducibilityAnalysis, _null_ria)
 from .network import irreducible_purviews
 from .node import generate_nodes
-from .partition import mip_partitions
+from .partition import (INFORMATION_BOUNDED_PARTITION_TYPES,
+                        ordered_mip_partitions)
 from .tpm import condition_tpm, marginalize_out
 from .utils import time_annotated
 
@@ -37,6 +40,12 @@ class Subsystem:
             labels if the |Network| was passed ``node_labels``. If this is
             ``None`` then the full network will be used.
         cut (Cut): The unidirectional |Cut| to apply to this subsystem.
+        purview_cache (PurviewCache): A cache of potential purviews. It can be
+            shared by subsystems with the same nodes in other states and with
+            other cuts.
+        single_node_repertoire_cache (DictCache): A cache of the repertoires
+            of single nodes. It can be shared by subsystems with the same nodes
+            and the same state of the external nodes, with any cut.
 
     Attributes:
         network (Network): The network the subsystem belongs to.
@@ -51,7 +60,7 @@ class Subsystem:
 
     def __init__(self, network, state, nodes=None, cut=None, mice_cache=None,
                  repertoire_cache=None, single_node_repertoire_cache=None,
-                 _external_indices=None):
+                 purview_cache=None, _external_indices=None):
         # The network this subsystem belongs to.
         validate.is_network(network)
         self.network = network
@@ -95,6 +104,9 @@ class Subsystem:
             single_node_repertoire_cache or cache.DictCache()
         self._repertoire_cache = repertoire_cache or cache.DictCache()
 
+        # Potential purviews of mechanisms, which do not depend on the state
+        self._purview_cache = purview_cache or cache.PurviewCache()
+
         self.nodes = generate_nodes(
             self.tpm, self.cm, self.state, self.node_indices, self.node_labels)
 
@@ -174,7 +186,8 @@ class Subsystem:
             'single_node_repertoire':
                 self._single_node_repertoire_cache.info(),
             'repertoire': self._repertoire_cache.info(),
-            'mice': self._mice_cache.info()
+            'mice': self._mice_cache.info(),
+            'purview': self._purview_cache.info()
         }
 
     def clear_caches(self):
@@ -235,6 +248,14 @@ class Subsystem:
     def __hash__(self):
         return hash((self.network, self.node_indices, self.state, self.cut))
 
+    def __getstate__(self):
+        # The caches of state-independent structures can be shared by many
+        # subsystems, so they are not pickled along with each of them.
+        state = self.__dict__.copy()
+        state['_single_node_repertoire_cache'] = cache.DictCache()
+        state['_purview_cache'] = cache.PurviewCache()
+        return state
+
     def to_json(self):
         """Return a JSON-serializable representation."""
         return {
@@ -253,8 +274,15 @@ class Subsystem:
         Returns:
             Subsystem: The cut subsystem.
         """
-        return Subsystem(self.network, self.state, self.node_indices,
-                         cut=cut, mice_cache=self._mice_cache)
+        # The cut does not change the TPM, and the single node repertoires and
+        # potential purviews are cached by the inputs of the nodes and the cut,
+        # so those caches are shared with the cut subsystem.
+        return Subsystem(
+            self.network, self.state, self.node_indices, cut=cut,
+            mice_cache=self._mice_cache,
+            single_node_repertoire_cache=self._single_node_repertoire_cache,
+            purview_cache=self._purview_cache,
+            _external_indices=self.external_indices)
 
     def indices2nodes(self, indices):
         """Return |Nodes| for these indices.
@@ -274,19 +302,24 @@ class Subsystem:
         return tuple(self._index2node[n] for n in indices)
 
     # TODO extend to nonbinary nodes
+    # The inputs and state of the node are arguments so that they are part of
+    # the cache key: the cache can then be shared by cut subsystems and
+    # subsystems in other states.
     @cache.method('_single_node_repertoire_cache', Direction.CAUSE)
-    def _single_node_cause_repertoire(self, mechanism_node_index, purview):
+    def _single_node_cause_repertoire(self, mechanism_node_index, inputs,
+                                      state, purview):
         # pylint: disable=missing-docstring
         mechanism_node = self._index2node[mechanism_node_index]
         # We're conditioning on this node's state, so take the TPM for the node
         # being in that state.
-        tpm = mechanism_node.tpm[..., mechanism_node.state]
+        tpm = mechanism_node.tpm[..., state]
         # Marginalize-out all parents of this mechanism node that aren't in the
         # purview.
-        return marginalize_out((mechanism_node.inputs - purview), tpm)
+        return marginalize_out((inputs - purview), tpm)
 
     # TODO extend to nonbinary nodes
     @cache.method('_repertoire_cache', Direction.CAUSE)
+    @instrumentation.timed('cause_repertoire')
     def cause_repertoire(self, mechanism, purview):
         """Return the cause repertoire of a mechanism over a purview.
 
@@ -321,8 +354,9 @@ class Subsystem:
         # The cause repertoire is the product of the cause repertoires of the
         # individual nodes.
         joint *= functools.reduce(
-            np.multiply, [self._single_node_cause_repertoire(m, purview)
-                          for m in mechanism]
+            np.multiply, [self._single_node_cause_repertoire(
+                m, self._index2node[m].inputs, self._index2node[m].state,
+                purview) for m in mechanism]
         )
         # The resulting joint distribution is over previous states, which are
         # rows in the TPM, so the distribution is a column. The columns of a
@@ -330,21 +364,29 @@ class Subsystem:
         return distribution.normalize(joint)
 
     # TODO extend to nonbinary nodes
+    # The repertoire only depends on the inputs of the purview node and the
+    # state of those which are in the mechanism, which are passed instead of
+    # the mechanism so that the cache can be shared by cut subsystems and
+    # subsystems in other states.
     @cache.method('_single_node_repertoire_cache', Direction.EFFECT)
-    def _single_node_effect_repertoire(self, mechanism, purview_node_index):
+    def _single_node_effect_repertoire(self, mechanism_inputs,
+                                       mechanism_state, purview_node_index,
+                                       inputs):
         # pylint: disable=missing-docstring
         purview_node = self._index2node[purview_node_index]
         # Condition on the state of the inputs that are in the mechanism.
-        mechanism_inputs = (purview_node.inputs & mechanism)
-        tpm = condition_tpm(purview_node.tpm, mechanism_inputs, self.state)
+        tpm = purview_node.tpm
+        for i, state in zip(mechanism_inputs, mechanism_state):
+            tpm = tpm[(slice(None),) * i + (slice(state, state + 1),)]
         # Marginalize-out the inputs that aren't in the mechanism.
-        nonmechanism_inputs = (purview_node.inputs - mechanism)
+        nonmechanism_inputs = inputs.difference(mechanism_inputs)
         tpm = marginalize_out(nonmechanism_inputs, tpm)
         # Reshape so that the distribution is over next states.
         return tpm.reshape(repertoire_shape([purview_node.index],
                                             self.tpm_size))
 
     @cache.method('_repertoire_cache', Direction.EFFECT)
+    @instrumentation.timed('effect_repertoire')
     def effect_repertoire(self, mechanism, purview):
         """Return the effect repertoire of a mechanism over a purview.
 
@@ -375,10 +417,18 @@ class Subsystem:
         # The effect repertoire is the product of the effect repertoires of the
         # individual nodes.
         return joint * functools.reduce(
-            np.multiply, [self._single_node_effect_repertoire(mechanism, p)
+            np.multiply, [self._purview_node_effect_repertoire(mechanism, p)
                           for p in purview]
         )
 
+    def _purview_node_effect_repertoire(self, mechanism, purview_node_index):
+        """Return the effect repertoire of a mechanism over a single node."""
+        inputs = self._index2node[purview_node_index].inputs
+        mechanism_inputs = tuple(sorted(inputs & mechanism))
+        mechanism_state = utils.state_of(mechanism_inputs, self.state)
+        return self._single_node_effect_repertoire(
+            mechanism_inputs, mechanism_state, purview_node_index, inputs)
+
     def repertoire(self, direction, mechanism, purview):
         """Return the cause or effect repertoire based on a direction.
 
@@ -508,6 +558,30 @@ class Subsystem:
     # MIP methods
     # =========================================================================
 
+    @cache.method('_repertoire_cache', 'marginals')
+    def _repertoire_marginals(self, direction, mechanism, purview):
+        """Return the probability that each purview node is OFF in the
+        repertoire of a mechanism over a purview.
+        """
+        repertoire = self.repertoire(direction, mechanism, purview)
+        return np.array([marginal_zero(repertoire, i) for i in purview])
+
+    def _partitioned_marginals(self, direction, partition, positions):
+        """Return the probability that each purview node is OFF in the
+        partitioned repertoire, without computing the repertoire.
+
+        The purviews of the parts are independent, so the marginals of their
+        nodes are those of the repertoires of the parts. ``positions`` maps
+        each purview node to its position in the purview.
+        """
+        marginals = np.empty(len(positions))
+        for part in partition:
+            if part.purview:
+                marginals[[positions[i] for i in part.purview]] = \
+                    self._repertoire_marginals(direction, part.mechanism,
+                                               part.purview)
+        return marginals
+
     def evaluate_partition(self, direction, mechanism, purview, partition,
                            repertoire=None):
         """Return the |small_phi| of a mechanism over a purview for the given
@@ -538,6 +612,7 @@ class Subsystem:
 
         return (phi, partitioned_repertoire)
 
+    @instrumentation.timed('find_mip')
     def find_mip(self, direction, mechanism, purview):
         """Return the minimum information partition for a mechanism over a
         purview.
@@ -579,21 +654,55 @@ class Subsystem:
             return _mip(0, None, None)
 
         mip = _null_ria(direction, mechanism, purview, phi=float('inf'))
+        mip_index = None
+
+        # Bound the distance to each partitioned repertoire from the marginals
+        # of the nodes, if the measure allows it.
+        bounded = distance.has_marginal_bound()
+        if bounded:
+            marginals = self._repertoire_marginals(direction, mechanism,
+                                                   purview)
+            positions = {node: i for i, node in enumerate(purview)}
+
+        # Try the partitions most likely to be minimal first; ties are broken
+        # by the original order of the partitions.
+        partitions = ordered_mip_partitions(mechanism, purview,
+                                            self.node_labels)
+
+        for index, partition in partitions:
+            instrumentation.count('find_mip.partitions')
+
+            # Skip the partition if it cannot be more minimal.
+            if bounded and mip_index is not None:
+                bound = distance.marginal_bound(
+                    marginals,
+                    self._partitioned_marginals(direction, partition,
+                                                positions))
+                if bound - mip.phi > constants.EPSILON:
+                    instrumentation.count('find_mip.pruned')
+                    continue
 
-        for partition in mip_partitions(mechanism, purview, self.node_labels):
             # Find the distance between the unpartitioned and partitioned
             # repertoire.
             phi, partitioned_repertoire = self.evaluate_partition(
                 direction, mechanism, purview, partition,
                 repertoire=repertoire)
 
-            # Return immediately if mechanism is reducible.
             if phi == 0:
-                return _mip(0.0, partition, partitioned_repertoire)
+                phi = 0.0
 
             # Update MIP if it's more minimal.
-            if phi < mip.phi:
+            if phi < mip.phi or (phi == mip.phi and index < mip_index):
                 mip = _mip(phi, partition, partitioned_repertoire)
+                mip_index = index
+
+                # Once the mechanism is known to be reducible, only a
+                # partition earlier in the original order can replace the
+                # MIP. Return immediately if there is none.
+                if phi == 0:
+                    if index == 0:
+                        return mip
+                    partitions.restrict(index)
 
         return mip
 
@@ -650,17 +759,67 @@ class Subsystem:
             purviews (tuple[int]): Optional subset of purviews of interest.
         """
         if purviews is False:
-            purviews = self.network.potential_purviews(direction, mechanism)
-            # Filter out purviews that aren't in the subsystem
-            purviews = [purview for purview in purviews
-                        if set(purview).issubset(self.node_indices)]
+            return self._potential_purviews(self.cut, direction, mechanism)
 
         # Purviews are already filtered in network.potential_purviews
         # over the full network connectivity matrix. However, since the cm
         # is cut/smaller we check again here.
         return irreducible_purviews(self.cm, direction, mechanism, purviews)
 
+    # The cut is an argument so that the cache can be shared by cut
+    # subsystems.
+    @cache.method('_purview_cache')
+    def _potential_purviews(self, cut, direction, mechanism):
+        # pylint: disable=missing-docstring,unused-argument
+        purviews = self.network.potential_purviews(direction, mechanism)
+        # Filter out purviews that aren't in the subsystem
+        purviews = [purview for purview in purviews
+                    if set(purview).issubset(self.node_indices)]
+        return irreducible_purviews(self.cm, direction, mechanism, purviews)
+
+    def _information(self, direction, mechanism, purview):
+        """Return the cause or effect information of a mechanism over a
+        purview, which bounds its |small_phi| from above.
+        """
+        if not purview:
+            return 0.0
+        repertoire = self.repertoire(direction, mechanism, purview)
+        # The MIP of an unreachable state has no |small_phi|.
+        if direction == Direction.CAUSE and np.all(repertoire == 0):
+            return 0.0
+        return repertoire_distance(
+            direction, repertoire,
+            self.unconstrained_repertoire(direction, purview))
+
+    def _max_mip(self, direction, mechanism, purviews):
+        """Return the maximum of the MIPs of a mechanism over the purviews.
+
+        The purviews with the most information are tried first, and those
+        whose information is less than the current maximum |small_phi| are
+        skipped. Ties are broken by the original order of the purviews, as
+        with ``max``.
+        """
+        purviews = sorted(
+            ((self._information(direction, mechanism, purview), index,
+              purview) for index, purview in enumerate(purviews)),
+            key=lambda item: item[0], reverse=True)
+
+        max_mip, max_index = None, None
+        for i, (information, index, purview) in enumerate(purviews):
+            if max_mip is not None and information < max_mip.phi:
+                instrumentation.count('find_mice.pruned', len(purviews) - i)
+                break
+
+            mip = self.find_mip(direction, mechanism, purview)
+            if (max_mip is None or mip > max_mip or
+                    (mip.order_by() == max_mip.order_by() and
+                     index < max_index)):
+                max_mip, max_index = mip, index
+
+        return max_mip
+
     @cache.method('_mice_cache')
+    @instrumentation.timed('find_mice')
     def find_mice(self, direction, mechanism, purviews=False):
         """Return the |MIC| or |MIE| for a mechanism.
 
@@ -682,6 +841,8 @@ class Subsystem:
 
         if not purviews:
             max_mip = _null_ria(direction, mechanism, ())
+        elif config.PARTITION_TYPE in INFORMATION_BOUNDED_PARTITION_TYPES:
+            max_mip = self._max_mip(direction, mechanism, purviews)
         else:
             max_mip = max(self.find_mip(direction, mechanism, purview)
                           for purview in purviews)
@@ -4,16 +4,60 @@
 
 """
 Functions for converting the timescale of a TPM.
+
+TPMs are run forward with one of three methods, chosen by ``run_tpm`` from the
+size of the network, the number of steps, and the density of the
+state-by-state TPM being powered:
+
+- ``'squaring'``: the dense state-by-state TPM is raised to the power by
+  repeated squaring. This is fastest for small networks run for many steps.
+- ``'products'``: the state-by-state TPM, stored as a sparse CSR matrix if it
+  is sparse, is applied once per step to the marginal probabilities of the
+  nodes at the last step. The power itself is never formed.
+- ``'factored'``: as ``'products'``, but each step is evaluated from the
+  state-by-node TPM, using the fact that the nodes are conditionally
+  independent. The state-by-state TPM is never formed, so memory grows with
+  ``2^N`` instead of ``4^N``.
 """
 
 import numpy as np
-from scipy.sparse import csc_matrix
+from scipy.sparse import csc_matrix, csr_matrix
 
 from . import convert
 
+#: Methods for running a TPM forward.
+METHODS = ('squaring', 'products', 'factored')
+
+# State-by-state TPMs with more entries than this are not formed densely.
+_MAX_DENSE_ENTRIES = 2 ** 24
+
+# The maximum number of entries in the intermediate arrays of the factored
+# method.
+_MAX_CHUNK_ENTRIES = 2 ** 22
+
+
+def density(tpm):
+    """Return the fraction of nonzero entries in the state-by-state form of a
+    state-by-node TPM, without forming it.
+
+    Args:
+        tpm (np.ndarray): A state-by-node TPM.
+
+    Returns:
+        float
+    """
+    tpm = convert.to_2dimensional(tpm)
+    # A row has two nonzero transitions for each node which is neither
+    # certainly off nor certainly on
+    free = np.sum((tpm > 0) & (tpm < 1), axis=1)
+    return float(np.mean(np.exp2(free - tpm.shape[1])))
+
 
 def sparse(matrix, threshold=0.1):
-    return np.sum(matrix > 0) / matrix.size > threshold
+    """Return whether the fraction of nonzero entries of a matrix is at most
+    ``threshold``.
+    """
+    return np.sum(matrix != 0) / matrix.size <= threshold
 
 
 def sparse_time(tpm, time_scale):
@@ -25,22 +69,144 @@ def dense_time(tpm, time_scale):
     return np.linalg.matrix_power(tpm, time_scale)
 
 
-def run_tpm(tpm, time_scale):
+def sparse_state_by_state(tpm):
+    """Return the state-by-state form of a state-by-node TPM as a sparse CSR
+    matrix, without forming it densely.
+
+    Args:
+        tpm (np.ndarray): A state-by-node TPM.
+
+    Returns:
+        scipy.sparse.csr_matrix
+    """
+    tpm = convert.to_2dimensional(tpm)
+    num_states, num_nodes = tpm.shape
+    # The nonzero entries, built up one node at a time
+    rows = np.arange(num_states)
+    cols = np.zeros(num_states, dtype=int)
+    values = np.ones(num_states)
+    for i in range(num_nodes):
+        p_on = tpm[rows, i]
+        on, off = p_on > 0, p_on < 1
+        rows = np.concatenate([rows[off], rows[on]])
+        cols = np.concatenate([cols[off], cols[on] | (1 << i)])
+        values = np.concatenate([values[off] * (1 - p_on[off]),
+                                 values[on] * p_on[on]])
+    return csr_matrix((values, (rows, cols)), shape=(num_states, num_states))
+
+
+def _factored_product(tpm, marginals):
+    """Return the product of the state-by-state form of a state-by-node TPM
+    with ``marginals``, without forming it.
+
+    Row ``i`` of the product is the expectation of ``marginals`` under the
+    distribution of next states given state ``i``, which is the product of
+    the distributions of the nodes. The expectation is taken one node at a
+    time, starting with the last node, which indexes the slowest-varying
+    dimension of the little-endian rows of ``marginals``.
+    """
+    num_states, num_nodes = tpm.shape
+    columns = marginals.shape[1]
+    product = np.empty((num_states, columns))
+    chunk = max(1, _MAX_CHUNK_ENTRIES // (num_states * columns))
+    for start in range(0, num_states, chunk):
+        p_on = tpm[start:start + chunk]
+        expectation = marginals[np.newaxis]
+        for i in reversed(range(num_nodes)):
+            expectation = expectation.reshape(
+                expectation.shape[0], 2, -1, columns)
+            expectation = (
+                (1 - p_on[:, i, np.newaxis, np.newaxis]) * expectation[:, 0] +
+                p_on[:, i, np.newaxis, np.newaxis] * expectation[:, 1])
+        product[start:start + len(p_on)] = expectation.reshape(-1, columns)
+    return product
+
+
+def choose_method(tpm, steps, threshold=0.1):
+    """Choose the method used to run a TPM forward.
+
+    Args:
+        tpm (np.ndarray): The state-by-node TPM which is applied repeatedly.
+        steps (int): The number of times it is applied.
+
+    Keyword Args:
+        threshold (float): The maximum density at which the state-by-state TPM
+            is stored as a sparse matrix.
+
+    Returns:
+        str: One of ``METHODS``.
+    """
+    tpm = convert.to_2dimensional(tpm)
+    num_states, num_nodes = tpm.shape
+    fraction = density(tpm)
+    if num_states ** 2 > _MAX_DENSE_ENTRIES:
+        return 'products' if fraction <= threshold else 'factored'
+    # Compare the number of multiplications: squaring takes about
+    # ``2 log2(steps)`` products of state-by-state matrices, while applying
+    # the TPM to the marginals takes one sparse or dense product with an
+    # ``N``-column matrix per step.
+    if fraction > threshold:
+        fraction = 1
+    squaring = 2 * steps.bit_length() * num_states ** 3
+    products = steps * fraction * num_states ** 2 * num_nodes
+    return 'squaring' if squaring < products else 'products'
+
+
+def _operator(tpm, method, threshold):
+    """Return a function which multiplies a matrix by the state-by-state form
+    of ``tpm``.
+    """
+    if method == 'factored':
+        return lambda marginals: _factored_product(tpm, marginals)
+    if density(tpm) <= threshold:
+        return sparse_state_by_state(tpm).dot
+    return convert.state_by_node2state_by_state(tpm).dot
+
+
+def run_tpm(tpm, time_scale, noise_tpm=None, method=None, threshold=0.1):
     """Iterate a TPM by the specified number of time steps.
 
     Args:
         tpm (np.ndarray): A state-by-node tpm.
         time_scale (int): The number of steps to run the tpm.
 
+    Keyword Args:
+        noise_tpm (np.ndarray): If given, this state-by-node TPM is used for
+            every step after the first.
+        method (str): One of ``METHODS``. By default it is chosen by
+            ``choose_method``.
+        threshold (float): The maximum density at which state-by-state TPMs
+            are stored as sparse matrices.
+
     Returns:
-        np.ndarray
+        np.ndarray: The state-by-node TPM over ``time_scale`` steps.
     """
-    sbs_tpm = convert.state_by_node2state_by_state(tpm)
-    if sparse(tpm):
-        tpm = sparse_time(sbs_tpm, time_scale)
+    tpm = convert.to_2dimensional(tpm)
+    if noise_tpm is None:
+        noise_tpm = tpm
+    else:
+        noise_tpm = convert.to_2dimensional(noise_tpm)
+
+    steps = time_scale - 1
+    if method is None:
+        method = choose_method(noise_tpm, steps, threshold)
+    elif method not in METHODS:
+        raise ValueError('Unknown method {}; must be one of {}'.format(
+            method, METHODS))
+
+    # The marginal probabilities of the nodes after the last step, given the
+    # state before each step, starting with the last.
+    marginals = convert.le_states(tpm.shape[1]).astype(float)
+    if method == 'squaring':
+        noise_sbs = convert.state_by_node2state_by_state(noise_tpm)
+        marginals = np.linalg.matrix_power(noise_sbs, steps).dot(marginals)
     else:
-        tpm = dense_time(sbs_tpm, time_scale)
-    return convert.state_by_state2state_by_node(tpm)
+        apply_noise = _operator(noise_tpm, method, threshold)
+        for _ in range(steps):
+            marginals = apply_noise(marginals)
+
+    marginals = _operator(tpm, method, threshold)(marginals)
+    return convert.to_multidimensional(marginals)
 
 
 def run_cm(cm, time_scale):
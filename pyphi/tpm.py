@@ -11,7 +11,6 @@ from itertools import chain
 import numpy as np
 
 from .constants import OFF, ON
-from .utils import all_states
 
 
 def tpm_indices(tpm):
@@ -101,13 +100,63 @@ def infer_edge(tpm, a, b, contexts):
     return any(a_affects_b_in_context(context) for context in contexts)
 
 
-def infer_cm(tpm):
+def _infer_edges(tpm):
+    """Return the edges from each node of a multidimensional TPM to each node
+    of the network, as a boolean array of shape ``(tpm.ndim - 1, N)``.
+
+    There is an edge from a node if the TPM differs between its OFF and ON
+    states in any context.
+    """
+    node_axes = tuple(range(tpm.ndim - 1))
+    edges = np.zeros((tpm.ndim - 1, tpm.shape[-1]), dtype=bool)
+    for a in node_axes:
+        # Singleton dimensions have no differences, hence no edges
+        edges[a] = np.any(np.diff(tpm, axis=a) != 0, axis=node_axes)
+    return edges
+
+
+def infer_cm(tpm, block_size=None):
     """Infer the connectivity matrix associated with a state-by-node TPM in
     multidimensional form.
+
+    There is an edge from |A| to |B| if there exists any context in which the
+    state of |A| changes the probability of |B| (see :func:`infer_edge`). All
+    contexts are compared at once, one dimension of the TPM at a time.
+
+    Args:
+        tpm (np.ndarray): The TPM in state-by-node, multidimensional form.
+
+    Keyword Args:
+        block_size (int): If given, the TPM is read in blocks of at most this
+            many states, so that the memory used is bounded by the size of a
+            block rather than of the TPM. This allows inferring the
+            connectivity of large networks whose TPMs are memory-mapped, *e.g.*
+            with ``np.load(..., mmap_mode='r')``.
+
+    Returns:
+        np.ndarray: The connectivity matrix.
     """
-    network_size = tpm.shape[-1]
-    all_contexts = tuple(all_states(network_size - 1))
-    cm = np.empty((network_size, network_size), dtype=int)
-    for a, b in np.ndindex(cm.shape):
-        cm[a][b] = infer_edge(tpm, a, b, all_contexts)
-    return cm
+    shape = tpm.shape[:-1]
+    if block_size is None:
+        block_size = np.prod(shape, dtype=int)
+
+    # Iterate over the states of the leading nodes, so that each block is a
+    # contiguous subarray of a C-ordered TPM
+    num_leading = 0
+    while np.prod(shape[num_leading:], dtype=int) > max(block_size, 1):
+        num_leading += 1
+
+    cm = np.zeros((len(shape), tpm.shape[-1]), dtype=bool)
+    for prefix in np.ndindex(*shape[:num_leading]):
+        block = np.asarray(tpm[prefix])
+        cm[num_leading:] |= _infer_edges(block)
+
+        # Compare the block with the block in which a leading node is ON
+        for a in range(num_leading):
+            if prefix[a] == 0 and shape[a] == 2:
+                on = prefix[:a] + (1,) + prefix[a + 1:]
+                cm[a] |= np.any(
+                    block != np.asarray(tpm[on]),
+                    axis=tuple(range(block.ndim - 1)))
+
+    return cm.astype(int)
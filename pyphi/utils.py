@@ -193,12 +193,13 @@ def load_data(directory, num):
         list: A list of loaded data, such that ``list[i]`` contains the the
         contents of ``i.npy``.
     """
-    root = os.path.abspath(os.path.dirname(__file__))
+    return [load_datum(directory, i) for i in range(num)]
 
-    def get_path(i):  # pylint: disable=missing-docstring
-        return os.path.join(root, 'data', directory, str(i) + '.npy')
 
-    return [np.load(get_path(i)) for i in range(num)]
+def load_datum(directory, i):
+    """Load the numpy data in ``../data/<dir>/<i>.npy``."""
+    root = os.path.abspath(os.path.dirname(__file__))
+    return np.load(os.path.join(root, 'data', directory, str(i) + '.npy'))
 
 
 # Using ``decorator`` preserves the function signature of the wrapped function,
@@ -1,9 +1,12 @@
+import itertools
+
 import numpy as np
 import pytest
 
 from pyphi import (Direction, Network, Subsystem, actual, config, examples,
-                   models)
+                   instrumentation, models, utils)
 from pyphi.models import KPartition, Part
+from pyphi.partition import mip_partitions
 
 # TODO
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -218,6 +221,62 @@ def test_transition_apply_cut(transition):
     assert cut_transition != transition
 
 
+def test_transition_apply_cut_shares_tpms_and_nodes(transition):
+    assert transition.cause_system.tpm is transition.effect_system.tpm
+    assert transition.cause_system.state == transition.after_state
+    assert transition.effect_system.state == transition.before_state
+
+    # Severs the connection from node 1 to node 0
+    cut = ac_cut(Direction.CAUSE, Part((), (1,)), Part((0,), (2,)))
+    cut_transition = transition.apply_cut(cut)
+    fresh_transition = actual.Transition(
+        transition.network, transition.before_state, transition.after_state,
+        transition.cause_indices, transition.effect_indices, cut)
+
+    for direction in (Direction.CAUSE, Direction.EFFECT):
+        system = cut_transition.system[direction]
+        assert system.tpm is transition.system[direction].tpm
+        assert system.cut == cut
+        np.testing.assert_array_equal(system.cm,
+                                      fresh_transition.system[direction].cm)
+        for node, fresh_node in zip(system.nodes,
+                                    fresh_transition.system[direction].nodes):
+            np.testing.assert_array_equal(node.tpm, fresh_node.tpm)
+            assert node.state == fresh_node.state
+            assert node.inputs == fresh_node.inputs
+            assert node.outputs == fresh_node.outputs
+        assert system.nodes[1].outputs == frozenset()
+        # Node 2 is unaffected by the cut
+        assert system.nodes[2] is transition.system[direction].nodes[2]
+
+    assert actual.sia(cut_transition) == actual.sia(fresh_transition)
+
+
+def test_apply_cut_reuses_causal_links(transition):
+    unpartitioned_account = actual.account(transition)
+    assert transition._causal_link_cache.size() > 0
+
+    reused = 0
+    for cut in actual._get_cuts(transition, Direction.BIDIRECTIONAL):
+        cut_transition = transition.apply_cut(cut)
+        reused += cut_transition._causal_link_cache.size()
+        # Compare to the account of a transition which doesn't inherit links
+        fresh_transition = actual.Transition(
+            transition.network, transition.before_state,
+            transition.after_state, transition.cause_indices,
+            transition.effect_indices, cut)
+        with instrumentation.record() as report:
+            partitioned_account = actual.account(cut_transition)
+        assert partitioned_account == actual.account(fresh_transition)
+        assert [link.alpha for link in partitioned_account] == [
+            link.alpha for link in actual.account(fresh_transition)]
+        assert (report.counts['cache.causal_link.hits'] ==
+                cut_transition._causal_link_cache.info().hits)
+
+    assert reused > 0
+    assert actual.account(transition) == unpartitioned_account
+
+
 def test_to_json(transition):
     transition.to_json()
 
@@ -329,6 +388,20 @@ def test_account_addition():
         a1 + [causal_link()]
 
 
+@pytest.mark.parametrize('parallel', [False, True])
+def test_accounts(parallel, background_3_node):
+    state_pairs = [((1, 1, 0), (1, 1, 1)), ((1, 1, 1), (1, 1, 1)),
+                   ((1, 0, 1), (1, 1, 1)), ((1, 1, 0), (1, 1, 1))]
+    accounts = list(actual.accounts(background_3_node, state_pairs,
+                                    (0, 1), (0, 2), parallel=parallel,
+                                    chunk_size=3))
+    assert accounts == [
+        actual.account(actual.Transition(background_3_node, before_state,
+                                         after_state, (0, 1), (0, 2)))
+        for before_state, after_state in state_pairs
+    ]
+
+
 def test_ac_sia_repr_and_str(transition):
     bm = ac_sia(transition=transition)
     str(bm)
@@ -395,6 +468,28 @@ def test_probability(direction, mechanism, purview, probability, transition):
                       probability)
 
 
+def test_probabilities_are_repertoire_entries(background_3_node):
+    transition = actual.Transition(background_3_node, (1, 1, 0), (1, 1, 1),
+                                   (0, 1, 2), (0, 1, 2))
+    for direction in (Direction.CAUSE, Direction.EFFECT):
+        mechanisms = utils.powerset(transition.mechanism_indices(direction))
+        purviews = list(utils.powerset(transition.purview_indices(direction),
+                                       nonempty=True))
+        for mechanism, purview in itertools.product(mechanisms, purviews):
+            repertoire = transition.repertoire(direction, mechanism, purview)
+            assert np.isclose(
+                transition.probability(direction, mechanism, purview),
+                transition.state_probability(direction, repertoire, purview))
+
+            for partition in mip_partitions(mechanism, purview):
+                repertoire = transition.partitioned_repertoire(direction,
+                                                               partition)
+                assert np.isclose(
+                    transition.partitioned_probability(direction, partition),
+                    transition.state_probability(direction, repertoire,
+                                                 purview))
+
+
 def test_unconstrained_probability(transition):
     assert transition.unconstrained_probability(Direction.CAUSE, (1,)) == 0.5
     assert transition.unconstrained_probability(Direction.EFFECT, (0,)) == 0.75
@@ -485,6 +580,15 @@ def test_actual_cut_matrix():
         [0, 0, 1]]))
 
 
+def test_actual_cut_severed_key(transition):
+    n = transition.network.size
+    cuts = list(actual._get_cuts(transition, Direction.CAUSE)) + list(
+        actual._get_cuts(transition, Direction.EFFECT))
+    for a, b in itertools.product(cuts, repeat=2):
+        assert ((a.severed_key() == b.severed_key()) ==
+                np.array_equal(a.cut_matrix(n), b.cut_matrix(n)))
+
+
 def ac_cut(direction, *parts):
     return models.ActualCut(direction, KPartition(*parts))
 
@@ -522,6 +626,13 @@ def test_sia(transition):
     assert len(sia.partitioned_account) == 2
 
 
+@config.override(PARALLEL_AC_CUT_EVALUATION=True)
+def test_sia_parallel(transition):
+    sia = actual.sia(transition)
+    assert sia.alpha == 0.415037
+    assert sia.cut == ac_cut(Direction.CAUSE, Part((), (1,)), Part((0,), (2,)))
+
+
 def test_null_ac_sia(transition):
     sia = actual._null_ac_sia(transition, Direction.CAUSE)
     assert sia.transition == transition
@@ -549,6 +660,28 @@ def test_causal_nexus(standard):
     assert nexus.transition.effect_indices == (2,)
 
 
+def test_causal_nexus_is_first_maximal_transition():
+    network = examples.actual_causation()
+    state = (1, 0)
+    nexus = actual.nexus(network, state, state)
+    with instrumentation.record() as report:
+        causal_nexus = actual.causal_nexus(network, state, state)
+
+    # Two transitions have maximal alpha; the first one is the causal nexus
+    assert [sia.alpha for sia in nexus] == [2.0, 2.0, 0.169925]
+    assert causal_nexus == max(nexus) == nexus[0]
+    assert report.counts['actual.pruned'] > 0
+
+
+@config.override(PARALLEL_COMPLEX_EVALUATION=True)
+def test_nexus_parallel(standard):
+    states = ((0, 0, 1), (1, 1, 0))
+    with config.override(PARALLEL_COMPLEX_EVALUATION=False):
+        answer = actual.nexus(standard, *states)
+    assert actual.nexus(standard, *states) == answer
+    assert actual.causal_nexus(standard, *states) == max(answer)
+
+
 def test_true_events(standard):
     states = ((1, 0, 0), (0, 0, 1), (1, 1, 0))  # Previous, current, next
     events = actual.true_events(standard, *states)
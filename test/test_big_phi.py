@@ -6,7 +6,8 @@ import pickle
 
 import pytest
 
-from pyphi import Network, Subsystem, compute, config, constants, models, utils
+from pyphi import (Network, Subsystem, compute, config, constants,
+                   exceptions, models, utils)
 from pyphi.compute.subsystem import (ComputeSystemIrreducibility,
                                      sia_bipartitions)
 
@@ -390,6 +391,42 @@ def test_all_complexes_parallelization(s):
     assert sorted(serial) == sorted(parallel)
 
 
+STANDARD_REACHABLE_STATES = [
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1)
+]
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_sias_of_state_subsystems(s, parallel):
+    subsystems = compute.state_subsystems(s.network,
+                                          STANDARD_REACHABLE_STATES)
+    sias = compute.sias(subsystems, parallel=parallel)
+    assert sias == [compute.sia(Subsystem(s.network, state))
+                    for state in STANDARD_REACHABLE_STATES]
+
+
+def test_sias_mixed_subsystems(s, s_empty, reducible):
+    subsystems = [s, s_empty, reducible, s]
+    sias = compute.sias(subsystems, parallel=False)
+    assert sias == [compute.sia(subsystem) for subsystem in subsystems]
+    check_sia(sias[0], standard_answer)
+    assert sias[1].phi == 0
+    assert sias[2].phi == 0
+
+
+def test_state_subsystems_unreachable_state(s):
+    with pytest.raises(exceptions.StateUnreachableError):
+        compute.state_subsystems(s.network, [(1, 0, 0), (0, 1, 0)])
+
+
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_major_complexes(s):
+    states = STANDARD_REACHABLE_STATES
+    assert list(compute.major_complexes(s.network, states, chunk_size=4)) == [
+        compute.major_complex(s.network, state) for state in states
+    ]
+
+
 def test_sia_complete_graph_standard_example(s_complete):
     sia = compute.sia(s_complete)
     check_sia(sia, standard_answer)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_binary.py
+
+import io
+import tempfile
+
+import numpy as np
+import pytest
+
+from pyphi import (Direction, actual, binary, compute, config, exceptions,
+                   labels, models)
+from test_actual import transition
+
+
+def test_binary_deserialization(s, transition):
+    objects = [
+        Direction.CAUSE,
+        s.network,  # Network
+        s,  # Subsystem
+        models.Bipartition(models.Part((0,), ()), models.Part((1,), (2, 3))),
+        models.Cut((0,), (2,)),
+        models.NullCut((0, 1)),
+        models.KCut(Direction.CAUSE,
+                    models.KPartition(models.Part((0,), ()),
+                                      models.Part((1,), (2, 3)))),
+        s.concept((1, 2)),
+        compute.ces(s),
+        compute.sia(s),
+        transition,
+        actual.account(transition),
+        actual.sia(transition),
+        labels.NodeLabels('AB', (0, 1))
+    ]
+    for o in objects:
+        assert binary.loads(binary.dumps(o)) == o
+
+
+def test_binary_native_and_numpy():
+    x = {
+        'tuple': (1, 2.0, None),
+        'np.int64': np.int64(2),
+        'ndarray': np.array([[1, 2], [3, 4]], dtype='>i4'),
+        'empty': np.zeros((0, 3)),
+    }
+    loaded = binary.loads(binary.dumps(x))
+    assert loaded['tuple'] == (1, 2.0, None)
+    assert loaded['np.int64'] == 2
+    assert np.array_equal(loaded['ndarray'], x['ndarray'])
+    assert loaded['ndarray'].dtype == np.dtype('<i4')
+    assert loaded['empty'].shape == (0, 3)
+
+
+def test_arrays_are_not_copied(s):
+    data = binary.dumps(compute.ces(s))
+    loaded = binary.loads(data)
+    repertoire = loaded[0].cause.repertoire
+    assert not repertoire.flags.writeable
+    assert np.may_share_memory(repertoire, np.frombuffer(data, np.uint8))
+
+
+def test_shared_objects_are_stored_once(s):
+    with config.override(PARALLEL_CUT_EVALUATION=True):
+        sia = compute.sia(s)
+
+    loaded = binary.loads(binary.dumps(sia))
+    assert loaded.subsystem is loaded.ces.subsystem
+    assert loaded.subsystem.network is loaded.cut_subsystem.network
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_dump_and_load_file(s, use_mmap):
+    sia = compute.sia(s)
+    with tempfile.TemporaryFile() as f:
+        binary.dump(sia, f)
+        f.seek(0)
+        assert binary.load(f, use_mmap=use_mmap) == sia
+
+
+def test_load_file_like(s):
+    f = io.BytesIO(binary.dumps(s))
+    assert binary.load(f) == s
+
+
+def test_version_check_during_deserialization(s, monkeypatch):
+    data = binary.dumps(s)
+    monkeypatch.setattr('pyphi.__version__', '0.1.bogus')
+    with pytest.raises(exceptions.JSONVersionError):
+        binary.loads(data)
+
+
+def test_not_a_binary_file():
+    with pytest.raises(ValueError):
+        binary.loads(b'{"json": true}')
@@ -198,3 +198,19 @@ def test_n_d_state_by_node2state_by_state():
     print("Expected:")
     print(expected)
     assert np.array_equal(result, expected)
+
+
+def test_random_state_by_node2state_by_state():
+    # Compare with the probabilities of each transition computed directly
+    random = np.random.RandomState(0)
+    N = 5
+    sbn = random.rand(2**N, N)
+    result = convert.state_by_node2state_by_state(sbn)
+    for i in range(2**N):
+        for j in range(2**N):
+            state = np.array(convert.le_index2state(j, N))
+            expected = np.prod(np.where(state, sbn[i], 1 - sbn[i]))
+            assert np.isclose(result[i, j], expected)
+    # ...and back again
+    assert np.allclose(convert.state_by_state2state_by_node(result),
+                       convert.to_multidimensional(sbn))
@@ -5,7 +5,8 @@
 import numpy as np
 import pytest
 
-from pyphi import config, distance
+from pyphi import Direction, config, constants, distance
+from pyphi.distribution import marginal_zero
 
 
 def test_hamming_matrix():
@@ -119,6 +120,33 @@ def test_system_repertoire_distance_must_be_symmetric():
             distance.system_repertoire_distance(a, b)
 
 
+@pytest.mark.parametrize('measure,direction', [
+    ('EMD', Direction.CAUSE),
+    ('EMD', Direction.EFFECT),
+    ('L1', Direction.CAUSE),
+])
+def test_marginal_bound(measure, direction):
+    np.random.seed(0)
+    for _ in range(100):
+        a = np.random.random((2, 2, 2))
+        a /= a.sum()
+        b = np.random.random((2, 2, 2))
+        b /= b.sum()
+        marginals_a = np.array([marginal_zero(a, i) for i in range(3)])
+        marginals_b = np.array([marginal_zero(b, i) for i in range(3)])
+        with config.override(MEASURE=measure):
+            assert distance.has_marginal_bound()
+            bound = distance.marginal_bound(marginals_a, marginals_b)
+            assert (bound <= distance.repertoire_distance(direction, a, b) +
+                    constants.EPSILON)
+
+
+def test_marginal_bound_of_unbounded_measure():
+    with config.override(MEASURE='KLD'):
+        assert not distance.has_marginal_bound()
+        assert distance.marginal_bound(np.array([0.2]), np.array([0.9])) == 0
+
+
 def test_suppress_np_warnings():
     @distance.np_suppress()
     def divide_by_zero():
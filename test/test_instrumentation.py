@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_instrumentation.py
+
+import pytest
+
+from pyphi import Subsystem, compute, config, examples, instrumentation
+from pyphi.compute import parallel
+
+
+def test_not_recording_by_default():
+    assert not instrumentation.recording()
+    instrumentation.count('test')
+
+
+def test_record_nested():
+    with instrumentation.record() as outer:
+        instrumentation.count('a')
+        with instrumentation.record() as inner:
+            instrumentation.count('a', 2)
+            instrumentation.observe('b', 4)
+        assert instrumentation.recording()
+
+    assert not instrumentation.recording()
+    assert inner.counts == {'a': 2}
+    assert outer.counts == {'a': 3}
+    assert outer.sizes == {'b': {4: 1}}
+
+
+def test_timed():
+    @instrumentation.timed('f')
+    def f(x):
+        return x + 1
+
+    assert f(1) == 2
+    with instrumentation.record() as report:
+        f(1)
+        f(2)
+    assert report.counts['f'] == 2
+    assert report.times['f'] >= 0
+
+
+def test_timed_exception():
+    @instrumentation.timed('f')
+    def f():
+        raise ValueError
+
+    with instrumentation.record() as report:
+        with pytest.raises(ValueError):
+            f()
+    assert report.counts['f'] == 1
+
+
+class MapSquareCounted(parallel.MapReduce):
+
+    def empty_result(self):
+        return 0
+
+    @staticmethod
+    def compute(num):
+        instrumentation.count('square')
+        return num ** 2
+
+    def process_result(self, new, previous):
+        return previous + new
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_map_reduce_merges_worker_reports(parallel):
+    with instrumentation.record() as report:
+        engine = MapSquareCounted(range(10))
+        assert engine.run(parallel) == sum(x * x for x in range(10))
+    assert report.counts['square'] == 10
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_sia_report(s, parallel):
+    with config.override(INSTRUMENTATION=True,
+                         PARALLEL_CUT_EVALUATION=parallel):
+        sia = compute.sia(s)
+
+    report = sia.report
+    assert report.counts['evaluate_cut'] == 6
+    assert report.counts['cuts.pruned'] == 0
+    assert report.counts['find_mip'] > 0
+    assert report.counts['find_mip.partitions'] >= report.counts['find_mip']
+    assert sum(report.sizes['emd'].values()) == report.counts['emd']
+    assert (report.counts['cache.repertoire.hits'] +
+            report.counts['cache.repertoire.misses'] > 0)
+    assert str(report)
+
+
+def test_sia_report_disabled(s):
+    with config.override(INSTRUMENTATION=False):
+        assert compute.sia(s).report is None
+
+
+def test_reducible_sia_prunes_cuts():
+    network = examples.rule110_network()
+    subsystem = Subsystem(network, (0, 0, 0), (0, 1))
+    with config.override(PARALLEL_CUT_EVALUATION=False):
+        with instrumentation.record() as report:
+            assert compute.sia(subsystem).phi == 0
+    assert report.counts['evaluate_cut'] == 1
+    assert report.counts['cuts.pruned'] == 1
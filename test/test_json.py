@@ -2,12 +2,14 @@
 # -*- coding: utf-8 -*-
 # test_json.py
 
+import io
 import json
 import tempfile
 
 import numpy as np
 import pytest
 
+import pyphi
 from pyphi import (Direction, actual, compute, config, exceptions, jsonify,
                    labels, models, network)
 from test_actual import transition
@@ -125,3 +127,61 @@ def test_version_check_during_deserialization(s):
 
     with pytest.raises(exceptions.JSONVersionError):
         jsonify.loads(string)
+
+
+def test_streaming_dump_matches_dumps(s, transition):
+    objects = [
+        s,
+        compute.ces(s),
+        compute.sia(s),
+        actual.sia(transition),
+        {'ndarray': np.array([1, 2]), 2: (np.int64(1), np.float64(0.5)),
+         'nested': {'list': [True, None, 'a"b']}},
+    ]
+    for o in objects:
+        f = io.StringIO()
+        jsonify.dump(o, f)
+        assert f.getvalue() == jsonify.dumps(o)
+
+
+@pytest.fixture
+def sia_file(s):
+    f = tempfile.NamedTemporaryFile(mode='w+')
+    jsonify.dump(compute.sia(s), f)
+    f.flush()
+    f.seek(0)
+    return f
+
+
+def test_lazy_load(sia_file, s):
+    sia = compute.sia(s)
+    lazy = jsonify.lazy_load(sia_file)
+
+    assert lazy.classname == 'SystemIrreducibilityAnalysis'
+    assert lazy['phi'] == sia.phi
+    assert set(lazy) == set(sia.to_json())
+    assert lazy['cut_subsystem']['cut'].load() == sia.cut
+    assert lazy['ces']['concepts'] == sia.ces.concepts
+    assert lazy.load() == sia
+
+
+def test_lazy_loads_skips_tricky_values():
+    string = json.dumps({
+        'x': 'a"}{[\\',
+        'y': [1, {'z': ']'}, -2.5e-10],
+        jsonify.CLASS_KEY: 'Foo',
+        jsonify.VERSION_KEY: pyphi.__version__,
+        jsonify.ID_KEY: 1,
+    }, indent=2)
+    lazy = jsonify.lazy_loads(string)
+    assert lazy['x'] == 'a"}{[\\'
+    assert lazy['y'] == (1, {'z': ']'}, -2.5e-10)
+    assert len(lazy) == 2
+
+
+def test_lazy_load_version_check(s):
+    _obj = json.loads(jsonify.dumps(s))
+    _obj[jsonify.VERSION_KEY] = '0.1.bogus'
+
+    with pytest.raises(exceptions.JSONVersionError):
+        jsonify.lazy_loads(json.dumps(_obj))
@@ -5,7 +5,7 @@
 import numpy as np
 import pytest
 
-from pyphi import convert, macro
+from pyphi import config, convert, macro
 from pyphi.exceptions import ConditionallyDependentError
 
 # flake8: noqa
@@ -47,6 +47,28 @@ def test_all_groupings():
     ]
 
 
+def test_partitions_beyond_precomputed_lists(tmpdir):
+    n = macro._NUM_PRECOMPUTED_PARTITION_LISTS
+    partitions = list(macro.all_partitions(tuple(range(n))))
+    # Bell number B(10), less the partition into singletons
+    assert len(partitions) == 115975 - 1
+    assert len(set(partitions)) == len(partitions)
+    assert partitions[0] == (tuple(range(n - 1)), (n - 1,))
+    assert partitions[-1] == (tuple(range(n)),)
+
+    with config.override(PARTITION_LIST_DIRECTORY=str(tmpdir)):
+        assert list(macro.all_partitions(tuple(range(n)))) == partitions
+        assert tmpdir.join('{}.npy'.format(n)).check()
+        # Read from the saved list
+        assert list(macro.all_partitions(tuple(range(n)))) == partitions
+
+
+def test_all_groupings_of_large_part():
+    groupings = list(macro.all_groupings((tuple(range(10)),)))
+    assert len(groupings) == 2**10 - 1
+    assert groupings[0] == ((tuple(range(10)), (10,)),)
+
+
 def test_all_coarse_grains():
     assert tuple(macro.all_coarse_grains((1,))) == (
         macro.CoarseGrain(partition=((1,),),
@@ -166,6 +188,23 @@ def test_macro_tpm_sbs():
     assert np.array_equal(answer_tpm, macro_tpm)
 
 
+def test_macro_tpm_sbs_matches_transition_sums():
+    micro_tpm = convert.state_by_node2state_by_state(
+        np.random.RandomState(0).rand(16, 4))
+    partition = ((1, 3), (4,), (2,))  # Not indexed from 0
+    grouping = (((0, 1), (2,)), ((1,), (0,)), ((0,), (1,)))
+    coarse_grain = macro.CoarseGrain(partition, grouping)
+    mapping = coarse_grain.make_mapping()
+    assert np.array_equal(mapping, coarse_grain.reindex().make_mapping())
+
+    expected = np.zeros((8, 8))
+    for previous_state, current_state in np.ndindex(16, 16):
+        expected[mapping[previous_state], mapping[current_state]] += (
+            micro_tpm[previous_state, current_state])
+    expected /= expected.sum(axis=1, keepdims=True)
+    assert np.allclose(coarse_grain.macro_tpm_sbs(micro_tpm), expected)
+
+
 def test_coarse_grain_indices():
     partition = ((1, 2),)  # Node 0 not in system
     grouping = (((0,), (1, 2)),)
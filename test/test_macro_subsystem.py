@@ -118,6 +118,30 @@ def test_macro_cut_subsystem(macro_subsystem):
                        rtol=pyphi.constants.EPSILON)
 
 
+def test_apply_cut_reuses_pipeline_stages():
+    network = pyphi.examples.blackbox_network()
+    blackbox = macro.Blackbox(((0, 1, 2), (3, 4, 5)), (2, 5))
+    subsystem = macro.MacroSubsystem(network, (0,) * 6, network.node_indices,
+                                     blackbox=blackbox, time_scale=2)
+    stage_cache = subsystem._stage_cache
+    misses = stage_cache.info().misses
+
+    cut_subsystem = subsystem.apply_cut(models.Cut((0, 1), (2, 3, 4, 5)))
+    assert cut_subsystem._stage_cache is stage_cache
+    assert stage_cache.info().misses > misses
+    misses = stage_cache.info().misses
+
+    # This cut severs the same connections, so no stage is recomputed
+    other = subsystem.apply_cut(models.Cut((0, 1, 3, 4, 5), (2,)))
+    assert stage_cache.info().misses == misses
+    assert np.array_equal(other.tpm, cut_subsystem.tpm)
+
+    # Other systems do not share the cache
+    fresh = macro.MacroSubsystem(network, (0,) * 6, network.node_indices,
+                                 blackbox=blackbox, time_scale=2)
+    assert fresh._stage_cache is not stage_cache
+
+
 # Tests for purely temporal blackboxing
 # =====================================
 
@@ -220,6 +244,36 @@ def test_run_tpm():
     assert np.array_equal(timescale.run_tpm(tpm, 2), answer)
 
 
+@pytest.mark.parametrize('method', timescale.METHODS)
+def test_run_tpm_methods(method):
+    random = np.random.RandomState(0)
+    tpm = random.rand(16, 4)
+    # Make most transitions deterministic
+    tpm[random.rand(16, 4) < 0.7] = 1
+    noise_tpm = random.rand(16, 4)
+    sbs, noise_sbs = sbn2sbs(tpm), sbn2sbs(noise_tpm)
+
+    answer = sbs2sbn(np.linalg.matrix_power(sbs, 3))
+    np.testing.assert_allclose(
+        timescale.run_tpm(tpm, 3, method=method), answer)
+
+    answer = sbs2sbn(sbs @ np.linalg.matrix_power(noise_sbs, 2))
+    np.testing.assert_allclose(
+        timescale.run_tpm(tpm, 3, noise_tpm=noise_tpm, method=method), answer)
+
+
+def test_sparse_state_by_state():
+    tpm = np.array([
+        [0, 0.5],
+        [1, 0],
+        [1, 1],
+        [0.25, 1],
+    ])
+    sbs = timescale.sparse_state_by_state(tpm)
+    np.testing.assert_array_equal(sbs.toarray(), sbn2sbs(tpm))
+    assert timescale.density(tpm) == np.mean(sbn2sbs(tpm) != 0)
+
+
 def test_macro_cut_is_for_micro_indices(s):
     with pytest.raises(ValueError):
         macro.MacroSubsystem(s.network, s.state, s.node_indices,
@@ -336,6 +390,51 @@ def test_blackbox_emergence():
     assert result.emergence == 0.599789
 
 
+def test_macro_phis_evaluates_identical_systems_once(macro_subsystem):
+    identical = macro.MacroSubsystem(
+        macro_subsystem.network, macro_subsystem.network_state,
+        coarse_grain=macro_subsystem.coarse_grain)
+    micro = pyphi.Subsystem(macro_subsystem.network,
+                            macro_subsystem.network_state)
+    candidates = [macro_subsystem, micro, identical]
+
+    engine = macro.ComputeMacroPhis(candidates)
+    phis = engine.run(parallel=False)
+    assert engine.duplicates == {2: 0}
+    assert set(phis) == {0, 1}
+
+    phis = macro.macro_phis(candidates)
+    assert phis == {
+        0: pyphi.compute.phi(macro_subsystem),
+        1: pyphi.compute.phi(micro),
+        2: pyphi.compute.phi(macro_subsystem),
+    }
+
+
+def test_macro_phis_upper_bound(macro_subsystem):
+    micro = pyphi.Subsystem(macro_subsystem.network,
+                            macro_subsystem.network_state)
+    empty = pyphi.Subsystem(macro_subsystem.network,
+                            macro_subsystem.network_state, ())
+    assert macro.zero_phi_bound(macro_subsystem) == float('inf')
+    assert macro.zero_phi_bound(empty) == 0
+
+    # The first candidate is always evaluated
+    phis = macro.macro_phis([empty, micro], upper_bound=lambda s: 0)
+    assert phis == {0: 0}
+
+    phis = macro.macro_phis([micro, empty], upper_bound=macro.zero_phi_bound)
+    assert list(phis) == [0]
+
+
+def test_coarse_graining(macro_subsystem):
+    network = macro_subsystem.network
+    phi, coarse_grain = macro.coarse_graining(
+        network, macro_subsystem.network_state, network.node_indices)
+    assert phi == 0.597212
+    assert coarse_grain == macro_subsystem.coarse_grain
+
+
 def test_macro2micro(s):
     # Only blackboxing
     blackbox = macro.Blackbox(((0, 2), (1,)), (1, 2))
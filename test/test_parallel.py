@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 # test_parallel.py
 
+import multiprocessing
+import socket
 from unittest.mock import patch
 
 import pytest
@@ -80,3 +82,99 @@ class MapError(MapSquare):
 def test_parallel_exception_handling():
     with pytest.raises(Exception, match=r"I don't wanna!"):
         MapError([1]).run(parallel=True)
+
+
+class MapSquareCheckpointed(MapSquare):
+    """Die if asked to compute a forbidden number."""
+
+    forbidden = set()
+
+    def checkpoint_key(self):
+        return 'squares'
+
+    @staticmethod
+    def compute(num):
+        if num in MapSquareCheckpointed.forbidden:
+            raise KeyboardInterrupt
+        return num ** 2
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_checkpoint_and_resume(tmpdir, parallel):
+    with config.override(CHECKPOINT_DIRECTORY=str(tmpdir),
+                         CHECKPOINT_INTERVAL=0):
+        MapSquareCheckpointed.forbidden = {4}
+        engine = MapSquareCheckpointed([1, 2, 3, 4])
+        with pytest.raises(KeyboardInterrupt):
+            engine.run(parallel=False)
+        assert engine.completed == {0, 1, 2}
+        assert len(tmpdir.listdir()) == 1
+
+        # Completed tasks must not be recomputed
+        MapSquareCheckpointed.forbidden = {1, 2, 3}
+        engine = MapSquareCheckpointed([1, 2, 3, 4])
+        assert engine.run(parallel=parallel) == {1, 4, 9, 16}
+        # The checkpoint is removed once the computation is finished
+        assert not tmpdir.listdir()
+
+    MapSquareCheckpointed.forbidden = set()
+
+
+def test_no_checkpoint_without_key(tmpdir):
+    with config.override(CHECKPOINT_DIRECTORY=str(tmpdir),
+                         CHECKPOINT_INTERVAL=0):
+        engine = MapSquare([1, 2, 3])
+        assert engine.run_sequential() == {1, 4, 9}
+        assert engine.checkpoint_path is None
+        assert not tmpdir.listdir()
+
+
+class MapSquareUntilFour(MapSquare):
+    """Terminate early once 4 is computed."""
+
+    def process_result(self, new, previous):
+        if new == 4:
+            self.done = True
+        return super().process_result(new, previous)
+
+
+@pytest.fixture
+def distributed_workers():
+    """Run two distributed workers on localhost."""
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        address = sock.getsockname()
+
+    workers = [
+        multiprocessing.Process(target=parallel.distributed_worker,
+                                args=(address, 'test'),
+                                kwargs={'poll_interval': 0.05},
+                                daemon=True)
+        for i in range(2)]
+    for worker in workers:
+        worker.start()
+
+    with config.override(DISTRIBUTED_ADDRESS=address,
+                         DISTRIBUTED_AUTHKEY='test'):
+        yield workers
+
+    for worker in workers:
+        worker.terminate()
+        worker.join()
+
+
+def test_map_square_distributed(distributed_workers):
+    assert MapSquare([1, 2, 3]).run(parallel=True) == {1, 4, 9}
+    # Workers pick up subsequent computations
+    assert MapSquare([4, 5]).run(parallel=True) == {16, 25}
+
+
+def test_distributed_early_termination(distributed_workers):
+    result = MapSquareUntilFour(range(100)).run(parallel=True)
+    assert 4 in result
+    assert len(result) < 100
+
+
+def test_distributed_exception_handling(distributed_workers):
+    with pytest.raises(Exception, match=r"I don't wanna!"):
+        MapError([1]).run(parallel=True)
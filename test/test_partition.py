@@ -6,11 +6,12 @@ import itertools
 
 import numpy as np
 
-from pyphi import Direction, config
+from pyphi import Direction, config, partition
 from pyphi.partition import (directed_bipartition,
                              directed_tripartition_indices, k_partitions,
                              partitions, partition_types, mip_bipartitions,
-                             wedge_partitions, all_partitions)
+                             ordered_mip_partitions, wedge_partitions,
+                             all_partitions)
 
 from pyphi.models import Part, KPartition, Bipartition, Tripartition
 
@@ -242,6 +243,105 @@ def test_wedge_partitions():
     ])
 
 
+def test_partitions_are_mapped_onto_nodes():
+    def relabel(partition, mapping):
+        return type(partition)(*(
+            Part(tuple(mapping[n] for n in part.mechanism),
+                 tuple(mapping[n] for n in part.purview))
+            for part in partition))
+
+    # Partitions of nodes of the same sizes share their enumeration.
+    mapping = {0: 3, 1: 4, 2: 5, 3: 6}
+    for func in [mip_bipartitions, wedge_partitions, all_partitions]:
+        assert list(func((3, 4), (5, 6))) == [
+            relabel(partition, mapping)
+            for partition in func((0, 1), (2, 3))]
+
+    # Partitions of unsorted nodes are still normalized.
+    mechanism, purview = (4, 3), (6, 5)
+    for partition in wedge_partitions(mechanism, purview):
+        assert partition == partition.normalize()
+
+
+def test_partitions_past_max_templates(monkeypatch):
+    mechanism, purview = (0, 1, 2), (0, 1)
+    funcs = [mip_bipartitions, wedge_partitions, all_partitions]
+    expected = [list(func(mechanism, purview)) for func in funcs]
+
+    # Too many templates to keep, so the partitions are enumerated lazily
+    monkeypatch.setattr(partition, '_MAX_TEMPLATES', 5)
+    partition._template_array.cache_clear()
+    try:
+        for func, partitions in zip(funcs, expected):
+            assert list(func(mechanism, purview)) == partitions
+        assert partition._template_array('ALL', 3, 2) is None
+    finally:
+        partition._template_array.cache_clear()
+
+
+def test_ordered_mip_partitions():
+    mechanism, purview = (0, 1), (2, 3)
+    partitions = list(mip_bipartitions(mechanism, purview))
+    ordered = list(ordered_mip_partitions(mechanism, purview))
+
+    assert sorted(ordered) == list(enumerate(partitions))
+    for index, partition in ordered:
+        assert partitions[index] == partition
+
+    # Partitions which sever fewer connections come first, in their original
+    # order otherwise.
+    def severed(item):
+        partition = item[1]
+        return len(mechanism) * len(purview) - sum(
+            len(part.mechanism) * len(part.purview) for part in partition)
+
+    assert ordered == sorted(enumerate(partitions), key=severed)
+    assert severed(ordered[0]) == 2
+
+
+def test_ordered_mip_partitions_of_each_partition_type():
+    def kept(item):
+        return sum(len(part.mechanism) * len(part.purview)
+                   for part in item[1])
+
+    for partition_type in ['BI', 'TRI', 'ALL']:
+        for mechanism, purview in [((0, 1), (2, 3, 4)), ((3, 0), (4, 1)),
+                                   ((1,), (0, 2))]:
+            with config.override(PARTITION_TYPE=partition_type):
+                partitions = list(enumerate(
+                    partition_types[partition_type](mechanism, purview)))
+                ordered = list(ordered_mip_partitions(mechanism, purview))
+            assert ordered == sorted(partitions, key=kept, reverse=True)
+
+
+def test_restrict_ordered_mip_partitions(monkeypatch):
+    mechanism, purview = (0, 1), (2, 3)
+    ordered = list(ordered_mip_partitions(mechanism, purview))
+
+    partitions = ordered_mip_partitions(mechanism, purview)
+    first, _ = next(partitions)
+    partitions.restrict(first)
+    assert list(partitions) == [(index, partition)
+                                for index, partition in ordered[1:]
+                                if index < first]
+
+    # Partitions with too many templates to keep are not reordered
+    monkeypatch.setattr(partition, '_MAX_TEMPLATES', 5)
+    partition._template_array.cache_clear()
+    try:
+        ordered = ordered_mip_partitions(mechanism, purview)
+        assert list(ordered) == list(enumerate(
+            mip_bipartitions(mechanism, purview)))
+
+        ordered = ordered_mip_partitions(mechanism, purview)
+        next(ordered)
+        next(ordered)
+        ordered.restrict(1)
+        assert list(ordered) == []
+    finally:
+        partition._template_array.cache_clear()
+
+
 def test_partitioned_repertoire_with_tripartition(s):
     tripartition = Tripartition(Part((), (1,)), Part((0,), ()), Part((), (2,)))
 
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_scheduling.py
+
+import numpy as np
+import pytest
+
+from pyphi import Subsystem, compute, config
+from pyphi.compute import scheduling
+from pyphi.models import Cut
+
+
+def test_schedule_disabled_preserves_order():
+    tasks = [1, 3, 2]
+    with config.override(SCHEDULE_BY_COST=False):
+        assert scheduling.schedule(tasks, lambda x: x) is tasks
+
+
+def test_schedule_longest_first():
+    with config.override(SCHEDULE_BY_COST=True):
+        assert scheduling.schedule([1, 3, 2], lambda x: x) == [3, 2, 1]
+        # Ties keep their original order
+        assert scheduling.schedule(['b', 'a'], lambda x: 0) == ['b', 'a']
+
+
+def test_makespan():
+    assert scheduling.makespan([1, 1, 4], 2) == 5
+    assert scheduling.makespan([4, 1, 1], 2) == 4
+    assert scheduling.makespan([], 2) == 0
+
+
+def test_cost_model_predicts_larger_subsystems_are_slower(s):
+    small = Subsystem(s.network, s.state, (0, 1))
+    assert scheduling.cost_model.predict(s) > \
+        scheduling.cost_model.predict(small)
+
+
+def test_cost_model_calibrate(s):
+    sias = list(compute.all_complexes(s.network, s.state))
+    model = scheduling.CostModel().calibrate(sias)
+    assert model.coefficients.shape == (3,)
+    assert np.all(np.isfinite(model.coefficients))
+
+    with pytest.raises(ValueError):
+        scheduling.CostModel().calibrate(sias[:2])
+
+
+def test_cut_cost(s):
+    # Node 0 receives inputs from nodes 1 and 2 but only outputs to node 2
+    assert scheduling.cut_cost(s, Cut((1, 2), (0,))) == 2
+    assert scheduling.cut_cost(s, Cut((0,), (1, 2))) == 1
+
+
+def test_scheduled_results_match(s):
+    with config.override(SCHEDULE_BY_COST=False):
+        expected = compute.sia(s)
+        expected_complexes = compute.all_complexes(s.network, s.state)
+    with config.override(SCHEDULE_BY_COST=True):
+        assert compute.sia(s).phi == expected.phi
+        assert (sorted(sia.phi for sia in compute.all_complexes(s.network,
+                                                                 s.state)) ==
+                sorted(sia.phi for sia in expected_complexes))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_store.py
+
+import numpy as np
+import pytest
+
+from pyphi import compute, store
+
+
+def test_masks():
+    assert store.node_mask(()) == 0
+    assert store.node_mask((0, 2)) == 0b101
+    assert store.mask_indices(0b101) == (0, 2)
+    assert store.mask_indices(np.uint64(2 ** 63)) == (63,)
+    assert store.state_mask((1, 0, 1)) == 0b101
+
+    with pytest.raises(ValueError):
+        store.node_mask((64,))
+
+
+def test_write_and_read(s, tmpdir):
+    sia = compute.sia(s)
+    ces = compute.ces(s)
+
+    with store.ResultsWriter(str(tmpdir), extra_fields=[('p', 'f8')]) as w:
+        assert w.write(sia, p=0.5) == 0
+        assert w.write(ces, p=1.0) == 1
+
+    reader = store.ResultsReader(str(tmpdir))
+    assert len(reader) == 2
+
+    row = reader.systems[0]
+    assert row['phi'] == sia.phi
+    assert row['p'] == 0.5
+    assert store.mask_indices(row['nodes']) == s.node_indices
+    assert store.mask_indices(row['state']) == (0,)
+    assert store.mask_indices(row['cut_from']) == sia.cut.from_nodes
+    assert store.mask_indices(row['cut_to']) == sia.cut.to_nodes
+    assert row['num_concepts'] == len(sia.ces)
+    assert np.isnan(reader.systems[1]['phi'])
+
+    concepts = reader.concepts_of(reader.systems[:1])
+    assert len(concepts) == len(sia.ces)
+    for row, concept in zip(concepts, sia.ces):
+        assert store.mask_indices(row['mechanism']) == concept.mechanism
+        assert store.mask_indices(row['cause_purview']) == \
+            concept.cause_purview
+        assert store.mask_indices(row['effect_purview']) == \
+            concept.effect_purview
+        assert row['phi'] == concept.phi
+
+
+def test_append_and_filter(s, tmpdir):
+    sia = compute.sia(s)
+    for p in range(3):
+        with store.ResultsWriter(str(tmpdir), extra_fields=[('p', 'i4')],
+                                 buffer_size=1) as writer:
+            writer.write(sia, p=p)
+
+    reader = store.ResultsReader(str(tmpdir))
+    assert reader.systems['id'].tolist() == [0, 1, 2]
+    rows = reader.filter(lambda systems: systems['p'] >= 1)
+    assert rows['p'].tolist() == [1, 2]
+    assert len(reader.concepts_of(rows['id'])) == 2 * len(sia.ces)
+
+
+def test_schema_mismatch(s, tmpdir):
+    store.ResultsWriter(str(tmpdir), extra_fields=[('p', 'f8')]).close()
+    with pytest.raises(ValueError):
+        store.ResultsWriter(str(tmpdir))
+
+    writer = store.ResultsWriter(str(tmpdir), extra_fields=[('p', 'f8')])
+    with pytest.raises(ValueError):
+        writer.write(compute.sia(s))
+
+
+def test_read_empty_store(tmpdir):
+    store.ResultsWriter(str(tmpdir)).close()
+    reader = store.ResultsReader(str(tmpdir))
+    assert len(reader) == 0
+    assert len(reader.concepts) == 0
@@ -6,7 +6,7 @@ import numpy as np
 import pytest
 
 import example_networks
-from pyphi import Direction, Network, config, exceptions
+from pyphi import Direction, Network, config, exceptions, utils
 from pyphi.models import (Concept, Cut,
                           MaximallyIrreducibleCause,
                           MaximallyIrreducibleEffect,
@@ -127,6 +127,32 @@ def test_apply_cut(s):
     assert np.array_equal(cut_s.cm, cut.apply_cut(s.cm))
 
 
+def test_apply_cut_shares_state_independent_caches(s):
+    cut = Cut((0, 1), (2,))
+    cut_s = s.apply_cut(cut)
+    assert (cut_s._single_node_repertoire_cache is
+            s._single_node_repertoire_cache)
+    assert cut_s._purview_cache is s._purview_cache
+
+    # Fill the shared caches from the uncut subsystem first
+    for mechanism in utils.powerset(s.node_indices, nonempty=True):
+        s.cause_repertoire(mechanism, s.node_indices)
+        s.effect_repertoire(mechanism, s.node_indices)
+        for direction in (Direction.CAUSE, Direction.EFFECT):
+            s.potential_purviews(direction, mechanism)
+
+    fresh = Subsystem(s.network, s.state, s.node_indices, cut=cut)
+    for mechanism in utils.powerset(s.node_indices, nonempty=True):
+        for purview in utils.powerset(s.node_indices, nonempty=True):
+            assert np.array_equal(cut_s.cause_repertoire(mechanism, purview),
+                                  fresh.cause_repertoire(mechanism, purview))
+            assert np.array_equal(cut_s.effect_repertoire(mechanism, purview),
+                                  fresh.effect_repertoire(mechanism, purview))
+        for direction in (Direction.CAUSE, Direction.EFFECT):
+            assert (cut_s.potential_purviews(direction, mechanism) ==
+                    fresh.potential_purviews(direction, mechanism))
+
+
 def test_cut_indices(s, subsys_n1n2):
     assert s.cut_indices == (0, 1, 2)
     assert subsys_n1n2.cut_indices == (1, 2)
@@ -6,7 +6,7 @@ from itertools import chain
 import pytest
 
 import example_networks
-from pyphi import Direction, Subsystem
+from pyphi import Direction, Subsystem, config, utils
 from pyphi.models import Cut, MaximallyIrreducibleCauseOrEffect, _null_ria
 from pyphi.utils import eq
 
@@ -110,6 +110,24 @@ def test_find_mice_empty(s):
                for mice in expected)
 
 
+@pytest.mark.parametrize('measure,partition_type', [
+    ('EMD', 'BI'), ('L1', 'TRI'), ('KLD', 'ALL'),
+])
+def test_find_mice_pruning_does_not_change_mice(s_noised, measure,
+                                                partition_type):
+    with config.override(MEASURE=measure, PARTITION_TYPE=partition_type):
+        for direction in directions:
+            for mechanism in utils.powerset(s_noised.node_indices,
+                                            nonempty=True):
+                purviews = s_noised.potential_purviews(direction, mechanism)
+                expected = max(
+                    s_noised.find_mip(direction, mechanism, purview)
+                    for purview in purviews)
+                mice = s_noised.find_mice(direction, mechanism)
+                assert mice.ria == expected
+                assert mice.purview == expected.purview
+
+
 # }}}
 # `phi_max` tests {{{
 # ===================
@@ -5,8 +5,9 @@ import numpy as np
 import pytest
 
 import example_networks
-from pyphi import Direction, constants
+from pyphi import Direction, config, constants, distance, partition, utils
 from pyphi.models import Part, Bipartition, RepertoireIrreducibilityAnalysis
+from pyphi.partition import mip_partitions
 
 s = example_networks.s()
 
@@ -241,6 +242,61 @@ def test_find_mip(direction, subsystem, cut, mechanism, purview, expected):
     else:
         assert result == expected
 
+
+def enumerated_mip(subsystem, direction, mechanism, purview):
+    """Return the phi and partition of the first minimal partition in the
+    order of ``mip_partitions``.
+    """
+    mip = (float('inf'), None)
+    for partition in mip_partitions(mechanism, purview,
+                                    subsystem.node_labels):
+        phi, _ = subsystem.evaluate_partition(direction, mechanism, purview,
+                                              partition)
+        if phi < mip[0]:
+            mip = (phi, partition)
+        if phi == 0:
+            break
+    return mip
+
+
+@pytest.mark.parametrize('measure,partition_type', [
+    ('EMD', 'BI'), ('L1', 'BI'), ('EMD', 'TRI'), ('EMD', 'ALL'),
+])
+@pytest.mark.parametrize('subsystem', ['s', 's_noised'])
+@pytest.mark.parametrize('max_templates', [None, 5])
+def test_find_mip_bound_does_not_change_mip(subsystem, monkeypatch, request,
+                                            measure, partition_type,
+                                            max_templates):
+    subsystem = request.getfixturevalue(subsystem)
+    if max_templates is not None:
+        # Generate the partitions of most sizes lazily, in their own order
+        monkeypatch.setattr(partition, '_MAX_TEMPLATES', max_templates)
+        partition._template_array.cache_clear()
+        request.addfinalizer(partition._template_array.cache_clear)
+    mechanisms = list(utils.powerset(subsystem.node_indices, nonempty=True))
+    cases = [(direction, mechanism, purview)
+             for direction in (Direction.CAUSE, Direction.EFFECT)
+             for mechanism in mechanisms
+             for purview in mechanisms]
+    with config.override(MEASURE=measure, PARTITION_TYPE=partition_type):
+        bounded = [subsystem.find_mip(*case) for case in cases]
+        enumerated = [enumerated_mip(subsystem, *case) for case in cases]
+        subsystem.clear_caches()
+        monkeypatch.setattr(distance, 'has_marginal_bound', lambda: False)
+        unbounded = [subsystem.find_mip(*case) for case in cases]
+
+    assert bounded == unbounded
+    assert ([mip.partition for mip in bounded] ==
+            [mip.partition for mip in unbounded])
+
+    # Unreachable cause states have no partition
+    bounded, enumerated = zip(*[
+        (mip, expected) for mip, expected in zip(bounded, enumerated)
+        if mip.partition is not None])
+    assert [mip.phi for mip in bounded] == [phi for phi, _ in enumerated]
+    assert ([mip.partition for mip in bounded] ==
+            [partition for _, partition in enumerated])
+
 # }}}
 
 
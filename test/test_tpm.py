@@ -48,3 +48,19 @@ def test_marginalize_out(s):
 
 def test_infer_cm(rule152):
     assert np.array_equal(infer_cm(rule152.tpm), rule152.cm)
+
+
+def test_infer_cm_in_blocks(rule152, tmpdir):
+    path = str(tmpdir.join('tpm.npy'))
+    np.save(path, rule152.tpm)
+    tpm = np.load(path, mmap_mode='r')
+    for block_size in [1, 3, 4, 32]:
+        assert np.array_equal(infer_cm(tpm, block_size=block_size),
+                              rule152.cm)
+
+
+def test_infer_cm_singleton_dimensions(s):
+    # External nodes have no outgoing edges
+    cm = infer_cm(s.tpm)
+    assert cm.shape == (3, 3)
+    assert np.array_equal(infer_cm(s.tpm[:, :, :1]), cm * [[1], [1], [0]])